@@ -0,0 +1,56 @@
+"""
+Caller-side cost of a log call with file + console output, direct vs async_local.
+
+Console output goes to /dev/null so the terminal is not the bottleneck. The
+async_local figure is the time the logging call itself takes (enqueue only);
+the total including the background writer draining the queue is shown too.
+
+    python benchmarks/bench_async_local.py [records]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, flush  # noqa: E402
+
+
+def _run(async_local, n, log_dir):
+    devnull = open(os.devnull, "w")
+    stderr, sys.stderr = sys.stderr, devnull  # StreamHandler binds sys.stderr at creation
+    try:
+        log = Logifyx(
+            name=f"bench-local-{async_local}",
+            log_dir=log_dir,
+            color=False,
+            mask=False,
+            async_local=async_local,
+            queue_size=n + 1,
+            queue_max_bytes=1 << 31,
+        )
+    finally:
+        sys.stderr = stderr
+
+    start = time.perf_counter()
+    for i in range(n):
+        log.info("request %d served in %d ms", i, 12)
+    caller = time.perf_counter() - start
+    flush(timeout=60)
+    total = time.perf_counter() - start
+    devnull.close()
+    return caller / n * 1e6, n / total
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as log_dir:
+        for label, async_local in (("direct", False), ("async_local", True)):
+            per_call, throughput = _run(async_local, n, log_dir)
+            print(f"{label:<12} {per_call:>8.2f} µs/call in caller   {throughput:>10,.0f} records/sec end-to-end")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Caller-side cost of a log call to a remote sink while its circuit breaker is
+closed vs open, and the cost of the breaker checks themselves.
+
+"enqueue" is AsyncSink.enqueue() of a prepared record with the worker not
+started: while closed the record is queued (the queue is cleared every 10,000
+records so it never fills), while open it is refused before the queue lock.
+"allow" and "shedding" are the checks the handler and the sink make per record.
+
+    python benchmarks/bench_breaker.py [records]
+"""
+
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.remote import RemoteHandler  # noqa: E402
+from logifyx.sinks import AsyncSink  # noqa: E402
+
+
+def _per_call(func, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def _clear(sink):
+    sink._items.clear()
+    sink._queued = 0
+
+
+def _enqueue_cost(sink, record, n):
+    enqueue = sink.enqueue
+    start = time.perf_counter()
+    for i in range(n):
+        enqueue(record)
+        if i % 10_000 == 9_999:
+            _clear(sink)
+    elapsed = time.perf_counter() - start
+    _clear(sink)
+    return elapsed / n * 1e9
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    record = logging.LogRecord(
+        "svc.orders", logging.INFO, "/app/orders.py", 42, "order A-00012345 shipped", None, None
+    )
+    handler = RemoteHandler("http://127.0.0.1:9/logs", backoff_ms=3_600_000)
+    breaker = handler.breaker
+    sink = AsyncSink(handler, maxsize=n + 1, max_bytes=1 << 40)
+
+    print(f"{'':<24} {'closed ns':>10} {'open ns':>10}")
+    rows = (
+        ("enqueue", lambda: _enqueue_cost(sink, record, n)),
+        ("breaker.allow()", lambda: _per_call(breaker.allow, n)),
+        ("breaker.shedding()", lambda: _per_call(breaker.shedding, n)),
+    )
+    for label, measure in rows:
+        breaker.reset()
+        closed = measure()
+        with contextlib.redirect_stderr(io.StringIO()):  # the "suspended" warning
+            for _ in range(breaker.max_failures):
+                breaker.failure()
+        opened = measure()
+        print(f"{label:<24} {closed:>10.0f} {opened:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
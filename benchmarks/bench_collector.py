@@ -0,0 +1,98 @@
+"""
+Aggregate records/sec from N worker processes into one log file: every worker
+writing the file itself vs workers shipping to a LogCollector.
+
+Each worker logs the same number of records as fast as it can. Throughput is
+total records over the wall time until the last record is in the file. Worker
+console output goes to /dev/null so the terminal is not the bottleneck.
+
+    python benchmarks/bench_collector.py [records_per_worker]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import LogCollector, Logifyx, flush  # noqa: E402
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def _worker(n, log_dir, collector_socket, ready, go):
+    sys.stderr = open(os.devnull, "w")  # StreamHandler binds sys.stderr at creation
+    options = {"collector_socket": collector_socket} if collector_socket else {}
+    log = Logifyx(
+        name="bench-worker",
+        log_dir=log_dir,
+        file="bench.log",
+        color=False,
+        mask=False,
+        queue_size=n + 1,
+        queue_max_bytes=1 << 31,
+        queue_overflow="block",
+        **options,
+    )
+    ready.release()
+    go.wait()
+    pid = os.getpid()
+    for i in range(n):
+        log.info("worker %d request %d served in %d ms", pid, i, 12)
+    flush(timeout=120)
+
+
+def _run(workers, n, collector_socket, log_dir):
+    ctx = multiprocessing.get_context("fork")
+    ready = ctx.Semaphore(0)
+    go = ctx.Event()
+    procs = [
+        ctx.Process(target=_worker, args=(n, log_dir, collector_socket, ready, go))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    for _ in procs:
+        ready.acquire()
+
+    start = time.perf_counter()
+    go.set()
+    for proc in procs:
+        proc.join()
+    return time.perf_counter() - start
+
+
+def _direct(workers, n):
+    with tempfile.TemporaryDirectory() as log_dir:
+        return workers * n / _run(workers, n, None, log_dir)
+
+
+def _collected(workers, n):
+    with tempfile.TemporaryDirectory() as log_dir:
+        socket_path = os.path.join(log_dir, "collector.sock")
+        collector = LogCollector(
+            socket_path, log_dir=log_dir, file="bench.log", mask=False,
+            queue_size=workers * n + 1, queue_max_bytes=1 << 31,
+        ).start()
+        elapsed = _run(workers, n, socket_path, log_dir)
+        start = time.perf_counter()
+        while collector.received < workers * n:
+            time.sleep(0.001)
+        collector.stop()  # writes everything still queued
+        elapsed += time.perf_counter() - start
+        return workers * n / elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'workers':>7} {'direct file':>16} {'collector':>16}")
+    for workers in WORKER_COUNTS:
+        direct = _direct(workers, n)
+        collected = _collected(workers, n)
+        print(f"{workers:>7} {direct:>11,.0f} rec/s {collected:>11,.0f} rec/s")
+
+
+if __name__ == "__main__":
+    main()
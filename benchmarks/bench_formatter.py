@@ -0,0 +1,97 @@
+"""
+Per-record formatting cost of the Logifyx formatters.
+
+"uncached" reproduces the previous timestamp path (a new logging.Formatter and
+a localtime + strftime call per record); the formatter rows use the cached
+per-second timestamp. The "f-string" rows rebuild the whole line per record
+the way the formatters used to, for comparison with the precomputed level and
+location fragments, and "json.dumps" encodes the JSON line through the
+generic encoder instead of the fixed-field one.
+
+    python benchmarks/bench_formatter.py [records]
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.formatter import (  # noqa: E402
+    BLUE, DEFAULT_DATEFMT, LEVEL_COLORS, RESET, WHITE, get_formatter,
+)
+
+
+def _records(n):
+    start = time.time()
+    records = []
+    for i in range(n):
+        record = logging.LogRecord("bench", logging.INFO, "app.py", 42, "request %d served", (i,), None)
+        record.created = start + i / 10_000  # ~10k records per second of log time
+        record.msecs = (record.created - int(record.created)) * 1000
+        records.append(record)
+    return records
+
+
+def _uncached_time(record):
+    return logging.Formatter(datefmt=DEFAULT_DATEFMT).formatTime(record, DEFAULT_DATEFMT)
+
+
+def _fstring_line(formatter, color):
+    def fmt(record):
+        dt = formatter.formatTime(record)
+        level_color = LEVEL_COLORS.get(record.levelname, "")
+        level = record.levelname.ljust(8)
+        if color:
+            colored_level = f"{level_color}{level}{RESET}"
+            colored_location = f"{BLUE}{record.name}{WHITE}:{BLUE}{record.funcName}:{record.lineno}{RESET}"
+            colored_message = f"{level_color}{record.getMessage()}{RESET}"
+            return f"\033[32m{dt}{RESET} | {colored_level} | {colored_location} - {colored_message}"
+        location = f"{record.name}:{record.funcName}:{record.lineno}"
+        return f"{dt} | {level} | {location} - {record.getMessage()}"
+    return fmt
+
+
+def _dumps_line(formatter):
+    def fmt(record):
+        return json.dumps({
+            "timestamp": formatter.formatTime(record),
+            "level":     record.levelname,
+            "logger":    record.name,
+            "function":  record.funcName,
+            "line":      record.lineno,
+            "message":   record.getMessage(),
+        }, ensure_ascii=False)
+    return fmt
+
+
+def _run(fn, records):
+    start = time.perf_counter()
+    for record in records:
+        fn(record)
+    return (time.perf_counter() - start) / len(records) * 1e9
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    records = _records(n)
+    plain = get_formatter(json_mode=False, color=False)
+    color = get_formatter(json_mode=False, color=True)
+    cases = (
+        ("timestamp, uncached",  _uncached_time),
+        ("timestamp, cached",    plain.formatTime),
+        ("plain line, f-string", _fstring_line(plain, color=False)),
+        ("plain line",           plain.format),
+        ("color line, f-string", _fstring_line(color, color=True)),
+        ("color line",           color.format),
+        ("json line, json.dumps", _dumps_line(plain)),
+        ("json line",            get_formatter(json_mode=True).format),
+    )
+    for label, fn in cases:
+        print(f"{label:<22} {_run(fn, records):>8.0f} ns/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cost of `import logifyx` in a fresh interpreter, measured with -X importtime.
+
+Each run starts a new Python process and reads the cumulative import time of
+the logifyx package from its -X importtime report; the median is compared to
+a budget. Heavy optional dependencies that got imported anyway are listed.
+Exits with status 1 if the budget is exceeded or one of them was loaded, so
+it can guard startup time in CI.
+
+    python benchmarks/bench_import.py [runs] [budget_ms]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only loaded once a sink that needs them is configured
+OPTIONAL_MODULES = (
+    "requests", "urllib3", "aiokafka", "fastavro", "asyncio",
+    "yaml", "dotenv", "concurrent_log_handler", "portalocker",
+)
+
+_PROBE = (
+    "import sys, logifyx; "
+    f"print(','.join(m for m in {OPTIONAL_MODULES!r} if m in sys.modules))"
+)
+
+
+def _run():
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # measure with compiled bytecode, as installed
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    micros = None
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == "logifyx":
+            micros = int(parts[1])
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return micros / 1000, loaded
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+
+    _run()  # warm-up: writes __pycache__
+    times = []
+    loaded = []
+    for _ in range(runs):
+        ms, loaded = _run()
+        times.append(ms)
+
+    median = statistics.median(times)
+    print(f"import logifyx   median {median:6.1f} ms   min {min(times):6.1f} ms   budget {budget_ms:.0f} ms")
+    print(f"optional modules loaded: {', '.join(loaded) or 'none'}")
+    if median > budget_ms or loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
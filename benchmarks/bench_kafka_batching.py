@@ -0,0 +1,100 @@
+"""
+Kafka messages and bytes per record, one record per message vs Avro Object
+Container File batches (batch_records), with the broker replaced by a stub.
+
+Every message costs the broker a record header, an offset and an index entry,
+so fewer messages means less per-message overhead. The stub records the value
+sizes the handler produced; "bytes/rec" is the serialized size before any
+producer-level compression. Records resemble typical service logs: a few
+recurring message templates with changing ids.
+
+    python benchmarks/bench_kafka_batching.py [records]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.kafka import KafkaHandler  # noqa: E402
+
+_TEMPLATES = (
+    "order %s shipped to warehouse eu-west-1",
+    "payment %s authorised for customer",
+    "cache miss for session %s, fetching from upstream",
+    "request %s completed with status 200 in 12 ms",
+)
+
+
+class _StubProducer:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.messages = 0
+        self.bytes = 0
+        _StubProducer.instances.append(self)
+
+    async def start(self):
+        pass
+
+    async def send(self, topic, value=None, key=None, headers=None):
+        self.messages += 1
+        self.bytes += len(value)
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+    async def flush(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+def _run(records, **kwargs):
+    _StubProducer.instances = []
+    handler = KafkaHandler(bootstrap_servers="localhost:9092", max_pending=len(records), **kwargs)
+    start = time.perf_counter()
+    for record in records:
+        handler.emit(record)
+    handler.flush(timeout=None)
+    elapsed = time.perf_counter() - start
+    handler.close()
+    producer = _StubProducer.instances[0]
+    return producer.messages, producer.bytes, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    records = [
+        logging.LogRecord(
+            "svc.orders", logging.INFO, "/app/orders.py", 42,
+            _TEMPLATES[i % len(_TEMPLATES)], (f"A-{i:08d}",), None, "handle",
+        )
+        for i in range(n)
+    ]
+
+    modes = [("single record", {})]
+    for codec in ("null", "deflate", "zstd"):
+        if codec == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                print("(zstd skipped: pip install zstandard)")
+                continue
+        for size in (100, 1000):
+            modes.append((f"OCF {codec} x{size}", {"batch_records": size, "batch_codec": codec}))
+
+    with patch("logifyx.kafka.AIOKafkaProducer", _StubProducer):
+        print(f"{'mode':<20} {'messages':>9} {'bytes/rec':>10} {'records/sec':>12}")
+        for label, kwargs in modes:
+            messages, size, elapsed = _run(records, **kwargs)
+            print(f"{label:<20} {messages:>9} {size / n:>10.1f} {n / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Avro schema v1 vs v2: serialized bytes per record and the cost of building and
+serializing one (KafkaHandler._build_record + AvroSerializer.serialize).
+
+v1 formats an ISO timestamp string and JSON-encodes extra fields for every
+record; v2 writes epoch microseconds, a level enum and a typed attribute map.
+Measured for plain records and for records with four extra fields.
+
+    python benchmarks/bench_kafka_schema.py [records]
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.kafka import KafkaHandler  # noqa: E402
+
+
+def _records(n, with_extra):
+    records = []
+    for i in range(n):
+        record = logging.LogRecord(
+            "svc.orders", logging.INFO, "/app/orders.py", 42,
+            "order %s shipped", (f"A-{i:08d}",), None, "handle",
+        )
+        if with_extra:
+            record.user_id = 1000 + i
+            record.region = "eu-west-1"
+            record.retry = False
+            record.latency_ms = 12.5
+        records.append(record)
+    return records
+
+
+def _measure(version, records):
+    handler = KafkaHandler(bootstrap_servers="localhost:9092", schema_version=version)
+    build, serialize = handler._build_record, handler._serializer.serialize
+    for record in records[:1000]:  # warm-up
+        serialize(build(record))
+    size = 0
+    start = time.perf_counter()
+    for record in records:
+        size += len(serialize(build(record)))
+    elapsed = time.perf_counter() - start
+    return size / len(records), elapsed / len(records) * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'records':<14} {'schema':>6} {'bytes/rec':>10} {'µs/rec':>8}")
+    for label, with_extra in (("plain", False), ("4 extra fields", True)):
+        records = _records(n, with_extra)
+        for version in (1, 2):
+            size, micros = _measure(version, records)
+            print(f"{label:<14} {'v' + str(version):>6} {size:>10.1f} {micros:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+KafkaHandler throughput with the broker replaced by an in-process stub producer.
+
+Measures the handler's own cost per record (payload build, Avro serialization,
+loop hand-off, ack collection) — broker round trips are excluded.
+
+    python benchmarks/bench_kafka_throughput.py [records]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.kafka import KafkaHandler  # noqa: E402
+
+
+class _StubProducer:
+    def __init__(self, **kwargs):
+        self.count = 0
+
+    async def start(self):
+        pass
+
+    async def send(self, topic, value=None, key=None, headers=None):
+        self.count += 1
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+    async def flush(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    record = logging.LogRecord("bench", logging.INFO, __file__, 1, "order %s shipped", ("A-1",), None)
+
+    with patch("logifyx.kafka.AIOKafkaProducer", _StubProducer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", max_pending=n)
+        start = time.perf_counter()
+        for _ in range(n):
+            handler.emit(record)
+        handler.flush(timeout=None)
+        elapsed = time.perf_counter() - start
+        handler.close()
+
+    print(f"{n} records in {elapsed:.2f}s  ->  {n / elapsed:,.0f} records/sec")
+
+
+if __name__ == "__main__":
+    main()
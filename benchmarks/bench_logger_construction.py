@@ -0,0 +1,74 @@
+"""
+Time to construct 1, 100 and 1000 module loggers, with and without the
+load_config() cache.
+
+The config directory holds a .env and a logifyx.yaml, as a typical service
+would. "uncached" clears the cache before every logger, so each one stats and
+parses both files again, which is what every construction did before the
+cache existed. All loggers write to the same file, so they share handlers.
+
+    python benchmarks/bench_logger_construction.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, clear_config_cache, shutdown  # noqa: E402
+
+COUNTS = (1, 100, 1000)
+
+_YAML = """\
+LOG_LEVEL: INFO
+LOG_COLOR: false
+LOG_MAX_BYTES: 10000000
+LOG_BACKUP_COUNT: 5
+LOG_REMOTE_HEADERS:
+  Content-Type: application/json
+  X-Service: bench
+"""
+
+_ENV = "LOG_MASK=true\nLOG_FILE=bench.log\n"
+
+
+def _write_config(config_dir):
+    old = time.time() - 60  # older than the cache's racy-file window
+    for name, text in (("logifyx.yaml", _YAML), (".env", _ENV)):
+        path = os.path.join(config_dir, name)
+        with open(path, "w") as f:
+            f.write(text)
+        os.utime(path, (old, old))
+
+
+def _run(count, cached, config_dir, log_dir):
+    clear_config_cache()
+    start = time.perf_counter()
+    for i in range(count):
+        if not cached:
+            clear_config_cache()
+        Logifyx(f"bench.module{i}", config_dir=config_dir, log_dir=log_dir)
+    elapsed = time.perf_counter() - start
+    shutdown()
+    logging.Logger.manager.loggerDict.clear()
+    return elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as config_dir, tempfile.TemporaryDirectory() as log_dir:
+        _write_config(config_dir)
+        _run(10, True, config_dir, log_dir)  # warm-up: imports yaml, dotenv
+        print(f"{'loggers':>7} {'uncached':>22} {'cached':>22}")
+        for count in COUNTS:
+            row = []
+            for cached in (False, True):
+                elapsed = _run(count, cached, config_dir, log_dir)
+                row.append(f"{elapsed * 1000:8.1f} ms {elapsed / count * 1e6:6.0f} µs/ea")
+            print(f"{count:>7} {row[0]:>22} {row[1]:>22}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Records/sec through a logger with three handlers, masking off vs on.
+
+Masking on is measured for a clean message (literal prefilter skips the regex)
+and for a message that contains a secret (single-pass regex runs once, not
+once per handler).
+
+    python benchmarks/bench_masking.py [records]
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.filters import MaskFilter  # noqa: E402
+
+
+class _RenderHandler(logging.Handler):
+    """Renders the message like a real sink would, then discards it."""
+
+    def emit(self, record):
+        record.getMessage()
+
+
+def _logger(mask):
+    logger = logging.Logger(f"bench-mask-{mask}")
+    shared = MaskFilter() if mask else None
+    for _ in range(3):
+        handler = _RenderHandler()
+        if shared is not None:
+            handler.addFilter(shared)
+        logger.addHandler(handler)
+    return logger
+
+
+def _run(logger, msg, args, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.info(msg, *args)
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cases = (
+        ("mask off",             False, "user %s logged in from %s", ("alice", "10.0.0.1")),
+        ("mask on, clean msg",   True,  "user %s logged in from %s", ("alice", "10.0.0.1")),
+        ("mask on, secret msg",  True,  "login user=%s password=%s", ("alice", "hunter2")),
+    )
+    for label, mask, msg, args in cases:
+        print(f"{label:<22} {_run(_logger(mask), msg, args, n):>12,.0f} records/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cost of the self-metrics registry: caller-side µs per log call with metrics
+on vs off (best of three runs), the raw cost of recording one value, and the cost of stats().
+
+Log calls go to a file logger (console to /dev/null), direct and with
+async_local. "observe" and "count" are metrics.observe() and metrics.count()
+on an existing key, which is what every timed log call and every sink
+delivery pays. "stats()" merges the shards of the threads that logged.
+
+    python benchmarks/bench_metrics.py [records]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, flush, stats  # noqa: E402
+from logifyx import metrics  # noqa: E402
+
+
+def _log_cost(n, log_dir, async_local, enabled, run):
+    devnull = open(os.devnull, "w")
+    stderr, sys.stderr = sys.stderr, devnull  # StreamHandler binds sys.stderr at creation
+    try:
+        log = Logifyx(
+            name=f"bench-metrics-{async_local}-{enabled}-{run}",
+            log_dir=log_dir,
+            color=False,
+            mask=False,
+            async_local=async_local,
+            metrics=enabled,
+            queue_size=n + 1,
+            queue_max_bytes=1 << 31,
+        )
+    finally:
+        sys.stderr = stderr
+    start = time.perf_counter()
+    for i in range(n):
+        log.info("request %d served in %d ms", i, 12)
+    elapsed = time.perf_counter() - start
+    flush(timeout=60)
+    log.close()  # the next run would share this console handler and its stream
+    devnull.close()
+    return elapsed / n * 1e6
+
+
+def _per_call(func, args, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func(*args)
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    print(f"{'log call':<14} {'metrics off':>12} {'metrics on':>12}   µs/call in caller")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for label, async_local in (("direct", False), ("async_local", True)):
+            # Best of three runs each, to even out noise
+            off = min(_log_cost(n, log_dir, async_local, False, run) for run in range(3))
+            on = min(_log_cost(n, log_dir, async_local, True, run) for run in range(3))
+            print(f"{label:<14} {off:>12.2f} {on:>12.2f}")
+
+    print()
+    print(f"{'record':<14} {'ns/call':>12}")
+    m = n * 20
+    print(f"{'observe':<14} {_per_call(metrics.observe, (('emit', 'bench'), 12_345), m):>12.0f}")
+    print(f"{'count':<14} {_per_call(metrics.count, (('handled', 'bench'),), m):>12.0f}")
+
+    # Shards from several threads, as in a service with a pool of workers
+    workers = [
+        threading.Thread(target=lambda: [metrics.observe(("emit", "bench"), i) for i in range(10_000)])
+        for _ in range(8)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    print(f"{'stats()':<14} {_per_call(stats, (), 1000) / 1000:>12.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
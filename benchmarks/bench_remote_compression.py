@@ -0,0 +1,94 @@
+"""
+RemoteHandler request-body compression against a local receiver: bytes on
+the wire and CPU cost per record for uncompressed, gzip and zstd bodies.
+
+Records are sent in NDJSON batches (remote_batch_size) and one per request.
+"wire B/rec" is body bytes the receiver read per record. "compress µs/rec" is
+the CPU time spent compressing (thread_time around the compressor), and
+"send µs/rec" the sender's wall time per record including the HTTP round
+trip. Records resemble typical service logs: a few recurring message
+templates with changing ids. Single records are compressed with
+compression_min_bytes=0; with the default (1024) they would go uncompressed.
+
+    python benchmarks/bench_remote_compression.py [records]
+"""
+
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.remote import RemoteHandler, close_sessions  # noqa: E402
+from _server import LocalReceiver  # noqa: E402
+
+_TEMPLATES = (
+    "order %s shipped to warehouse eu-west-1",
+    "payment %s authorised for customer",
+    "cache miss for session %s, fetching from upstream",
+    "request %s completed with status 200 in 12 ms",
+)
+
+
+def _timed(compress, spent):
+    def wrapper(body):
+        start = time.thread_time()
+        try:
+            return compress(body)
+        finally:
+            spent[0] += time.thread_time() - start
+    return wrapper
+
+
+def _run(receiver, records, **kwargs):
+    handler = RemoteHandler(receiver.url, compression_min_bytes=0, **kwargs)
+    spent = [0.0]
+    if handler._compress is not None:
+        handler._compress = _timed(handler._compress, spent)
+    before = receiver.bytes_received
+    start = time.perf_counter()
+    for record in records:
+        handler.emit(record)
+    handler.flush()
+    elapsed = time.perf_counter() - start
+    handler.close()
+    close_sessions()
+    n = len(records)
+    return (receiver.bytes_received - before) / n, spent[0] / n * 1e6, elapsed / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    records = [
+        logging.LogRecord(
+            "svc.orders", logging.INFO, "/app/orders.py", 42,
+            _TEMPLATES[i % len(_TEMPLATES)], (f"A-{i:08d}",), None, "handle",
+        )
+        for i in range(n)
+    ]
+
+    codecs = [("none", 0), ("gzip", 1), ("gzip", 3), ("gzip", 6), ("gzip", 9)]
+    try:
+        import zstandard  # noqa: F401
+        codecs += [("zstd", 1), ("zstd", 3), ("zstd", 9)]
+    except ImportError:
+        print("(zstd skipped: pip install zstandard)")
+
+    receiver = LocalReceiver()
+    try:
+        print(f"{'mode':<22} {'wire B/rec':>10} {'compress µs/rec':>16} {'send µs/rec':>12}")
+        for label, batch_size, count in (("NDJSON x100", 100, n), ("1 record/request", 0, min(n, 5000))):
+            for compression, level in codecs:
+                kwargs = {"compression": compression, "batch_size": batch_size, "batch_linger_ms": 60_000}
+                if compression != "none":
+                    kwargs["compression_level"] = level
+                size, cpu, wall = _run(receiver, records[:count], **kwargs)
+                mode = f"{label}, {compression}" + (f" {level}" if compression != "none" else "")
+                print(f"{mode:<22} {size:>10.1f} {cpu:>16.2f} {wall:>12.1f}")
+    finally:
+        receiver.close()
+
+
+if __name__ == "__main__":
+    main()
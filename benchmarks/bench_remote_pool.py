@@ -0,0 +1,56 @@
+"""
+Per-record latency of RemoteHandler: new connection per POST vs pooled keep-alive session.
+
+    python benchmarks/bench_remote_pool.py [records]
+"""
+
+import logging
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.remote import RemoteHandler, close_sessions  # noqa: E402
+from _server import LocalReceiver  # noqa: E402
+
+
+class _UnpooledRemoteHandler(RemoteHandler):
+    """Pre-pooling behaviour: module-level requests.post, one connection per record."""
+
+    def _post(self, **kwargs):
+        response = requests.post(self.url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+
+
+def _run(handler_cls, url, n):
+    handler = handler_cls(url=url, timeout=5)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    record = logging.LogRecord("bench", logging.INFO, __file__, 1, "user logged in", (), None)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        handler.emit(record)
+    elapsed = time.perf_counter() - start
+    handler.close()
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    for label, handler_cls in (("requests.post", _UnpooledRemoteHandler), ("pooled session", RemoteHandler)):
+        receiver = LocalReceiver()
+        elapsed = _run(handler_cls, receiver.url, n)
+        print(
+            f"{label:<16} {n} records  {elapsed * 1e6 / n:8.1f} us/record  "
+            f"{receiver.connections} TCP connection(s)"
+        )
+        receiver.close()
+        close_sessions()
+
+
+if __name__ == "__main__":
+    main()
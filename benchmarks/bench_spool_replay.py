@@ -0,0 +1,112 @@
+"""
+Disk spool cost and replay throughput for RemoteHandler, against a local
+receiver.
+
+"spool" is the time to append one request to the spool under each fsync
+policy, which is what a send costs while the receiver is down. "replay" fills
+a spool during a simulated outage, then starts a fresh handler (as after a
+restart) and measures how fast it drains the spool into the receiver, for one
+record per request and for 100-record NDJSON batches. Replay sends one
+request at a time, so against a local receiver it runs at about the speed of
+live sends (compare bench_remote_pool.py). The last row caps replay with
+spool_replay_rate to show the limit holds.
+
+    python benchmarks/bench_spool_replay.py [records]
+"""
+
+import contextlib
+import io
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.remote import RemoteHandler, close_sessions  # noqa: E402
+from logifyx.spool import DiskSpool  # noqa: E402
+from _server import LocalReceiver  # noqa: E402
+
+_BODY = (
+    b'{"level": "INFO", "message": "order A-00012345 shipped to warehouse eu-west-1", '
+    b'"service": "svc.orders", "timestamp": 1760000000.123, "file": "/app/orders.py", '
+    b'"line": 42, "func": "handle"}'
+)
+
+
+def _append_cost(fsync, n):
+    directory = tempfile.mkdtemp(prefix="logifyx_spool_")
+    try:
+        spool = DiskSpool(directory, fsync=fsync)
+        start = time.perf_counter()
+        for _ in range(n):
+            spool.append(_BODY)
+        elapsed = time.perf_counter() - start
+        spool.close()
+        return elapsed / n * 1e6
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _failing_post(**kwargs):
+    raise ConnectionError("receiver down")
+
+
+def _replay(url, spool_dir, n, batch_size, rate):
+    records = [
+        logging.LogRecord("svc.orders", logging.INFO, "/app/orders.py", 42, f"order A-{i:08d} shipped", (), None)
+        for i in range(n)
+    ]
+    kwargs = {"batch_size": batch_size, "batch_linger_ms": 60_000, "spool_dir": spool_dir, "spool_replay_rate": rate}
+
+    # Outage: every request goes to the spool
+    handler = RemoteHandler(url, **kwargs)
+    handler._post = _failing_post
+    handler._spooler.retry_interval = 3600
+    with contextlib.redirect_stderr(io.StringIO()):  # the expected outage warning
+        for record in records:
+            handler.emit(record)
+        handler.flush()
+    messages = len(handler._spooler.spool)
+    handler.close()
+
+    # Restart with the receiver up: the new handler replays the spool
+    start = time.perf_counter()
+    handler = RemoteHandler(url, **kwargs)
+    while handler._spooler.active:
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    handler.close()
+    return messages, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    print(f"{'spool':<28} {'µs/request':>10}")
+    for fsync in ("never", "interval", "always"):
+        count = n if fsync != "always" else min(n, 2000)
+        print(f"{'append, fsync=' + fsync:<28} {_append_cost(fsync, count):>10.1f}")
+
+    print()
+    print(f"{'replay':<28} {'requests':>10} {'requests/s':>11} {'records/s':>11}")
+    receiver = LocalReceiver()
+    spool_dir = tempfile.mkdtemp(prefix="logifyx_spool_")
+    try:
+        for label, batch_size, rate, count in (
+            ("1 record/request", 0, 1_000_000, n),
+            ("NDJSON x100", 100, 1_000_000, n * 5),
+            ("1 record/request, rate=500", 0, 500, 1000),
+        ):
+            messages, elapsed = _replay(receiver.url, spool_dir, count, batch_size, rate)
+            print(f"{label:<28} {messages:>10} {messages / elapsed:>11,.0f} {count / elapsed:>11,.0f}")
+            close_sessions()
+    finally:
+        receiver.close()
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
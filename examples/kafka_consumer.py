@@ -5,9 +5,10 @@ Usage: python examples/kafka_consumer.py
 """
 
 import asyncio
-import json
 from aiokafka import AIOKafkaConsumer
 
+from logifyx.kafka import decode_message
+
 
 async def consume_logs():
     consumer = AIOKafkaConsumer(
@@ -23,49 +24,37 @@ async def consume_logs():
     
     try:
         async for msg in consumer:
-            try:
-                # Try to parse as JSON (fallback mode)
-                log = json.loads(msg.value.decode('utf-8'))
-            except:
-                # Try Avro (skip magic byte + schema ID)
-                try:
-                    import fastavro
-                    import io
-                    from logifyx.kafka import LOG_SCHEMA_V1
-                    from fastavro.schema import parse_schema
-                    
-                    # Skip 5 bytes (1 magic + 4 schema ID)
-                    data = msg.value[5:] if msg.value[0] == 0 else msg.value
-                    reader = io.BytesIO(data)
-                    schema = parse_schema(LOG_SCHEMA_V1)
-                    log = fastavro.schemaless_reader(reader, schema)
-                except:
-                    log = {"message": msg.value.decode('utf-8', errors='ignore')}
-            
-            # Pretty print the log
-            level = log.get('level', 'INFO')
-            level_colors = {
-                'DEBUG': '\033[36m',    # Cyan
-                'INFO': '\033[32m',     # Green
-                'WARNING': '\033[33m',  # Yellow
-                'ERROR': '\033[31m',    # Red
-                'CRITICAL': '\033[35m'  # Magenta
-            }
-            reset = '\033[0m'
-            color = level_colors.get(level, '')
-            
-            print(f"{color}[{level}]{reset} {log.get('service', 'unknown')} - {log.get('message', '')}")
-            print(f"       📍 {log.get('file', '')}:{log.get('line', '')} @ {log.get('timestamp', '')}")
-            
-            if log.get('exception'):
-                print(f"       ❌ Exception:\n{log.get('exception')}")
-            
-            print("-" * 60)
+            # Handles single records and batches, schema v1 and v2, Avro and JSON fallback
+            for log in decode_message(msg.value, msg.headers, normalize=True):
+                print_log(log)
             
     finally:
         await consumer.stop()
 
 
+def print_log(log):
+    level = log.get('level') or 'INFO'
+    level_colors = {
+        'DEBUG': '\033[36m',    # Cyan
+        'INFO': '\033[32m',     # Green
+        'WARNING': '\033[33m',  # Yellow
+        'ERROR': '\033[31m',    # Red
+        'CRITICAL': '\033[35m'  # Magenta
+    }
+    reset = '\033[0m'
+    color = level_colors.get(level, '')
+    
+    print(f"{color}[{level}]{reset} {log.get('service', 'unknown')} - {log.get('message', '')}")
+    print(f"       📍 {log.get('file', '')}:{log.get('line', '')} @ {log.get('timestamp', '')}")
+    
+    if log.get('extra'):
+        print(f"       🏷️  {log.get('extra')}")
+    if log.get('exception'):
+        print(f"       ❌ Exception:\n{log.get('exception')}")
+    
+    print("-" * 60)
+
+
 if __name__ == "__main__":
     print("\n📨 Kafka Log Consumer")
     print("Press Ctrl+C to stop\n")
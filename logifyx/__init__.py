@@ -1,3 +1,11 @@
-from .core import Logifyx, ContextLoggerAdapter, get_logify_logger, setup_logify, shutdown, flush
+from .core import Logifyx, ContextLoggerAdapter, get_logify_logger, setup_logify, shutdown, flush, flush_async, queue_depths, dropped_counts, breaker_stats, stats, clear_config_cache
 
-__all__ = ["Logifyx", "ContextLoggerAdapter", "get_logify_logger", "setup_logify", "shutdown", "flush"]
+__all__ = ["Logifyx", "ContextLoggerAdapter", "get_logify_logger", "setup_logify", "shutdown", "flush", "flush_async", "queue_depths", "dropped_counts", "breaker_stats", "stats", "clear_config_cache", "LogCollector", "CollectorHandler"]
+
+
+def __getattr__(name):
+    # The collector pulls in socket and selectors; load it on first use
+    if name in ("LogCollector", "CollectorHandler"):
+        from . import collector
+        return getattr(collector, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,5 +7,13 @@ from .core import get_logify_logger as get_logify_logger
 from .core import setup_logify as setup_logify
 from .core import shutdown as shutdown
 from .core import flush as flush
+from .core import flush_async as flush_async
+from .core import queue_depths as queue_depths
+from .core import dropped_counts as dropped_counts
+from .core import breaker_stats as breaker_stats
+from .core import stats as stats
+from .core import clear_config_cache as clear_config_cache
+from .collector import LogCollector as LogCollector
+from .collector import CollectorHandler as CollectorHandler
 
 __all__: List[str]
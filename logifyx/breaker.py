@@ -0,0 +1,193 @@
+"""
+Circuit breaker for network sinks (remote HTTP, Kafka).
+
+    closed ──(max_failures consecutive failures)──▶ open
+    open ──(backoff expired, next send is the probe)──▶ half_open
+    half_open ──(probe succeeds)──▶ closed
+    half_open ──(probe fails)──▶ open, with twice the backoff
+
+While the breaker is open, records are dropped without a send. The backoff
+starts at backoff_ms, doubles on every failed probe up to max_backoff_ms and
+is jittered (a random value between half and all of it), so processes that
+lost the same collector do not all probe it at the same instant. A
+successful probe closes the breaker and resets the backoff.
+
+allow() and shedding() do not lock while the breaker is closed, or while it
+is open and its backoff has not expired, so the open state costs the
+emitting thread one attribute read and a clock read.
+"""
+
+import random
+import sys
+import threading
+import time
+from typing import Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+TRANSITIONS = (
+    (CLOSED, OPEN),
+    (OPEN, HALF_OPEN),
+    (HALF_OPEN, CLOSED),
+    (HALF_OPEN, OPEN),
+)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with jittered exponential backoff.
+
+    The handler calls allow() before a send and skips the send if it returns
+    False, then reports the outcome with success() or failure(). When allow()
+    moves the breaker to half-open, that caller's send is the probe; other
+    callers are refused until the probe reports back, or until the backoff
+    passes again without a report (the probe record was lost).
+
+    Metrics: `transitions` counts each state change (keys like
+    "closed->open"), `failed` counts every failed send reported, and
+    `rejected` counts records refused while open or half-open. rejected is
+    updated without a lock and may undercount under heavy contention.
+
+    Args:
+        label:          Destination shown in warnings, e.g. the URL.
+        max_failures:   Consecutive failures that open the breaker.
+        backoff_ms:     Open time after the first trip.
+        max_backoff_ms: Upper bound for the doubled open time.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        max_failures: int = 3,
+        backoff_ms: int = 1000,
+        max_backoff_ms: int = 60_000,
+    ):
+        self.label = label
+        self.max_failures = max(1, max_failures)
+        self.backoff_ms = backoff_ms
+        self.max_backoff_ms = max(backoff_ms, max_backoff_ms)
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_at = 0.0  # monotonic time the next probe is allowed
+        self.failed = 0
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {f"{a}->{b}": 0 for a, b in TRANSITIONS}
+        self._trips = 0  # failed probes since the breaker last closed
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if the caller may send. May make the caller the half-open probe."""
+        if self.state == CLOSED:
+            return True
+        if time.monotonic() < self.retry_at:
+            self.rejected += 1
+            return False
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if now < self.retry_at:
+                self.rejected += 1
+                return False
+            if self.state == OPEN:
+                self._move(HALF_OPEN)
+            # Also re-arms a half-open breaker whose probe never reported back
+            self.retry_at = now + self._backoff() / 1000.0
+            return True
+
+    def shedding(self) -> bool:
+        """
+        True while the breaker is open and its backoff has not expired, so a
+        record would be refused anyway. Lock-free; counts the record as rejected.
+        """
+        if self.state == CLOSED or time.monotonic() >= self.retry_at:
+            return False
+        self.rejected += 1
+        return True
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 while closed)."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def success(self) -> None:
+        """Report a successful send: reset the failure count and close the breaker."""
+        if self.state == CLOSED and not self.failures:
+            return
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                self._move(CLOSED)
+                self._trips = 0
+                print(f"⚠️ Logging to {self.label} recovered", file=sys.stderr)
+
+    def failure(self, count: int = 1) -> None:
+        """Report count failed sends. Sends that were already in flight when the breaker opened are ignored."""
+        with self._lock:
+            self.failed += count
+            if self.state == OPEN:
+                return
+            if self.state == HALF_OPEN:
+                self._trips += 1
+                self._open()
+                return
+            self.failures += count
+            if self.failures >= self.max_failures:
+                self._open()
+
+    def trip(self) -> None:
+        """Open the breaker until reset() is called."""
+        with self._lock:
+            if self.state != OPEN:
+                self._move(OPEN)
+            self.retry_at = float("inf")
+
+    def reset(self) -> None:
+        """Close the breaker and forget failures and backoff."""
+        with self._lock:
+            if self.state != CLOSED:
+                self._move(CLOSED)
+            self.failures = 0
+            self._trips = 0
+            self.retry_at = 0.0
+
+    def stats(self) -> dict:
+        """Current state, failure count, time to the next probe and the metrics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in(), 3),
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
+
+    def _backoff(self) -> float:
+        """Jittered backoff in ms for the current number of failed probes."""
+        delay = min(self.max_backoff_ms, self.backoff_ms * 2 ** min(self._trips, 32))
+        return random.uniform(delay / 2, delay)
+
+    def _open(self) -> None:
+        """Caller holds _lock."""
+        delay = self._backoff()
+        self.retry_at = time.monotonic() + delay / 1000.0
+        if self.state == CLOSED:
+            print(
+                f"⚠️ Logging to {self.label} suspended after {self.failures} failures, "
+                f"retrying in {delay / 1000.0:.1f}s",
+                file=sys.stderr
+            )
+        self.failures = 0
+        self._move(OPEN)
+
+    def _move(self, state: str) -> None:
+        """Caller holds _lock."""
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.state = state
+
+    def _reinit_after_fork(self) -> None:
+        self._lock = threading.Lock()
@@ -1,6 +1,7 @@
 import argparse
 import json
 import os
+import signal
 from pathlib import Path
 
 from .config import load_config
@@ -40,8 +41,38 @@ def main():
         help="Show runtime config (from last Logifyx instance)"
     )
 
+    parser.add_argument(
+        "--collect",
+        metavar="SOCKET",
+        help="Run a log collector on this Unix socket for multi-process servers "
+             "(configured from logifyx.yaml + env, like --config)"
+    )
+
     args = parser.parse_args()
 
+    # If --collect is passed (run the collector in the foreground)
+    if args.collect:
+        from .collector import LogCollector
+
+        options = {
+            key: value for key, value in (
+                ("config_dir", args.config_dir),
+                ("env_file", args.env_file),
+                ("yaml_file", args.yaml_file),
+            ) if value is not None
+        }
+        collector = LogCollector(args.collect, **options)
+        # Process managers stop services with SIGTERM; treat it like Ctrl+C
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        print(f"📥 Logifyx collector listening on {args.collect}")
+        try:
+            collector.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            collector.stop()
+        return
+
     # If --config is passed (show env/yaml/defaults)
     if args.config:
         config_dir = args.config_dir or os.getcwd()
@@ -0,0 +1,398 @@
+"""
+Multi-process log aggregation over a Unix domain socket.
+
+Under a prefork server (gunicorn, uwsgi) every worker would otherwise open the
+log file, HTTP pool and Kafka producer itself, and all of them contend on the
+rotating file handler's lock. With a collector, workers only ship records and
+one process does the writing:
+
+    worker 1 ─┐
+    worker 2 ─┼─ CollectorHandler ── unix socket ──→ LogCollector
+    worker N ─┘   (batched frames)                   (file, remote, Kafka sinks)
+
+Workers opt in with collector_socket (or LOG_COLLECTOR_SOCKET); console output
+stays in the worker. The collector is started once, before the workers fork:
+
+    from logifyx import LogCollector
+
+    collector = LogCollector("/tmp/logifyx.sock", log_dir="logs")
+    collector.start()            # background thread; or serve_forever()
+
+or from the command line: `logifyx --collect /tmp/logifyx.sock`.
+
+Each frame is a 4-byte big-endian length followed by a JSON array of events,
+one array per record: the LogEvent fields, then process id and thread name.
+"""
+
+import json
+import logging
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from .core import Logifyx
+from .event import LogEvent, attach_event, get_event
+
+
+_HEADER = struct.Struct(">I")
+
+# Frames larger than this are a protocol error (the peer is dropped)
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+_MIN_BACKOFF = 0.05
+_RECV_SIZE = 256 * 1024
+
+
+def encode_frame(records: List[logging.LogRecord]) -> bytes:
+    """Encode records as one length-prefixed frame."""
+    events = []
+    for record in records:
+        event = list(get_event(record))
+        event.append(record.process)
+        event.append(record.threadName)
+        events.append(event)
+    body = json.dumps(events, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+def decode_frames(buffer: bytearray) -> List[logging.LogRecord]:
+    """
+    Take every complete frame off the front of buffer and return its records.
+    An incomplete trailing frame is left in the buffer.
+
+    Raises ValueError for a frame over MAX_FRAME_BYTES or one that is not valid JSON.
+    """
+    records = []
+    offset = 0
+    end = len(buffer)
+    while end - offset >= _HEADER.size:
+        (length,) = _HEADER.unpack_from(buffer, offset)
+        if length > MAX_FRAME_BYTES:
+            raise ValueError(f"frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+        start = offset + _HEADER.size
+        if end - start < length:
+            break
+        for fields in json.loads(bytes(buffer[start:start + length])):
+            records.append(_to_record(fields))
+        offset = start + length
+    del buffer[:offset]
+    return records
+
+
+def _to_record(fields: list) -> logging.LogRecord:
+    n = len(LogEvent._fields)
+    event = LogEvent(*fields[:n])
+    process, thread_name = fields[n:n + 2]
+    # Fill the record's __dict__ directly: LogRecord.__init__ would look up
+    # the current thread and process, which belong to the collector.
+    record = logging.LogRecord.__new__(logging.LogRecord)
+    record.__dict__.update({
+        "name": event.name,
+        "msg": event.message,
+        "args": None,
+        "levelname": event.levelname,
+        "levelno": event.levelno,
+        "pathname": event.pathname,
+        "filename": event.filename,
+        "module": event.filename.rpartition(".")[0] or event.filename,
+        "exc_info": None,
+        "exc_text": event.exc_text,
+        "stack_info": event.stack_info,
+        "lineno": event.lineno,
+        "funcName": event.func,
+        "created": event.created,
+        "msecs": event.msecs,
+        "relativeCreated": (event.created - logging._startTime) * 1000,
+        "thread": None,
+        "threadName": thread_name,
+        "processName": None,
+        "process": process,
+    })
+    if event.masked:
+        record._logifyx_masked = True
+    attach_event(record, event)
+    return record
+
+
+class CollectorHandler(logging.Handler):
+    """
+    Ships records to a LogCollector over a Unix domain socket.
+
+    Runs behind an AsyncSink: each batch the sink hands over goes out as one
+    frame. If the collector is unreachable the handler reconnects with
+    exponential backoff for up to retry_timeout seconds per batch, then drops
+    the batch and counts it in `dropped`. While it retries, the sink's queue
+    fills and its overflow policy applies, which is the backpressure a slow or
+    restarting collector puts on the workers.
+
+    Args:
+        socket_path:   Path of the collector's Unix socket.
+        retry_timeout: Longest one batch waits for the collector. Default: 5.0.
+        max_backoff:   Cap on the delay between reconnect attempts. Default: 2.0.
+        send_timeout:  Longest a single send may block. Default: 10.0.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        retry_timeout: float = 5.0,
+        max_backoff: float = 2.0,
+        send_timeout: float = 10.0,
+    ):
+        super().__init__()
+        self.socket_path = socket_path
+        self.retry_timeout = retry_timeout
+        self.max_backoff = max_backoff
+        self.send_timeout = send_timeout
+        self.dropped = 0
+        self._sock: Optional[socket.socket] = None
+        self._backoff = _MIN_BACKOFF
+        self._warned = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.emit_batch([record])
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Send the records that pass this handler's level and filters as one frame."""
+        records = [r for r in records if r.levelno >= self.level and self.filter(r)]
+        if not records:
+            return
+        try:
+            frame = encode_frame(records)
+        except Exception:
+            self.handleError(records[0])
+            return
+        self.acquire()
+        try:
+            sent = self._send(frame)
+        finally:
+            self.release()
+        if not sent:
+            self.dropped += len(records)
+            if not self._warned:
+                self._warned = True
+                print(
+                    f"⚠️ Logifyx collector at {self.socket_path} is unreachable — "
+                    f"dropping records until it is back ({self.dropped} dropped so far)",
+                    file=sys.stderr
+                )
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.send_timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _send(self, frame: bytes) -> bool:
+        """Caller holds the handler lock. False if the collector stayed unreachable."""
+        deadline = time.monotonic() + self.retry_timeout
+        while True:
+            try:
+                if self._sock is None:
+                    self._connect()
+                self._sock.sendall(frame)
+                self._backoff = _MIN_BACKOFF
+                self._warned = False
+                return True
+            except OSError:
+                # A half-sent frame is discarded by the collector when the
+                # connection closes, so the whole frame is resent.
+                self._disconnect()
+            delay = min(self._backoff, deadline - time.monotonic())
+            if delay <= 0:
+                return False
+            time.sleep(delay)
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    def _reinit_after_fork(self) -> None:
+        """
+        Drop the parent's connection in a forked child, so frames from the two
+        processes are never interleaved on one socket. The child reconnects on
+        its next batch.
+        """
+        self._disconnect()
+        self._backoff = _MIN_BACKOFF
+        self._warned = False
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._disconnect()
+        finally:
+            self.release()
+        super().close()
+
+
+class _CollectorLogger(Logifyx):
+    """The collector's writer: a Logifyx logger without console output."""
+
+    def _handler_specs(self):
+        return [spec for spec in super()._handler_specs() if spec.kind != "console"]
+
+    def handle(self, record: logging.LogRecord) -> None:
+        # Records arrive already made, so the level check of a log call never
+        # ran for them, and shared handlers are at NOTSET
+        if record.levelno >= self.getEffectiveLevel():
+            super().handle(record)
+
+
+class LogCollector:
+    """
+    Receives records from CollectorHandlers and writes them through one set of
+    file, remote and Kafka sinks.
+
+    Any Logifyx keyword argument configures those sinks; collector_socket is
+    ignored here. Local output is batched (async_local) and the sink queues
+    default to the "block" overflow policy, so a slow sink makes the collector
+    read more slowly and the workers' own queues absorb the difference.
+
+        collector = LogCollector("/tmp/logifyx.sock", log_dir="logs")
+        collector.start()
+        ...
+        collector.stop()
+
+    Args:
+        socket_path: Path of the Unix socket to listen on. A stale socket file
+                     left by a previous run is removed.
+        name:        Name of the collector's internal logger. Default: "logifyx.collector".
+        **kwargs:    Logifyx options for the collector's sinks.
+    """
+
+    def __init__(self, socket_path: str, name: str = "logifyx.collector", **kwargs):
+        kwargs["collector_socket"] = ""
+        kwargs.setdefault("async_local", True)
+        kwargs.setdefault("queue_overflow", "block")
+        self.socket_path = socket_path
+        self.logger = _CollectorLogger(name, **kwargs)
+        self.received = 0
+        self._server: Optional[socket.socket] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+
+    def _listen(self) -> None:
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # left behind by a collector that died
+            else:
+                raise RuntimeError(f"A collector is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(128)
+        server.setblocking(False)
+        self._server = server
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(server, selectors.EVENT_READ, None)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+
+    def start(self) -> "LogCollector":
+        """Listen and serve from a background thread. Returns self."""
+        self._listen_or_stop()
+        self._thread = threading.Thread(target=self._serve, name="logifyx-collector", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Listen and serve on the calling thread until stop() is called."""
+        self._listen_or_stop()
+        self._serve()
+
+    def _listen_or_stop(self) -> None:
+        try:
+            self._listen()
+        except Exception:
+            self.stop()  # release the sinks built in __init__
+            raise
+
+    def _serve(self) -> None:
+        selector = self._selector
+        try:
+            while not self._stopping.is_set():
+                for key, _ in selector.select():
+                    sock = key.fileobj
+                    if sock is self._server:
+                        self._accept()
+                    elif sock is self._wakeup_r:
+                        return
+                    else:
+                        self._read(sock, key.data)
+        finally:
+            for key in list(selector.get_map().values()):
+                if key.data is not None:
+                    key.fileobj.close()
+            selector.close()
+            self._server.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def _accept(self) -> None:
+        try:
+            conn, _ = self._server.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        conn.setblocking(False)
+        self._selector.register(conn, selectors.EVENT_READ, bytearray())
+
+    def _read(self, conn: socket.socket, buffer: bytearray) -> None:
+        try:
+            data = conn.recv(_RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            # Worker went away; an unfinished frame in buffer is discarded
+            self._selector.unregister(conn)
+            conn.close()
+            return
+        buffer += data
+        try:
+            records = decode_frames(buffer)
+        except ValueError as e:
+            print(f"⚠️ Logifyx collector dropped a connection: {e}", file=sys.stderr)
+            self._selector.unregister(conn)
+            conn.close()
+            return
+        handle = self.logger.handle
+        for record in records:
+            handle(record)
+        self.received += len(records)
+
+    def stop(self) -> None:
+        """Stop serving, then drain the collector's sinks and close them."""
+        self._stopping.set()
+        try:
+            self._wakeup_w.send(b"\0")
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.logger.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
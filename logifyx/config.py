@@ -1,9 +1,9 @@
 import os
-import yaml
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Optional
-from dotenv import dotenv_values
+from typing import Dict, Optional, Tuple
 
 CONFIG_FILE = "logifyx.yaml"
 ENV_FILE = ".env"
@@ -15,6 +15,11 @@ _VALID_COMPATIBILITY = {
     "FULL",     "FULL_TRANSITIVE",
     "NONE",
 }
+_VALID_BATCH_FORMATS = {"ndjson", "json"}
+_VALID_REMOTE_COMPRESSION = {"none", "gzip", "zstd"}
+_VALID_KAFKA_CODECS = {"null", "deflate", "zstd"}
+_VALID_OVERFLOW = {"block", "drop_newest", "drop_oldest", "drop_below"}
+_VALID_SPOOL_FSYNC = {"always", "interval", "never"}
 
 
 def _resolve_path(path: Optional[str]) -> Optional[Path]:
@@ -32,6 +37,21 @@ def _resolve_config_dir(config_dir: Optional[str]) -> Path:
     return Path.cwd().resolve()
 
 
+def config_file_paths(
+    config_dir: Optional[str] = None,
+    env_file: Optional[str] = None,
+    yaml_file: Optional[str] = None,
+) -> Tuple[Path, Path]:
+    """
+    The .env and YAML paths load_config() would read with these arguments,
+    whether or not the files exist yet. Used by the config watcher.
+    """
+    base_dir = _resolve_config_dir(config_dir)
+    env_path = Path(os.path.abspath(os.path.expanduser(env_file))) if env_file else base_dir / ENV_FILE
+    config_path = Path(os.path.abspath(os.path.expanduser(yaml_file))) if yaml_file else base_dir / CONFIG_FILE
+    return env_path, config_path
+
+
 def _as_bool(key: str, value, default: bool) -> bool:
     """Parse a bool from env/yaml. Only accepts True/False or the strings 'true'/'false'."""
     if value is None:
@@ -67,21 +87,105 @@ def _as_int(key: str, value, default: int, min_val: int = 0) -> int:
     return result
 
 
+# Resolved configs, keyed by the files they were read from (path, mtime, size)
+# and the LOG_* environment. See load_config() and clear_config_cache().
+_CACHE_MAX_ENTRIES = 64
+
+# File timestamps have coarse (clock tick) resolution, so a file rewritten
+# with the same size within one tick keeps its key. Files modified this
+# recently are re-read on every call instead of cached (like git's "racy" index
+# entries).
+_RACY_WINDOW_NS = 2_000_000_000
+_cache: Dict[tuple, dict] = {}
+_cache_lock = threading.Lock()
+
+
+def _file_key(path: Optional[Path]) -> Optional[tuple]:
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (str(path), None, None)
+    return (str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+
+def _copy_config(config: dict) -> dict:
+    """Copy a cached config so callers can change it (dicts and lists included)."""
+    return {k: (v.copy() if isinstance(v, (dict, list)) else v) for k, v in config.items()}
+
+
+def clear_config_cache() -> None:
+    """
+    Forget every cached config, so the next load_config() reads the files again.
+
+    Not needed after editing .env or logifyx.yaml or changing a LOG_* variable:
+    those change the cache key. Use it when a file was rewritten with the same
+    size and modification time, or in tests.
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+def _reinit_cache_after_fork() -> None:
+    """Replace the cache lock in a forked child (another thread may have held it)."""
+    global _cache_lock
+    _cache_lock = threading.Lock()
+
+
 def load_config(
     config_dir: Optional[str] = None,
     env_file: Optional[str] = None,
     yaml_file: Optional[str] = None,
 ):
-    base_dir = _resolve_config_dir(config_dir)
+    """
+    Resolve the config from env vars, .env, logifyx.yaml and defaults.
 
+    Results are cached per process. The key is the resolved .env and YAML
+    paths with their modification time and size, plus every LOG_* environment
+    variable, so an edited file or a changed variable is picked up on the next
+    call. Files modified in the last two seconds are always re-read. Each
+    call returns a fresh copy.
+    """
+    base_dir = _resolve_config_dir(config_dir)
     env_path = _resolve_path(env_file) or (base_dir / ENV_FILE if (base_dir / ENV_FILE).is_file() else None)
-    env_values = dotenv_values(env_path) if env_path else {}
-    yaml_config = {}
-
     config_path = _resolve_path(yaml_file) or (base_dir / CONFIG_FILE if (base_dir / CONFIG_FILE).is_file() else None)
 
+    key = (
+        _file_key(env_path),
+        _file_key(config_path),
+        tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith("LOG_"))),
+    )
+    now = time.time_ns()
+    racy = any(
+        file_key is not None and file_key[1] is not None and now - file_key[1] < _RACY_WINDOW_NS
+        for file_key in key[:2]
+    )
+    if racy:
+        return _build_config(env_path, config_path)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is None:
+        cached = _build_config(env_path, config_path)
+        with _cache_lock:
+            if len(_cache) >= _CACHE_MAX_ENTRIES:
+                _cache.pop(next(iter(_cache)))
+            _cache[key] = cached
+    return _copy_config(cached)
+
+
+def _build_config(env_path: Optional[Path], config_path: Optional[Path]) -> dict:
+    env_values = {}
+    if env_path:
+        from dotenv import dotenv_values  # imported only when there is a .env file
+        env_values = dotenv_values(env_path)
+    yaml_config = {}
+
     # Auto-load logifyx.yaml if it exists
     if config_path:
+        import yaml  # imported only when there is a YAML file
+
         with open(config_path, encoding="utf-8") as f:
             yaml_config = yaml.safe_load(f) or {}
 
@@ -103,12 +207,35 @@ def load_config(
     config["color"]     = _as_bool("LOG_COLOR", _resolve_value("LOG_COLOR", True),   True)
     config["json_mode"] = _as_bool("LOG_JSON",  _resolve_value("LOG_JSON",  False),  False)
     config["mask"]      = _as_bool("LOG_MASK",  _resolve_value("LOG_MASK",  True),   True)
+    config["async_local"] = _as_bool("LOG_ASYNC_LOCAL", _resolve_value("LOG_ASYNC_LOCAL", False), False)
+    config["watch_config"] = _as_bool("LOG_WATCH_CONFIG", _resolve_value("LOG_WATCH_CONFIG", False), False)
+    config["metrics"] = _as_bool("LOG_METRICS", _resolve_value("LOG_METRICS", True), True)
 
     # ints
     config["max_bytes"]         = _as_int("LOG_MAX_BYTES",    _resolve_value("LOG_MAX_BYTES",    10_000_000), 10_000_000, min_val=1)
     config["backup_count"]      = _as_int("LOG_BACKUP_COUNT", _resolve_value("LOG_BACKUP_COUNT", 5),          5,          min_val=0)
     config["remote_timeout"]    = _as_int("LOG_REMOTE_TIMEOUT", _resolve_value("LOG_REMOTE_TIMEOUT", 5),      5,          min_val=1)
     config["max_remote_retries"] = _as_int("LOG_REMOTE_RETRIES", _resolve_value("LOG_REMOTE_RETRIES", 3),     3,          min_val=0)
+    config["remote_pool_size"]   = _as_int("LOG_REMOTE_POOL_SIZE", _resolve_value("LOG_REMOTE_POOL_SIZE", 10),      10,         min_val=1)
+    config["remote_compression_level"] = _as_int("LOG_REMOTE_COMPRESSION_LEVEL", _resolve_value("LOG_REMOTE_COMPRESSION_LEVEL", 3), 3, min_val=0)
+    config["remote_compression_min_bytes"] = _as_int("LOG_REMOTE_COMPRESSION_MIN_BYTES", _resolve_value("LOG_REMOTE_COMPRESSION_MIN_BYTES", 1024), 1024, min_val=0)
+    config["kafka_linger_ms"]    = _as_int("LOG_KAFKA_LINGER_MS",  _resolve_value("LOG_KAFKA_LINGER_MS",  5),       5,          min_val=0)
+    config["kafka_batch_size"]   = _as_int("LOG_KAFKA_BATCH_SIZE", _resolve_value("LOG_KAFKA_BATCH_SIZE", 65536),   65536,      min_val=1)
+    config["kafka_batch_records"] = _as_int("LOG_KAFKA_BATCH_RECORDS", _resolve_value("LOG_KAFKA_BATCH_RECORDS", 0),  0,          min_val=0)
+    config["kafka_schema_version"] = _as_int("LOG_KAFKA_SCHEMA_VERSION", _resolve_value("LOG_KAFKA_SCHEMA_VERSION", 1), 1,        min_val=1)
+    if config["kafka_schema_version"] > 2:
+        raise ValueError(f"LOG_KAFKA_SCHEMA_VERSION must be 1 or 2, got {config['kafka_schema_version']!r}")
+    config["queue_size"]         = _as_int("LOG_QUEUE_SIZE",       _resolve_value("LOG_QUEUE_SIZE",       100_000), 100_000,    min_val=1)
+    config["remote_workers"]     = _as_int("LOG_REMOTE_WORKERS",   _resolve_value("LOG_REMOTE_WORKERS",   1),       1,          min_val=1)
+    config["queue_max_bytes"]    = _as_int("LOG_QUEUE_MAX_BYTES",  _resolve_value("LOG_QUEUE_MAX_BYTES",  67_108_864), 67_108_864, min_val=1)
+    config["queue_block_timeout_ms"] = _as_int("LOG_QUEUE_BLOCK_TIMEOUT_MS", _resolve_value("LOG_QUEUE_BLOCK_TIMEOUT_MS", 1000), 1000, min_val=0)
+    config["remote_batch_size"]      = _as_int("LOG_REMOTE_BATCH_SIZE",      _resolve_value("LOG_REMOTE_BATCH_SIZE",      0),         0,         min_val=0)
+    config["remote_batch_bytes"]     = _as_int("LOG_REMOTE_BATCH_BYTES",     _resolve_value("LOG_REMOTE_BATCH_BYTES",     1_000_000), 1_000_000, min_val=1)
+    config["remote_batch_linger_ms"] = _as_int("LOG_REMOTE_BATCH_LINGER_MS", _resolve_value("LOG_REMOTE_BATCH_LINGER_MS", 1000),      1000,      min_val=1)
+    config["spool_max_bytes"]        = _as_int("LOG_SPOOL_MAX_BYTES",        _resolve_value("LOG_SPOOL_MAX_BYTES",        268_435_456), 268_435_456, min_val=1)
+    config["spool_replay_rate"]      = _as_int("LOG_SPOOL_REPLAY_RATE",      _resolve_value("LOG_SPOOL_REPLAY_RATE",      200),       200,       min_val=1)
+    config["breaker_backoff_ms"]     = _as_int("LOG_BREAKER_BACKOFF_MS",     _resolve_value("LOG_BREAKER_BACKOFF_MS",     1000),      1000,      min_val=1)
+    config["breaker_max_backoff_ms"] = _as_int("LOG_BREAKER_MAX_BACKOFF_MS", _resolve_value("LOG_BREAKER_MAX_BACKOFF_MS", 60_000),    60_000,    min_val=1)
 
     # strings
     config["log_dir"]            = _resolve_value("LOG_DIR",            "logs")
@@ -117,6 +244,8 @@ def load_config(
     config["kafka_servers"]      = _resolve_value("LOG_KAFKA_SERVERS",  None)
     config["kafka_topic"]        = _resolve_value("LOG_KAFKA_TOPIC",    "logs")
     config["schema_registry_url"] = _resolve_value("LOG_SCHEMA_REGISTRY", None)
+    config["collector_socket"]   = _resolve_value("LOG_COLLECTOR_SOCKET", None)
+    config["spool_dir"]          = _resolve_value("LOG_SPOOL_DIR",      None)
 
     # schema_compatibility
     compatibility = _resolve_value("LOG_SCHEMA_COMPATIBILITY", "BACKWARD")
@@ -129,6 +258,63 @@ def load_config(
         )
     config["schema_compatibility"] = compatibility
 
+    # remote_batch_format
+    batch_format = _resolve_value("LOG_REMOTE_BATCH_FORMAT", "ndjson")
+    if isinstance(batch_format, str):
+        batch_format = batch_format.lower()
+    if batch_format not in _VALID_BATCH_FORMATS:
+        raise ValueError(
+            f"LOG_REMOTE_BATCH_FORMAT must be one of {sorted(_VALID_BATCH_FORMATS)}, "
+            f"got {batch_format!r}"
+        )
+    config["remote_batch_format"] = batch_format
+
+    remote_compression = _resolve_value("LOG_REMOTE_COMPRESSION", "none")
+    if isinstance(remote_compression, str):
+        remote_compression = remote_compression.lower()
+    if remote_compression not in _VALID_REMOTE_COMPRESSION:
+        raise ValueError(
+            f"LOG_REMOTE_COMPRESSION must be one of {sorted(_VALID_REMOTE_COMPRESSION)}, "
+            f"got {remote_compression!r}"
+        )
+    config["remote_compression"] = remote_compression
+
+    kafka_codec = _resolve_value("LOG_KAFKA_BATCH_CODEC", "deflate")
+    if isinstance(kafka_codec, str):
+        kafka_codec = kafka_codec.lower()
+    if kafka_codec not in _VALID_KAFKA_CODECS:
+        raise ValueError(
+            f"LOG_KAFKA_BATCH_CODEC must be one of {sorted(_VALID_KAFKA_CODECS)}, "
+            f"got {kafka_codec!r}"
+        )
+    config["kafka_batch_codec"] = kafka_codec
+
+    spool_fsync = _resolve_value("LOG_SPOOL_FSYNC", "interval")
+    if isinstance(spool_fsync, str):
+        spool_fsync = spool_fsync.lower()
+    if spool_fsync not in _VALID_SPOOL_FSYNC:
+        raise ValueError(
+            f"LOG_SPOOL_FSYNC must be one of {sorted(_VALID_SPOOL_FSYNC)}, got {spool_fsync!r}"
+        )
+    config["spool_fsync"] = spool_fsync
+
+    # queue overflow policy
+    overflow = _resolve_value("LOG_QUEUE_OVERFLOW", "drop_newest")
+    if isinstance(overflow, str):
+        overflow = overflow.lower()
+    if overflow not in _VALID_OVERFLOW:
+        raise ValueError(
+            f"LOG_QUEUE_OVERFLOW must be one of {sorted(_VALID_OVERFLOW)}, got {overflow!r}"
+        )
+    config["queue_overflow"] = overflow
+
+    drop_level = _resolve_value("LOG_QUEUE_DROP_LEVEL", "WARNING")
+    if not isinstance(drop_level, str) or drop_level.upper() not in _VALID_LEVELS:
+        raise ValueError(
+            f"LOG_QUEUE_DROP_LEVEL must be one of {sorted(_VALID_LEVELS)}, got {drop_level!r}"
+        )
+    config["queue_drop_level"] = drop_level.upper()
+
     # file default tracking
     file_provided = (
         os.getenv("LOG_FILE") is not None
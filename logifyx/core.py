@@ -1,14 +1,17 @@
 import logging
-from logging.handlers import QueueHandler, QueueListener
+import os
+import sys
 import time
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union
 import threading
-import queue
 import atexit
-from .config import load_config
+from .config import load_config, clear_config_cache, _reinit_cache_after_fork
 from .formatter import get_formatter
 from .filters import MaskFilter
-from .handler import get_handlers
+from .handler import get_handler_specs
+from .registry import SinkRegistry
+from . import metrics as _metrics
+from .sinks import AsyncSink, SinkQueueHandler, OVERFLOW_POLICIES
 
 
 # Sentinel object to detect if a parameter was explicitly passed
@@ -30,12 +33,15 @@ def _normalize_and_validate_level(level: Union[int, str]) -> Union[int, str]:
     return level
 
 
-# Global queue and listener for async remote/kafka handling
-_log_queue: queue.Queue = queue.Queue(maxsize=10_00_000)  # Large maxsize to prevent blocking in high-throughput scenarios
-_queue_listener: Optional[QueueListener] = None
-_listener_lock = threading.Lock()
+# Async sinks (remote, kafka) — each has its own bounded queue and worker thread(s)
+# so a slow sink only backs up its own queue.
+_sinks: List[AsyncSink] = []
+_sinks_lock = threading.Lock()
 _atexit_registered = False
 
+# Handlers and sinks shared by every logger with the same destination and settings
+_registry = SinkRegistry()
+
 # Holds kwargs from get_logify_logger() so __init__ can pick them up.
 # logging.getLogger() triggers Logifyx(name) with no extra args; this dict
 # bridges the gap so user-supplied kwargs reach configure() on first creation.
@@ -47,55 +53,271 @@ def _default_log_file(name: str) -> str:
     return base_name if base_name.lower().endswith(".log") else f"{base_name}.log"
 
 
-def _start_queue_listener(handlers: list) -> None:
-    """Start background listener for async handlers (remote, kafka)."""
-    global _queue_listener, _atexit_registered
-    with _listener_lock:
-        if _queue_listener is None and handlers:
-            _queue_listener = QueueListener(
-                _log_queue,
-                *handlers,
-                respect_handler_level=True
-            )
-            _queue_listener.start()
-            
-            # Register atexit handler to flush remaining logs on exit
-            if not _atexit_registered:
-                atexit.register(_flush_and_stop_listener)
-                _atexit_registered = True
+# Max records a local (file/console) writer formats and writes in one go
+_LOCAL_BATCH_SIZE = 256
+
+
+def _start_sinks(
+    handlers: list, config: Dict[str, Any], batch_size: int = 1, workers: int = 1
+) -> List[AsyncSink]:
+    """Start one AsyncSink per async handler and track it globally."""
+    global _atexit_registered
+    drop_level = config.get("queue_drop_level", "WARNING")
+    if isinstance(drop_level, str):
+        drop_level = logging.getLevelName(drop_level)
+    started = []
+    for handler in handlers:
+        sink = AsyncSink(
+            handler,
+            maxsize=config.get("queue_size", 100_000),
+            workers=workers,
+            max_bytes=config.get("queue_max_bytes", 64 * 1024 * 1024),
+            overflow=config.get("queue_overflow", "drop_newest"),
+            block_timeout=config.get("queue_block_timeout_ms", 1000) / 1000.0,
+            drop_level=drop_level,
+            batch_size=batch_size,
+        )
+        sink.start()
+        started.append(sink)
+
+    with _sinks_lock:
+        _sinks.extend(started)
+        # Register atexit handler to flush remaining logs on exit
+        if started and not _atexit_registered:
+            atexit.register(_flush_and_stop_listener)
+            _atexit_registered = True
+    return started
+
+
+def _stop_sinks(sinks: List[AsyncSink]) -> None:
+    """Drain and stop the given sinks, and forget them."""
+    with _sinks_lock:
+        for sink in sinks:
+            if sink in _sinks:
+                _sinks.remove(sink)
+    for sink in sinks:
+        sink.stop()
 
 
 def _flush_and_stop_listener() -> None:
-    """Flush remaining logs and stop listener on program exit."""
-    global _queue_listener
-    with _listener_lock:
-        if _queue_listener:
-            # Stop the listener - this waits for the thread to finish
-            # processing remaining items and join
-            _queue_listener.stop()
-            _queue_listener = None
+    """Flush remaining logs, stop every async sink and empty the sink registry on program exit."""
+    shared = _registry.clear()
+    with _sinks_lock:
+        sinks = list(_sinks)
+    # stop() waits for each sink's workers to deliver what is queued, then joins
+    _stop_sinks(sinks)
+    for obj, close in shared:
+        if not isinstance(obj, AsyncSink):
+            try:
+                close(obj)
+            except Exception:
+                pass
+
+
+def _queue_settings(config: Dict[str, Any]) -> tuple:
+    """The config values an AsyncSink is built from, as part of its registry key."""
+    return (
+        config.get("queue_size", 100_000),
+        config.get("remote_workers", 1),
+        config.get("queue_max_bytes", 64 * 1024 * 1024),
+        config.get("queue_overflow", "drop_newest"),
+        config.get("queue_block_timeout_ms", 1000),
+        config.get("queue_drop_level", "WARNING"),
+    )
+
+
+def _close_handler(handler: logging.Handler) -> None:
+    handler.close()
+
+
+def _stop_sink(sink: AsyncSink) -> None:
+    _stop_sinks([sink])
 
 
 def _stop_queue_listener() -> None:
-    """Stop background listener gracefully."""
-    global _queue_listener
-    with _listener_lock:
-        if _queue_listener:
-            _queue_listener.stop()
-            _queue_listener = None
+    """Stop every async sink gracefully."""
+    _flush_and_stop_listener()
+
+
+def _reinit_after_fork() -> None:
+    """
+    Make the sinks usable in a forked child.
+
+    fork() copies the queues and locks but none of the worker threads, and a
+    lock another thread held at fork time stays locked forever in the child.
+    Every lock is replaced, each sink drops the records it had queued (the
+    parent still delivers them) and gets fresh workers, and handlers drop
+    sockets, HTTP connections and Kafka producers shared with the parent. A
+    config watcher gets its own inotify instance and thread.
+    """
+    global _sinks_lock
+    _sinks_lock = threading.Lock()
+    _reinit_cache_after_fork()
+    remote = sys.modules.get("logifyx.remote")  # only loaded once a remote sink exists
+    if remote is not None:
+        remote.reset_sessions_after_fork()
+    _registry._reinit_after_fork()
+    for sink in _sinks:
+        sink._reinit_after_fork()
+    watch = sys.modules.get("logifyx.watch")
+    if watch is not None:
+        watch._reinit_after_fork()
+    _metrics._reinit_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def queue_depths() -> Dict[str, int]:
+    """
+    Return the number of records waiting in each async sink's queue.
+
+    Keys identify the sink, e.g. "remote:http://log-server/logs" or
+    "kafka:localhost:9092/logs". Sinks with the same identity are summed.
+
+        from logifyx import queue_depths
+
+        queue_depths()   # {"remote:http://log-server/logs": 0, "kafka:localhost:9092/logs": 12}
+    """
+    with _sinks_lock:
+        sinks = list(_sinks)
+    depths: Dict[str, int] = {}
+    for sink in sinks:
+        depths[sink.name] = depths.get(sink.name, 0) + sink.depth()
+    return depths
+
+
+def dropped_counts() -> Dict[str, int]:
+    """
+    Return how many records each async sink has dropped because its queue was full.
+
+    Keys match queue_depths(). Counts are cumulative for the life of the sink.
+
+        from logifyx import dropped_counts
+
+        dropped_counts()   # {"remote:http://log-server/logs": 0, "kafka:localhost:9092/logs": 0}
+    """
+    with _sinks_lock:
+        sinks = list(_sinks)
+    dropped: Dict[str, int] = {}
+    for sink in sinks:
+        dropped[sink.name] = dropped.get(sink.name, 0) + sink.dropped
+    return dropped
+
+
+def breaker_stats() -> Dict[str, dict]:
+    """
+    Return the circuit breaker state of each async sink that has one (remote, Kafka).
+
+    Keys match queue_depths(). "transitions" counts state changes for the
+    life of the sink; "failed" counts failed sends and "rejected" records
+    dropped while the breaker was open or half-open, both for the life of
+    the sink. "failures" is the current run of consecutive failures.
+
+        from logifyx import breaker_stats
+
+        breaker_stats()
+        # {"remote:http://log-server/logs": {"state": "open", "failures": 0, "retry_in": 3.2,
+        #   "failed": 3, "rejected": 118, "transitions": {"closed->open": 1, "open->half_open": 0, ...}}}
+    """
+    with _sinks_lock:
+        sinks = list(_sinks)
+    stats: Dict[str, dict] = {}
+    for sink in sinks:
+        breaker = getattr(sink.handler, "breaker", None)
+        if breaker is not None:
+            stats[sink.name] = breaker.stats()
+    return stats
+
+
+def stats() -> Dict[str, dict]:
+    """
+    Return logifyx's own metrics: per sink, per logger and per level.
+
+    Latencies are in microseconds, summarised as count, mean, p50, p90, p99,
+    p99.9 and max from a log-linear histogram (within ~3% of the true value).
+    Counters and histograms are cumulative since the process started; every
+    thread records into its own shard without locking, and this call merges
+    them, so it is safe to poll from a metrics endpoint.
+
+    "sinks" has one entry per async sink (keys match queue_depths()):
+        queued, queued_bytes, dropped   — as queue_depths() and dropped_counts()
+        handled, errors                 — records the workers handed to the
+                                          handler, and handler calls that raised
+        emit                            — time per handler call (per batch for
+                                          async_local file/console writers)
+        lag                             — time from the log call to delivery
+        breaker                         — as breaker_stats(), for remote and Kafka
+    "loggers" maps each logger to a latency summary per level name: the time a
+    log call spent in its handlers in the calling thread (file and console
+    writes, or queueing for the async sinks). Loggers created with
+    metrics=False are not timed. "levels" is the same merged across loggers.
+
+        from logifyx import stats
+
+        stats()["sinks"]["remote:http://log-server/logs"]["lag"]
+        # {"count": 1200, "mean": 840.2, "p50": 610.0, "p90": 1530.0, "p99": 4100.0,
+        #  "p99.9": 9800.0, "max": 12040.1}
+        stats()["levels"]["ERROR"]["p99"]   # 31.5
+    """
+    with _sinks_lock:
+        live = list(_sinks)
+    merged = _metrics.snapshot()
+    counters = merged.counters
+    histograms = merged.histograms
+
+    sinks: Dict[str, dict] = {}
+    for sink in live:
+        entry = sinks.get(sink.name)
+        if entry is None:
+            entry = sinks[sink.name] = {"queued": 0, "queued_bytes": 0, "dropped": 0}
+        entry["queued"] += sink.depth()
+        entry["queued_bytes"] += sink.queued_bytes()
+        entry["dropped"] += sink.dropped
+        breaker = getattr(sink.handler, "breaker", None)
+        if breaker is not None:
+            entry["breaker"] = breaker.stats()
+    for name, entry in sinks.items():
+        entry["handled"] = counters.get(("handled", name), 0)
+        entry["errors"] = counters.get(("errors", name), 0)
+        for kind in ("emit", "lag"):
+            histogram = histograms.get((kind, name)) or _metrics.Histogram()
+            entry[kind] = histogram.summary()
+
+    loggers: Dict[str, dict] = {}
+    levels: Dict[str, _metrics.Histogram] = {}
+    timed = sorted(key for key in histograms if key[0] == "logger")
+    for key in timed:
+        histogram = histograms[key]
+        _, name, levelno = key
+        level = logging.getLevelName(levelno)
+        loggers.setdefault(name, {})[level] = histogram.summary()
+        levels.setdefault(level, _metrics.Histogram()).merge(histogram)
+
+    return {
+        "sinks": sinks,
+        "loggers": loggers,
+        "levels": {level: histogram.summary() for level, histogram in levels.items()},
+    }
 
 
 def flush(timeout: float = 5.0) -> bool:
     """
-    Block until the async log queue is empty, then return.
+    Block until every record already logged to an async sink has been delivered.
 
     Remote HTTP and Kafka handlers are async — log calls return instantly and
     the actual network send happens in a background thread. Call flush() before
     your process exits (or before a graceful shutdown) to ensure those buffered
     records are delivered.
 
-    Does not stop the background listener, so logging continues normally
-    after flush() returns. For a full teardown use shutdown() instead.
+    flush() waits on completion, not on the queue emptying: it returns once each
+    sink's workers have finished sending every record, partial remote batches
+    have been POSTed and Kafka records have been acked. It wakes as soon as that
+    happens rather than polling.
+
+    Does not stop the sink workers, so logging continues normally after flush()
+    returns. For a full teardown use shutdown() instead.
 
         from logifyx import flush
 
@@ -103,18 +325,53 @@ def flush(timeout: float = 5.0) -> bool:
         flush(timeout=2)  # wait up to 2 s
 
     Args:
-        timeout: Maximum seconds to wait for the queue to drain. Default: 5.0.
+        timeout: Maximum seconds to wait for delivery. Default: 5.0.
 
     Returns:
-        True  — queue emptied within the timeout.
-        False — timeout expired with records still pending.
+        True  — everything was delivered within the timeout.
+        False — timeout expired with records still pending. The pending count
+                of each affected sink is printed to stderr.
+    """
+    with _sinks_lock:
+        sinks = list(_sinks)
+    deadline = time.monotonic() + timeout
+    stuck = []
+    for sink in sinks:
+        if not sink.flush(max(0.0, deadline - time.monotonic())):
+            stuck.append(sink)
+    if not stuck:
+        return True
+
+    pending: Dict[str, int] = {}
+    for sink in stuck:
+        pending[sink.name] = pending.get(sink.name, 0) + sink.pending()
+    summary = ", ".join(f"{name}={count}" for name, count in pending.items())
+    print(
+        f"⚠️ Logifyx flush timed out after {timeout}s with records still pending: {summary}",
+        file=sys.stderr
+    )
+    return False
+
+
+async def flush_async(timeout: float = 5.0) -> bool:
     """
-    start = time.time()
-    while not _log_queue.empty():
-        if time.time() - start > timeout:
-            return False
-        time.sleep(0.01)
-    return True
+    Asyncio-friendly flush(): waits for delivery without blocking the event loop.
+
+        from logifyx import flush_async
+
+        async def on_shutdown():
+            await flush_async(timeout=2)
+
+    Args:
+        timeout: Maximum seconds to wait for delivery. Default: 5.0.
+
+    Returns:
+        Same as flush().
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, flush, timeout)
 
 
 def shutdown() -> None:
@@ -137,7 +394,13 @@ def shutdown() -> None:
         finally:
             shutdown()   # guarantee delivery before process teardown
     """
+    watch = sys.modules.get("logifyx.watch")
+    if watch is not None:
+        watch.stop_watching()
     _flush_and_stop_listener()
+    remote = sys.modules.get("logifyx.remote")
+    if remote is not None:
+        remote.close_sessions()
 
 
 class Logifyx(logging.Logger):
@@ -190,10 +453,28 @@ class Logifyx(logging.Logger):
         remote_url:           HTTP endpoint to POST log records to. Delivery is async
                               and non-blocking (queue-based). Default: None (disabled).
         remote_timeout:       Seconds before an HTTP send times out. Default: 5.
-        max_remote_retries:   Consecutive failures before the remote handler disables
-                              itself to avoid blocking. Default: 3.
+        max_remote_retries:   Consecutive failures before the remote handler's circuit
+                              breaker opens and records are dropped until a probe
+                              after breaker_backoff_ms succeeds. Default: 3.
         remote_headers:       Extra HTTP headers as a dict, e.g.
                               {"Authorization": "Bearer <token>"}. Default: None.
+        remote_batch_size:    Send remote records in batches of up to this many
+                              records. 0 or 1 sends one request per record. Default: 0.
+        remote_batch_bytes:   Send a batch early once its encoded body reaches this
+                              many bytes. Default: 1_000_000.
+        remote_batch_linger_ms: Send a partial batch after its oldest record has
+                              waited this many milliseconds. Default: 1000.
+        remote_batch_format:  Batch body format — "ndjson" (one JSON object per line)
+                              or "json" (a JSON array). Default: "ndjson".
+        remote_pool_size:     Max pooled keep-alive connections to remote_url. The
+                              pool is shared by every logger posting to the same
+                              URL; the first one decides its size. Default: 10.
+        remote_compression:   Content-Encoding for remote request bodies — "none",
+                              "gzip" or "zstd" (needs zstandard, else gzip).
+                              Compression runs on the sink worker. Default: "none".
+        remote_compression_level: Compression level (gzip 0-9, zstd 1-22). Default: 3.
+        remote_compression_min_bytes: Bodies smaller than this are sent uncompressed.
+                              Default: 1024.
         kafka_servers:        Kafka bootstrap server(s), e.g. "localhost:9092" or
                               "k1:9092,k2:9092". Default: None (disabled).
         kafka_topic:          Kafka topic to produce log records to. Default: "logs".
@@ -201,11 +482,70 @@ class Logifyx(logging.Logger):
                               Default: None (JSON over Kafka instead).
         schema_compatibility: Schema compatibility mode — BACKWARD, FORWARD, FULL,
                               or NONE. Default: "BACKWARD".
+        kafka_linger_ms:      How long the Kafka producer waits to fill a batch before
+                              sending it. Default: 5.
+        kafka_batch_size:     Max bytes per Kafka producer batch. Default: 65536.
+        kafka_batch_records:  Pack up to this many records into one Kafka message
+                              as an Avro Object Container File (read it back with
+                              logifyx.kafka.decode_message). 0 sends one record
+                              per message. Default: 0.
+        kafka_batch_codec:    Compression of batched messages — "deflate", "zstd"
+                              (needs the zstandard package) or "null". Default: "deflate".
+        kafka_schema_version: Avro schema of Kafka records — 1 (LOG_SCHEMA_V1) or 2
+                              (LOG_SCHEMA_V2: native timestamp, level enum, typed
+                              extra fields). Default: 1.
+        spool_dir:            Directory for the disk spool of the remote and Kafka
+                              handlers. While a destination is unreachable its
+                              messages are written here and replayed once it
+                              recovers, instead of being dropped. Default: None
+                              (no spool; records are dropped while the circuit
+                              breaker is open).
+        spool_max_bytes:      Size cap of each handler's spool; messages that do not
+                              fit are dropped. Default: 268_435_456 (256 MB).
+        spool_fsync:          When spooled messages are fsync'ed — "always",
+                              "interval" (at most once a second) or "never".
+                              Default: "interval".
+        spool_replay_rate:    Max spooled messages replayed per second after the
+                              destination recovers. Default: 200.
+        breaker_backoff_ms:   How long the remote/Kafka circuit breaker stays open
+                              after it trips before a probe send is allowed. Doubles
+                              after every failed probe (jittered). Default: 1000.
+        breaker_max_backoff_ms: Upper bound for the doubled backoff. Default: 60_000.
+        queue_size:           Max records buffered per async sink (remote, Kafka). Each
+                              sink has its own queue, so a slow sink only backs up its
+                              own records. Default: 100_000.
+        remote_workers:       Worker threads sending to remote_url in parallel.
+                              Default: 1.
+        queue_max_bytes:      Memory budget per async sink queue, in bytes (estimated
+                              from record size). Default: 67_108_864 (64 MB).
+        queue_overflow:       What to do when a sink queue is full — "block" (wait up to
+                              queue_block_timeout_ms), "drop_newest", "drop_oldest" or
+                              "drop_below" (shed records below queue_drop_level).
+                              Drops are counted; see dropped_counts().
+                              Default: "drop_newest".
+        queue_block_timeout_ms: Longest a log call waits for room under the "block"
+                              policy before the record is dropped. Default: 1000.
+        queue_drop_level:     Level threshold for the "drop_below" policy.
+                              Default: "WARNING".
+        async_local:          Route file and console output through background
+                              writers too, so a log call only enqueues the record.
+                              Writes are batched. Default: False.
+        collector_socket:     Unix socket path of a LogCollector. When set, file,
+                              remote and Kafka output is shipped to the collector
+                              process instead of being written by this one; only
+                              console output stays local. Default: None.
+        watch_config:         Reload this logger whenever its logifyx.yaml or .env
+                              changes on disk (inotify on Linux, polling elsewhere).
+                              Default: False.
+        metrics:              Time every log call into a per-logger, per-level
+                              latency histogram; see stats(). Sink metrics are
+                              recorded either way. Default: True.
         config_dir:           Directory to search for logifyx.yaml. Default: project root.
         env_file:             Path to a .env file to load. Default: ".env".
         yaml_file:            Explicit path to a YAML config file, overrides auto-discovery.
     """
-    
+
+    _timed = False  # set by configure() from the metrics setting
 
     def __init__(
         self,
@@ -228,7 +568,36 @@ class Logifyx(logging.Logger):
         schema_compatibility = _sentinel,
         remote_timeout = _sentinel,
         max_remote_retries = _sentinel,
-        remote_headers = _sentinel
+        remote_headers = _sentinel,
+        remote_batch_size = _sentinel,
+        remote_batch_bytes = _sentinel,
+        remote_batch_linger_ms = _sentinel,
+        remote_batch_format = _sentinel,
+        remote_pool_size = _sentinel,
+        remote_compression = _sentinel,
+        remote_compression_level = _sentinel,
+        remote_compression_min_bytes = _sentinel,
+        kafka_linger_ms = _sentinel,
+        kafka_batch_size = _sentinel,
+        kafka_batch_records = _sentinel,
+        kafka_batch_codec = _sentinel,
+        kafka_schema_version = _sentinel,
+        spool_dir = _sentinel,
+        spool_max_bytes = _sentinel,
+        spool_fsync = _sentinel,
+        spool_replay_rate = _sentinel,
+        breaker_backoff_ms = _sentinel,
+        breaker_max_backoff_ms = _sentinel,
+        queue_size = _sentinel,
+        remote_workers = _sentinel,
+        queue_max_bytes = _sentinel,
+        queue_overflow = _sentinel,
+        queue_block_timeout_ms = _sentinel,
+        queue_drop_level = _sentinel,
+        async_local = _sentinel,
+        collector_socket = _sentinel,
+        watch_config = _sentinel,
+        metrics = _sentinel
     ):
         # Normalize and validate level string
         level = _normalize_and_validate_level(level)
@@ -242,6 +611,7 @@ class Logifyx(logging.Logger):
             
         # Create reload lock
         self._reload_lock = threading.RLock()
+        self._reconfiguring = False
         
         # Store init params (only those explicitly provided)
         self._init_params = {
@@ -262,7 +632,36 @@ class Logifyx(logging.Logger):
             "schema_compatibility": schema_compatibility,
             "remote_timeout": remote_timeout,
             "max_remote_retries": max_remote_retries,
-            "remote_headers": remote_headers
+            "remote_headers": remote_headers,
+            "remote_batch_size": remote_batch_size,
+            "remote_batch_bytes": remote_batch_bytes,
+            "remote_batch_linger_ms": remote_batch_linger_ms,
+            "remote_batch_format": remote_batch_format,
+            "remote_pool_size": remote_pool_size,
+            "remote_compression": remote_compression,
+            "remote_compression_level": remote_compression_level,
+            "remote_compression_min_bytes": remote_compression_min_bytes,
+            "kafka_linger_ms": kafka_linger_ms,
+            "kafka_batch_size": kafka_batch_size,
+            "kafka_batch_records": kafka_batch_records,
+            "kafka_batch_codec": kafka_batch_codec,
+            "kafka_schema_version": kafka_schema_version,
+            "spool_dir": spool_dir,
+            "spool_max_bytes": spool_max_bytes,
+            "spool_fsync": spool_fsync,
+            "spool_replay_rate": spool_replay_rate,
+            "breaker_backoff_ms": breaker_backoff_ms,
+            "breaker_max_backoff_ms": breaker_max_backoff_ms,
+            "queue_size": queue_size,
+            "remote_workers": remote_workers,
+            "queue_max_bytes": queue_max_bytes,
+            "queue_overflow": queue_overflow,
+            "queue_block_timeout_ms": queue_block_timeout_ms,
+            "queue_drop_level": queue_drop_level,
+            "async_local": async_local,
+            "collector_socket": collector_socket,
+            "watch_config": watch_config,
+            "metrics": metrics
         }
         
         # If we were constructed by logging.getLogger() (which only passes `name`),
@@ -303,14 +702,43 @@ class Logifyx(logging.Logger):
         remote_timeout: Optional[int] = None,
         max_remote_retries: Optional[int] = None,
         remote_headers: Optional[Dict[str, str]] = None,
+        remote_batch_size: Optional[int] = None,
+        remote_batch_bytes: Optional[int] = None,
+        remote_batch_linger_ms: Optional[int] = None,
+        remote_batch_format: Optional[str] = None,
+        remote_pool_size: Optional[int] = None,
+        remote_compression: Optional[str] = None,
+        remote_compression_level: Optional[int] = None,
+        remote_compression_min_bytes: Optional[int] = None,
+        kafka_linger_ms: Optional[int] = None,
+        kafka_batch_size: Optional[int] = None,
+        kafka_batch_records: Optional[int] = None,
+        kafka_batch_codec: Optional[str] = None,
+        kafka_schema_version: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: Optional[int] = None,
+        spool_fsync: Optional[str] = None,
+        spool_replay_rate: Optional[int] = None,
+        breaker_backoff_ms: Optional[int] = None,
+        breaker_max_backoff_ms: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        remote_workers: Optional[int] = None,
+        queue_max_bytes: Optional[int] = None,
+        queue_overflow: Optional[str] = None,
+        queue_block_timeout_ms: Optional[int] = None,
+        queue_drop_level: Optional[Union[int, str]] = None,
+        async_local: Optional[bool] = None,
+        collector_socket: Optional[str] = None,
+        watch_config: Optional[bool] = None,
+        metrics: Optional[bool] = None,
         level: Optional[Union[int, str]] = None
     ) -> "Logifyx":
         """
         Apply configuration options and build handlers.
 
         You do not need to call this directly — __init__ calls it automatically.
-        It is only called again by reload() / reload_from_file() after those
-        methods clear the existing handlers.
+        Once the logger has handlers it is a no-op; reload() and
+        reload_from_file() use it to update the existing handlers in place.
 
         Config priority (highest wins):
             kwargs passed here  >  environment / .env  >  logifyx.yaml  >  built-in defaults
@@ -327,8 +755,8 @@ class Logifyx(logging.Logger):
         Returns:
             self — allows method chaining, e.g. Logifyx("x").configure(color=False).
         """
-        # Skip if already configured (handlers exist)
-        if self.handlers:
+        # Skip if already configured (handlers exist), unless reloading
+        if self.handlers and not self._reconfiguring:
             return self
 
         # --- strict type validation ---
@@ -343,6 +771,8 @@ class Logifyx(logging.Logger):
             ("file",                file),
             ("kafka_topic",         kafka_topic),
             ("schema_registry_url", schema_registry_url),
+            ("collector_socket",    collector_socket),
+            ("spool_dir",           spool_dir),
         ):
             if value is not None and not isinstance(value, str):
                 raise TypeError(
@@ -354,6 +784,9 @@ class Logifyx(logging.Logger):
             ("color",     color),
             ("mask",      mask),
             ("json_mode", json_mode),
+            ("async_local", async_local),
+            ("watch_config", watch_config),
+            ("metrics", metrics),
         ):
             if value is not None and not isinstance(value, bool):
                 raise TypeError(
@@ -366,6 +799,24 @@ class Logifyx(logging.Logger):
             ("backup_count",      backup_count,      0),
             ("remote_timeout",    remote_timeout,    1),
             ("max_remote_retries", max_remote_retries, 0),
+            ("remote_batch_size",      remote_batch_size,      0),
+            ("remote_batch_bytes",     remote_batch_bytes,     1),
+            ("remote_batch_linger_ms", remote_batch_linger_ms, 1),
+            ("remote_pool_size",       remote_pool_size,       1),
+            ("remote_compression_level", remote_compression_level, 0),
+            ("remote_compression_min_bytes", remote_compression_min_bytes, 0),
+            ("kafka_linger_ms",        kafka_linger_ms,        0),
+            ("kafka_batch_size",       kafka_batch_size,       1),
+            ("kafka_batch_records",    kafka_batch_records,    0),
+            ("kafka_schema_version",   kafka_schema_version,   1),
+            ("spool_max_bytes",        spool_max_bytes,        1),
+            ("spool_replay_rate",      spool_replay_rate,      1),
+            ("breaker_backoff_ms",     breaker_backoff_ms,     1),
+            ("breaker_max_backoff_ms", breaker_max_backoff_ms, 1),
+            ("queue_size",             queue_size,             1),
+            ("remote_workers",         remote_workers,         1),
+            ("queue_max_bytes",        queue_max_bytes,        1),
+            ("queue_block_timeout_ms", queue_block_timeout_ms, 0),
         ):
             if value is not None:
                 if isinstance(value, bool) or not isinstance(value, int):
@@ -402,6 +853,77 @@ class Logifyx(logging.Logger):
                     f"or value {v!r} ({type(v).__name__}) is not a str"
                 )
 
+        # remote_batch_format — "ndjson" or "json"
+        if remote_batch_format is not None:
+            if not isinstance(remote_batch_format, str):
+                raise TypeError(
+                    f"remote_batch_format must be a str, got {remote_batch_format!r} ({type(remote_batch_format).__name__})"
+                )
+            if remote_batch_format.lower() not in ("ndjson", "json"):
+                raise ValueError(
+                    f"remote_batch_format must be one of ['json', 'ndjson'], got {remote_batch_format!r}"
+                )
+            remote_batch_format = remote_batch_format.lower()
+
+        # remote_compression — "none", "gzip" or "zstd"
+        if remote_compression is not None:
+            if not isinstance(remote_compression, str):
+                raise TypeError(
+                    f"remote_compression must be a str, got {remote_compression!r} ({type(remote_compression).__name__})"
+                )
+            if remote_compression.lower() not in ("none", "gzip", "zstd"):
+                raise ValueError(
+                    f"remote_compression must be one of ['gzip', 'none', 'zstd'], got {remote_compression!r}"
+                )
+            remote_compression = remote_compression.lower()
+
+        if kafka_schema_version is not None and kafka_schema_version > 2:
+            raise ValueError(f"kafka_schema_version must be 1 or 2, got {kafka_schema_version!r}")
+
+        # kafka_batch_codec — "null", "deflate" or "zstd"
+        if kafka_batch_codec is not None:
+            if not isinstance(kafka_batch_codec, str):
+                raise TypeError(
+                    f"kafka_batch_codec must be a str, got {kafka_batch_codec!r} ({type(kafka_batch_codec).__name__})"
+                )
+            if kafka_batch_codec.lower() not in ("null", "deflate", "zstd"):
+                raise ValueError(
+                    f"kafka_batch_codec must be one of ['deflate', 'null', 'zstd'], got {kafka_batch_codec!r}"
+                )
+            kafka_batch_codec = kafka_batch_codec.lower()
+
+        # spool_fsync — "always", "interval" or "never"
+        if spool_fsync is not None:
+            if not isinstance(spool_fsync, str):
+                raise TypeError(
+                    f"spool_fsync must be a str, got {spool_fsync!r} ({type(spool_fsync).__name__})"
+                )
+            if spool_fsync.lower() not in ("always", "interval", "never"):
+                raise ValueError(
+                    f"spool_fsync must be one of ['always', 'interval', 'never'], got {spool_fsync!r}"
+                )
+            spool_fsync = spool_fsync.lower()
+
+        # queue_overflow — fixed set of policies
+        if queue_overflow is not None:
+            if not isinstance(queue_overflow, str):
+                raise TypeError(
+                    f"queue_overflow must be a str, got {queue_overflow!r} ({type(queue_overflow).__name__})"
+                )
+            if queue_overflow.lower() not in OVERFLOW_POLICIES:
+                raise ValueError(
+                    f"queue_overflow must be one of {list(OVERFLOW_POLICIES)}, got {queue_overflow!r}"
+                )
+            queue_overflow = queue_overflow.lower()
+
+        # queue_drop_level — same rules as level
+        if queue_drop_level is not None:
+            if isinstance(queue_drop_level, bool) or not isinstance(queue_drop_level, (int, str)):
+                raise TypeError(
+                    f"queue_drop_level must be a log-level str or int, got {queue_drop_level!r} ({type(queue_drop_level).__name__})"
+                )
+            queue_drop_level = _normalize_and_validate_level(queue_drop_level)
+
         # schema_compatibility — fixed set of valid values
         _VALID_COMPATIBILITY = {
             "BACKWARD", "BACKWARD_TRANSITIVE",
@@ -455,7 +977,36 @@ class Logifyx(logging.Logger):
             "schema_compatibility": schema_compatibility,
             "remote_timeout": remote_timeout,
             "max_remote_retries": max_remote_retries,
-            "remote_headers": remote_headers
+            "remote_headers": remote_headers,
+            "remote_batch_size": remote_batch_size,
+            "remote_batch_bytes": remote_batch_bytes,
+            "remote_batch_linger_ms": remote_batch_linger_ms,
+            "remote_batch_format": remote_batch_format,
+            "remote_pool_size": remote_pool_size,
+            "remote_compression": remote_compression,
+            "remote_compression_level": remote_compression_level,
+            "remote_compression_min_bytes": remote_compression_min_bytes,
+            "kafka_linger_ms": kafka_linger_ms,
+            "kafka_batch_size": kafka_batch_size,
+            "kafka_batch_records": kafka_batch_records,
+            "kafka_batch_codec": kafka_batch_codec,
+            "kafka_schema_version": kafka_schema_version,
+            "spool_dir": spool_dir,
+            "spool_max_bytes": spool_max_bytes,
+            "spool_fsync": spool_fsync,
+            "spool_replay_rate": spool_replay_rate,
+            "breaker_backoff_ms": breaker_backoff_ms,
+            "breaker_max_backoff_ms": breaker_max_backoff_ms,
+            "queue_size": queue_size,
+            "remote_workers": remote_workers,
+            "queue_max_bytes": queue_max_bytes,
+            "queue_overflow": queue_overflow,
+            "queue_block_timeout_ms": queue_block_timeout_ms,
+            "queue_drop_level": queue_drop_level,
+            "async_local": async_local,
+            "collector_socket": collector_socket,
+            "watch_config": watch_config,
+            "metrics": metrics
         }
 
         # Apply overrides
@@ -476,53 +1027,188 @@ class Logifyx(logging.Logger):
         self.setLevel(final_level)
         
         self.propagate = False
+        self._timed = self.config.get("metrics", True)
 
         self._build()
-        
+
+        if self.config.get("watch_config"):
+            from .watch import watch  # only loaded when a logger asks for it
+            watch(self)
+        elif "logifyx.watch" in sys.modules:
+            sys.modules["logifyx.watch"].unwatch(self)
+
         return self
 
+    def callHandlers(self, record: logging.LogRecord) -> None:
+        """
+        Pass record to this logger's handlers. With metrics on, the time the
+        handlers take in the calling thread is recorded per logger and level.
+        """
+        if not self._timed:
+            logging.Logger.callHandlers(self, record)
+            return
+        start = time.perf_counter_ns()
+        logging.Logger.callHandlers(self, record)
+        _metrics.observe(("logger", self.name, record.levelno), time.perf_counter_ns() - start)
+
     def _build(self) -> None:
-        """Build and attach handlers with queue-based async architecture."""
-        sync_handlers = []  # Console, file
-        async_handlers = []  # Remote, Kafka (go through queue)
-
-        for handler in get_handlers(self.config):
-            # Determine formatter based on handler type
-            if isinstance(handler, logging.StreamHandler) and not isinstance(
-                handler, logging.FileHandler
-            ):
-                formatter = get_formatter(
-                    self.config.get("json_mode"),
-                    self.config.get("color"),
+        """
+        Build and attach handlers with queue-based async architecture.
+
+        Handlers come from the process-wide sink registry: loggers whose
+        destination (file path, URL, Kafka cluster/topic) and settings match
+        share one handler or sink instead of opening their own. Shared
+        handlers stay at NOTSET, so loggers at different levels share them
+        too: each logger's own level decides what it passes on.
+
+        On reload the new handler set is diffed against the current one:
+        handlers and sinks whose settings are unchanged are kept as they are
+        (a level change alone rebuilds nothing), and only the rest are rebuilt. The
+        new handler list replaces the old one in a single assignment, so log
+        calls made meanwhile reach either the old or the new handlers.
+        """
+        async_local = self.config.get("async_local", False)
+        old_keys = dict(zip(getattr(self, "_keys", []), getattr(self, "_shared", [])))
+        old_queue_handler = getattr(self, "_queue_handler", None)
+
+        mask_filter = None
+        if self.config.get("mask"):
+            mask_filter = getattr(self, "_mask_filter", None) or MaskFilter()
+        self._mask_filter = mask_filter
+
+        direct = []  # Console, file — attached to the logger
+        sinks = []   # Remote, Kafka, collector (and console/file with async_local) — behind queues
+        keys = []
+        shared = []
+        kept = set()
+
+        for spec in self._handler_specs():
+            queued = spec.kind in ("remote", "kafka", "collector") or async_local
+            color = self.config.get("color") if spec.kind == "console" else False
+            key = (
+                spec.kind, spec.identity, spec.settings,
+                self.config.get("json_mode"), color, mask_filter is not None,
+                _queue_settings(self.config) if queued else None,
+            )
+            obj = old_keys.get(key)
+            if obj is not None:
+                kept.add(id(obj))
+            elif queued:
+                obj = _registry.acquire(
+                    key, lambda: self._new_sink(spec, color, mask_filter), _stop_sink
                 )
-                sync_handlers.append(handler)
-            elif handler.__class__.__name__ in ("RemoteHandler", "KafkaHandler"):
-                formatter = get_formatter(self.config.get("json_mode"), False)
-                async_handlers.append(handler)
             else:
-                formatter = get_formatter(self.config.get("json_mode"), False)
-                sync_handlers.append(handler)
-
-            handler.setLevel(self.level)
-            handler.setFormatter(formatter)
+                obj = _registry.acquire(
+                    key, lambda: self._new_handler(spec, color, mask_filter), _close_handler
+                )
+            (sinks if queued else direct).append(obj)
+            keys.append(key)
+            shared.append(obj)
+
+        queue_handler = None
+        if sinks:
+            if (
+                old_queue_handler is not None
+                and old_queue_handler.sinks == sinks
+                and bool(old_queue_handler.filters) == (mask_filter is not None)
+            ):
+                queue_handler = old_queue_handler
+            else:
+                queue_handler = SinkQueueHandler(sinks)
+                if mask_filter is not None:
+                    queue_handler.addFilter(mask_filter)
+            queue_handler.setLevel(self.level)
 
-            if self.config.get("mask"):
-                handler.addFilter(MaskFilter())
+        # Handlers added by the application stay attached
+        managed = {id(obj) for obj in old_keys.values()}
+        if old_queue_handler is not None:
+            managed.add(id(old_queue_handler))
+        foreign = [h for h in self.handlers if id(h) not in managed]
+        self.handlers = direct + ([queue_handler] if queue_handler is not None else []) + foreign
+
+        self._keys = keys
+        self._shared = shared
+        self._sinks = sinks
+        self._queue_handler = queue_handler
+
+        # Released only after the swap, so untouched output never has a gap.
+        # A sink this logger was the last user of delivers its queue first,
+        # and hands records still arriving through the old handler list to
+        # the sink that replaces it.
+        successors = {key[:2]: obj for key, obj in zip(keys, shared) if isinstance(obj, AsyncSink)}
+        for old_key, obj in old_keys.items():
+            if id(obj) in kept:
+                continue
+            successor = successors.get(old_key[:2])
+            if successor is not None and successor is not obj and _registry.refcount(obj) == 1:
+                obj.hand_off(successor)
+            _registry.release(obj)
+
+    def _handler_specs(self) -> list:
+        """The handlers this logger's config asks for."""
+        return get_handler_specs(self.config)
+
+    def _new_handler(self, spec, color, mask_filter) -> logging.Handler:
+        """Create and configure the handler for spec."""
+        handler = spec.factory()
+        formatter = get_formatter(self.config.get("json_mode"), color)
+        if spec.kind in ("remote", "kafka"):
+            formatter.include_exception = False  # sent in the payload's own field
+        handler.setFormatter(formatter)
+
+        # One shared filter: the first handler masks the record and tags it,
+        # every later handler sees the tag and skips the regex work.
+        if mask_filter is not None:
+            handler.addFilter(mask_filter)
+        return handler
+
+    def _new_sink(self, spec, color, mask_filter) -> AsyncSink:
+        """Create the handler for spec and start it behind its own AsyncSink."""
+        handler = self._new_handler(spec, color, mask_filter)
+        batch_size = 1 if spec.kind in ("remote", "kafka") else _LOCAL_BATCH_SIZE
+        workers = self.config.get("remote_workers", 1) if spec.kind == "remote" else 1
+        return _start_sinks([handler], self.config, batch_size=batch_size, workers=workers)[0]
+
+    def _release_handlers(self) -> None:
+        """Detach every handler and release this logger's hold on shared sinks."""
+        shared = getattr(self, "_shared", [])
+        self._shared = []
+        self._keys = []
+        self._sinks = []
+        self._queue_handler = None
+        for handler in self.handlers[:]:
+            self.removeHandler(handler)
+            if not any(handler is obj for obj in shared):
+                handler.close()
+        # The last logger to release a sink drains and closes it; others are untouched
+        for obj in shared:
+            _registry.release(obj)
 
-        # Add sync handlers directly
-        for handler in sync_handlers:
-            self.addHandler(handler)
+    def close(self) -> None:
+        """
+        Detach all handlers and release this logger's shared sinks.
 
-        # Add async handlers via QueueHandler
-        if async_handlers:
-            queue_handler = QueueHandler(_log_queue)
-            queue_handler.setLevel(self.level)
-            self.addHandler(queue_handler)
-            _start_queue_listener(async_handlers)
+        Sinks shared with other loggers keep running; a sink this logger was the
+        last user of is drained and closed. The logger itself stays registered
+        with logging — call reload() to give it handlers again.
+        """
+        with self._reload_lock:
+            self._release_handlers()
+        watch = sys.modules.get("logifyx.watch")
+        if watch is not None:
+            watch.unwatch(self)
+
+    def _reconfigure(self, **kwargs) -> None:
+        """Run configure() on a logger that already has handlers, diffing them."""
+        self._reconfiguring = True
+        try:
+            self.configure(**kwargs)
+        finally:
+            self._reconfiguring = False
 
     def reload(self) -> None:
         """
-        Tear down all handlers and reconfigure using the kwargs from __init__.
+        Reconfigure using the kwargs from __init__, rebuilding only what changed.
 
         Use this to pick up updated environment variables or a changed logifyx.yaml
         without restarting the process. The kwargs you originally passed at creation
@@ -530,24 +1216,25 @@ class Logifyx(logging.Logger):
 
             log = Logifyx("auth", log_dir="logs")
             # edit logifyx.yaml or change an env var at runtime ...
-            log.reload()   # drops old handlers, rebuilds with original kwargs + new config
+            log.reload()   # re-reads config, rebuilds only the sinks whose settings changed
+
+        Handlers and sinks whose settings did not change keep running without a
+        gap, a level change is applied in place, and only changed sinks are
+        replaced (an old sink delivers what it has queued before it closes). If
+        the new config is invalid, the error is raised and the current handlers
+        stay in place.
+
+        The config is read through the config cache, which notices edited files
+        and changed LOG_* variables. Call clear_config_cache() first to force a
+        fresh read.
         """
         with self._reload_lock:
-            # Stop queue listener
-            _stop_queue_listener()
-            
-            # Remove existing handlers safely
-            for handler in self.handlers[:]:
-                self.removeHandler(handler)
-                handler.close()
-
-            # Rebuild with provided params (handlers cleared, so configure() will run)
             provided = {k: v for k, v in self._init_params.items() if v is not _sentinel}
-            self.configure(**provided)
+            self._reconfigure(**provided)
 
     def reload_from_file(self) -> None:
         """
-        Tear down all handlers and reconfigure from logifyx.yaml only.
+        Reconfigure from logifyx.yaml only, rebuilding only what changed (see reload()).
 
         Unlike reload(), this does NOT re-apply kwargs passed at creation —
         the fresh config comes entirely from logifyx.yaml and environment variables.
@@ -559,18 +1246,10 @@ class Logifyx(logging.Logger):
             log.reload_from_file()                        # picks up YAML, drops kwarg
         """
         with self._reload_lock:
-            # Stop queue listener
-            _stop_queue_listener()
-            
-            # Remove existing handlers
-            for handler in self.handlers[:]:
-                self.removeHandler(handler)
-                handler.close()
-            
             # Reload config and rebuild
             self.config = load_config()
             provided = {k: v for k, v in self._init_params.items() if v is not _sentinel}
-            self.configure(**provided)
+            self._reconfigure(**provided)
 
 
 class ContextLoggerAdapter(logging.LoggerAdapter):
@@ -631,7 +1310,36 @@ def get_logify_logger(
         schema_compatibility = _sentinel,
         remote_timeout = _sentinel,
         max_remote_retries = _sentinel,
-        remote_headers = _sentinel) -> Logifyx:
+        remote_headers = _sentinel,
+        remote_batch_size = _sentinel,
+        remote_batch_bytes = _sentinel,
+        remote_batch_linger_ms = _sentinel,
+        remote_batch_format = _sentinel,
+        remote_pool_size = _sentinel,
+        remote_compression = _sentinel,
+        remote_compression_level = _sentinel,
+        remote_compression_min_bytes = _sentinel,
+        kafka_linger_ms = _sentinel,
+        kafka_batch_size = _sentinel,
+        kafka_batch_records = _sentinel,
+        kafka_batch_codec = _sentinel,
+        kafka_schema_version = _sentinel,
+        spool_dir = _sentinel,
+        spool_max_bytes = _sentinel,
+        spool_fsync = _sentinel,
+        spool_replay_rate = _sentinel,
+        breaker_backoff_ms = _sentinel,
+        breaker_max_backoff_ms = _sentinel,
+        queue_size = _sentinel,
+        remote_workers = _sentinel,
+        queue_max_bytes = _sentinel,
+        queue_overflow = _sentinel,
+        queue_block_timeout_ms = _sentinel,
+        queue_drop_level = _sentinel,
+        async_local = _sentinel,
+        collector_socket = _sentinel,
+        watch_config = _sentinel,
+        metrics = _sentinel) -> Logifyx:
     """
     Get or create a Logifyx logger, with a guaranteed singleton per name.
 
@@ -668,12 +1376,42 @@ def get_logify_logger(
         mask:                 Redact passwords, tokens, and secrets. Default: True.
         remote_url:           HTTP endpoint to POST log records to (async). Default: None.
         remote_timeout:       HTTP send timeout in seconds. Default: 5.
-        max_remote_retries:   Failures before the remote handler self-disables. Default: 3.
+        max_remote_retries:   Failures before the remote circuit breaker opens. Default: 3.
         remote_headers:       Extra HTTP headers, e.g. {"Authorization": "Bearer <tok>"}.
+        remote_batch_size:    Records per batched HTTP request. 0 disables batching. Default: 0.
+        remote_batch_bytes:   Max encoded bytes per batch. Default: 1_000_000.
+        remote_batch_linger_ms: Max wait before a partial batch is sent. Default: 1000.
+        remote_batch_format:  "ndjson" or "json" (array). Default: "ndjson".
+        remote_pool_size:     Keep-alive connections pooled per remote URL. Default: 10.
+        remote_compression:   "none", "gzip" or "zstd" request bodies. Default: "none".
+        remote_compression_level: gzip 0-9 / zstd 1-22. Default: 3.
+        remote_compression_min_bytes: Smallest body that is compressed. Default: 1024.
         kafka_servers:        Kafka bootstrap server(s), e.g. "localhost:9092".
         kafka_topic:          Kafka topic to produce to. Default: "logs".
         schema_registry_url:  Confluent Schema Registry URL for Avro. Default: None.
         schema_compatibility: Schema compatibility mode. Default: "BACKWARD".
+        kafka_linger_ms:      Kafka producer linger in milliseconds. Default: 5.
+        kafka_batch_size:     Kafka producer batch size in bytes. Default: 65536.
+        kafka_batch_records:  Records per Kafka message in Avro OCF batch mode; 0 = off. Default: 0.
+        kafka_batch_codec:    Codec for batched Kafka messages ("deflate", "zstd", "null"). Default: "deflate".
+        kafka_schema_version: Avro schema version of Kafka records (1 or 2). Default: 1.
+        spool_dir:            Disk spool for remote/Kafka outages. Default: None (off).
+        spool_max_bytes:      Size cap of each handler's spool. Default: 268_435_456.
+        spool_fsync:          Spool fsync policy — always, interval or never. Default: "interval".
+        spool_replay_rate:    Spooled messages replayed per second. Default: 200.
+        breaker_backoff_ms:   Circuit breaker open time after a trip. Default: 1000.
+        breaker_max_backoff_ms: Max circuit breaker open time. Default: 60_000.
+        queue_size:           Max records buffered per async sink. Default: 100_000.
+        remote_workers:       Worker threads for the remote HTTP sink. Default: 1.
+        queue_max_bytes:      Memory budget per async sink queue in bytes. Default: 64 MB.
+        queue_overflow:       "block", "drop_newest", "drop_oldest" or "drop_below".
+                              Default: "drop_newest".
+        queue_block_timeout_ms: Max wait for room under "block". Default: 1000.
+        queue_drop_level:     Threshold for "drop_below". Default: "WARNING".
+        async_local:          Write file and console output from a background thread. Default: False.
+        collector_socket:     Ship records to a LogCollector on this Unix socket. Default: None.
+        watch_config:         Reload when logifyx.yaml or .env changes on disk. Default: False.
+        metrics:              Record per-logger, per-level call latency for stats(). Default: True.
         config_dir:           Directory containing logifyx.yaml. Default: project root.
         env_file:             Path to a .env file to load. Default: ".env".
         yaml_file:            Explicit path to a YAML config file.
@@ -702,7 +1440,36 @@ def get_logify_logger(
         "schema_compatibility": schema_compatibility,
         "remote_timeout": remote_timeout,
         "max_remote_retries": max_remote_retries,
-        "remote_headers": remote_headers
+        "remote_headers": remote_headers,
+        "remote_batch_size": remote_batch_size,
+        "remote_batch_bytes": remote_batch_bytes,
+        "remote_batch_linger_ms": remote_batch_linger_ms,
+        "remote_batch_format": remote_batch_format,
+        "remote_pool_size": remote_pool_size,
+        "remote_compression": remote_compression,
+        "remote_compression_level": remote_compression_level,
+        "remote_compression_min_bytes": remote_compression_min_bytes,
+        "kafka_linger_ms": kafka_linger_ms,
+        "kafka_batch_size": kafka_batch_size,
+        "kafka_batch_records": kafka_batch_records,
+        "kafka_batch_codec": kafka_batch_codec,
+        "kafka_schema_version": kafka_schema_version,
+        "spool_dir": spool_dir,
+        "spool_max_bytes": spool_max_bytes,
+        "spool_fsync": spool_fsync,
+        "spool_replay_rate": spool_replay_rate,
+        "breaker_backoff_ms": breaker_backoff_ms,
+        "breaker_max_backoff_ms": breaker_max_backoff_ms,
+        "queue_size": queue_size,
+        "remote_workers": remote_workers,
+        "queue_max_bytes": queue_max_bytes,
+        "queue_overflow": queue_overflow,
+        "queue_block_timeout_ms": queue_block_timeout_ms,
+        "queue_drop_level": queue_drop_level,
+        "async_local": async_local,
+        "collector_socket": collector_socket,
+        "watch_config": watch_config,
+        "metrics": metrics
     }
 
     # Filter out sentinel values before registering
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 import logging
 
 class Logifyx(logging.Logger):
@@ -26,7 +26,36 @@ class Logifyx(logging.Logger):
         schema_compatibility: Optional[str] = None,
         remote_timeout: Optional[int] = None,
         max_remote_retries: Optional[int] = None,
-        remote_headers: Optional[Dict[str, str]] = None
+        remote_headers: Optional[Dict[str, str]] = None,
+        remote_batch_size: Optional[int] = None,
+        remote_batch_bytes: Optional[int] = None,
+        remote_batch_linger_ms: Optional[int] = None,
+        remote_batch_format: Optional[str] = None,
+        remote_pool_size: Optional[int] = None,
+        remote_compression: Optional[str] = None,
+        remote_compression_level: Optional[int] = None,
+        remote_compression_min_bytes: Optional[int] = None,
+        kafka_linger_ms: Optional[int] = None,
+        kafka_batch_size: Optional[int] = None,
+        kafka_batch_records: Optional[int] = None,
+        kafka_batch_codec: Optional[str] = None,
+        kafka_schema_version: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: Optional[int] = None,
+        spool_fsync: Optional[str] = None,
+        spool_replay_rate: Optional[int] = None,
+        breaker_backoff_ms: Optional[int] = None,
+        breaker_max_backoff_ms: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        remote_workers: Optional[int] = None,
+        queue_max_bytes: Optional[int] = None,
+        queue_overflow: Optional[str] = None,
+        queue_block_timeout_ms: Optional[int] = None,
+        queue_drop_level: Optional[Union[int, str]] = None,
+        async_local: Optional[bool] = None,
+        collector_socket: Optional[str] = None,
+        watch_config: Optional[bool] = None,
+        metrics: Optional[bool] = None
     ) -> None: ...
 
     def configure(
@@ -50,9 +79,39 @@ class Logifyx(logging.Logger):
         remote_timeout: Optional[int] = None,
         max_remote_retries: Optional[int] = None,
         remote_headers: Optional[Dict[str, str]] = None,
+        remote_batch_size: Optional[int] = None,
+        remote_batch_bytes: Optional[int] = None,
+        remote_batch_linger_ms: Optional[int] = None,
+        remote_batch_format: Optional[str] = None,
+        remote_pool_size: Optional[int] = None,
+        remote_compression: Optional[str] = None,
+        remote_compression_level: Optional[int] = None,
+        remote_compression_min_bytes: Optional[int] = None,
+        kafka_linger_ms: Optional[int] = None,
+        kafka_batch_size: Optional[int] = None,
+        kafka_batch_records: Optional[int] = None,
+        kafka_batch_codec: Optional[str] = None,
+        kafka_schema_version: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: Optional[int] = None,
+        spool_fsync: Optional[str] = None,
+        spool_replay_rate: Optional[int] = None,
+        breaker_backoff_ms: Optional[int] = None,
+        breaker_max_backoff_ms: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        remote_workers: Optional[int] = None,
+        queue_max_bytes: Optional[int] = None,
+        queue_overflow: Optional[str] = None,
+        queue_block_timeout_ms: Optional[int] = None,
+        queue_drop_level: Optional[Union[int, str]] = None,
+        async_local: Optional[bool] = None,
+        collector_socket: Optional[str] = None,
+        watch_config: Optional[bool] = None,
+        metrics: Optional[bool] = None,
         level: Optional[int] = None
     ) -> "Logifyx": ...
 
+    def close(self) -> None: ...
     def reload(self) -> None: ...
     def reload_from_file(self) -> None: ...
 
@@ -82,7 +141,42 @@ def get_logify_logger(
         schema_compatibility: Optional[str] = None,
         remote_timeout: Optional[int] = None,
         max_remote_retries: Optional[int] = None,
-        remote_headers: Optional[Dict[str, str]] = None) -> Logifyx: ...
+        remote_headers: Optional[Dict[str, str]] = None,
+        remote_batch_size: Optional[int] = None,
+        remote_batch_bytes: Optional[int] = None,
+        remote_batch_linger_ms: Optional[int] = None,
+        remote_batch_format: Optional[str] = None,
+        remote_pool_size: Optional[int] = None,
+        remote_compression: Optional[str] = None,
+        remote_compression_level: Optional[int] = None,
+        remote_compression_min_bytes: Optional[int] = None,
+        kafka_linger_ms: Optional[int] = None,
+        kafka_batch_size: Optional[int] = None,
+        kafka_batch_records: Optional[int] = None,
+        kafka_batch_codec: Optional[str] = None,
+        kafka_schema_version: Optional[int] = None,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: Optional[int] = None,
+        spool_fsync: Optional[str] = None,
+        spool_replay_rate: Optional[int] = None,
+        breaker_backoff_ms: Optional[int] = None,
+        breaker_max_backoff_ms: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        remote_workers: Optional[int] = None,
+        queue_max_bytes: Optional[int] = None,
+        queue_overflow: Optional[str] = None,
+        queue_block_timeout_ms: Optional[int] = None,
+        queue_drop_level: Optional[Union[int, str]] = None,
+        async_local: Optional[bool] = None,
+        collector_socket: Optional[str] = None,
+        watch_config: Optional[bool] = None,
+        metrics: Optional[bool] = None) -> Logifyx: ...
 def setup_logify() -> None: ...
 def flush(timeout: float = 5.0) -> bool: ...
+async def flush_async(timeout: float = 5.0) -> bool: ...
+def clear_config_cache() -> None: ...
 def shutdown() -> None: ...
+def queue_depths() -> Dict[str, int]: ...
+def dropped_counts() -> Dict[str, int]: ...
+def breaker_stats() -> Dict[str, dict]: ...
+def stats() -> Dict[str, dict]: ...
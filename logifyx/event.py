@@ -0,0 +1,91 @@
+"""
+Render-once log events.
+
+A LogRecord is turned into a LogEvent the first time any Logifyx component
+needs its text: the %-args are merged into the message and the exception
+traceback is formatted, once. The event is cached on the record, so the
+console, file, remote and Kafka encoders all read the same strings instead
+of each calling getMessage() / formatException() again.
+
+    event = get_event(record)
+    event.message     # rendered message (already masked when masking is on)
+    event.exc_text    # formatted traceback, or None
+"""
+
+import logging
+from typing import NamedTuple, Optional
+
+
+EVENT_ATTR = "_logifyx_event"
+_MASKED_ATTR = "_logifyx_masked"  # set by MaskFilter
+
+_exception_formatter = logging.Formatter()
+
+
+class LogEvent(NamedTuple):
+    """
+    Immutable, fully rendered view of one log record.
+
+    Only the (possibly masked) message is kept — the unmasked text never
+    reaches the event, so no sink can leak it.
+    """
+
+    name: str
+    levelno: int
+    levelname: str
+    message: str
+    masked: bool
+    created: float
+    msecs: float
+    pathname: str
+    filename: str
+    lineno: int
+    func: Optional[str]
+    exc_text: Optional[str]
+    stack_info: Optional[str]
+
+
+def _render_exception(record: logging.LogRecord) -> Optional[str]:
+    if record.exc_text:
+        return record.exc_text
+    if record.exc_info:
+        # Cache on the record too, like logging.Formatter.format() does
+        record.exc_text = _exception_formatter.formatException(record.exc_info)
+        return record.exc_text
+    return None
+
+
+def get_event(record: logging.LogRecord) -> LogEvent:
+    """
+    Return the LogEvent for record, building and caching it on first use.
+
+    The cache is tied to the record's current msg and args objects: if a
+    filter rewrites the message afterwards (MaskFilter does), the next call
+    renders a fresh event.
+    """
+    cached = record.__dict__.get(EVENT_ATTR)
+    if cached is not None and cached[0] is record.msg and cached[1] is record.args:
+        return cached[2]
+
+    event = LogEvent(
+        name=record.name,
+        levelno=record.levelno,
+        levelname=record.levelname,
+        message=record.getMessage(),
+        masked=bool(record.__dict__.get(_MASKED_ATTR)),
+        created=record.created,
+        msecs=record.msecs,
+        pathname=record.pathname,
+        filename=record.filename,
+        lineno=record.lineno,
+        func=record.funcName,
+        exc_text=_render_exception(record),
+        stack_info=record.stack_info,
+    )
+    attach_event(record, event)
+    return event
+
+
+def attach_event(record: logging.LogRecord, event: LogEvent) -> None:
+    """Cache event on record, keyed on the record's current msg and args."""
+    record.__dict__[EVENT_ATTR] = (record.msg, record.args, event)
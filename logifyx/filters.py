@@ -3,6 +3,20 @@ import re
 
 
 class MaskFilter(logging.Filter):
+    """
+    Redact sensitive key=value pairs and api_key-like tokens from the message.
+
+    The key=value patterns are compiled into a single alternation so a record
+    is scanned once for all of them; the bare api_key word pattern runs as a
+    second pass afterwards, as it did when every pattern had its own pass. (In
+    one alternation it would match the "stripe_api_key" of
+    "stripe_api_key=sk_live_123" first and leave the value in clear.) Each pass
+    is skipped when the message lacks "=" or "api_key" respectively, so most
+    messages never reach the regex. Each record is masked at most once:
+    the result is written back to record.msg and the record is tagged, so the
+    filter is a no-op if it sees the same record again (e.g. attached to both a
+    logger and its handlers).
+    """
 
     SENSITIVE = [
         r"password=\S+",
@@ -11,16 +25,28 @@ class MaskFilter(logging.Filter):
         r"api_key=\S+",
         r"access_key=\S+",
         r"access_token=\S+",
-        r"(?i)\b\w*api_key\w*\b"
+        r"(?i:\b\w*api_key\w*\b)"
     ]
 
+    # key=value patterns in one pass, then the api_key word pattern
+    _PATTERN = re.compile("|".join(p for p in SENSITIVE if "=" in p))
+    _WORD_PATTERN = re.compile("|".join(p for p in SENSITIVE if "=" not in p))
+    _MASKED_ATTR = "_logifyx_masked"
+
     def filter(self, record):
 
+        if getattr(record, self._MASKED_ATTR, False):
+            return True
+
         msg = record.getMessage()
 
-        for pattern in self.SENSITIVE:
-            msg = re.sub(pattern, "****", msg)
+        if "=" in msg:
+            msg = self._PATTERN.sub("****", msg)
+        # The word pattern needs the (case-insensitive) word api_key
+        if "_" in msg and "api_key" in msg.lower():
+            msg = self._WORD_PATTERN.sub("****", msg)
 
         record.msg = msg
         record.args = None  # prevent double %-substitution in the formatter
+        setattr(record, self._MASKED_ATTR, True)
         return True
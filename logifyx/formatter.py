@@ -1,6 +1,9 @@
 import json
 import logging
-from pythonjsonlogger import jsonlogger
+import time
+from functools import lru_cache
+from json.encoder import encode_basestring
+from .event import get_event
 
 LEVEL_COLORS = {
     "DEBUG":    "\033[36m",
@@ -13,62 +16,190 @@ RESET  = "\033[0m"
 BLUE   = "\033[34m"
 WHITE  = "\033[97m"
 
+DEFAULT_DATEFMT = "%Y-%m-%d %H:%M:%S"
 
-def _format_line(record, datefmt, color=True):
-    dt = logging.Formatter(datefmt=datefmt).formatTime(record, datefmt)
-    level_color = LEVEL_COLORS.get(record.levelname, "")
-    level = record.levelname.ljust(8)
 
-    if color:
-        colored_level    = f"{level_color}{level}{RESET}"
-        colored_location = f"{BLUE}{record.name}{WHITE}:{BLUE}{record.funcName}:{record.lineno}{RESET}"
-        colored_message  = f"{level_color}{record.getMessage()}{RESET}"
-        colored_dt = f"\033[32m{dt}{RESET}"
-        return f"{colored_dt} | {colored_level} | {colored_location} - {colored_message}"
+class TimestampCache:
+    """
+    Renders record.created with strftime at most once per second.
+
+    Records logged within the same wall-clock second share the rendered
+    string; only the optional ",mmm" millisecond suffix is built per record.
+    The cached (second, text) pair is swapped as one tuple, so concurrent
+    readers never see a torn entry — at worst two threads render the same
+    second twice.
+    """
+
+    __slots__ = ("datefmt", "converter", "msecs", "_entry")
+
+    def __init__(self, datefmt=None, converter=time.localtime, msecs=False):
+        self.datefmt = datefmt or DEFAULT_DATEFMT
+        self.converter = converter
+        self.msecs = msecs
+        self._entry = (None, "")
+
+    def format(self, record) -> str:
+        created = record.created
+        second = int(created)
+        entry = self._entry
+        if entry[0] != second:
+            entry = (second, time.strftime(self.datefmt, self.converter(created)))
+            self._entry = entry
+        if self.msecs:
+            return f"{entry[1]},{int(record.msecs):03d}"
+        return entry[1]
+
+
+class _FormatterMixin:
+    """
+    Shared by the Logifyx formatters: formatTime() backed by a per-formatter
+    TimestampCache, and the include_exception switch. Sinks that ship the
+    traceback in a field of their own (remote, Kafka) turn it off so the
+    traceback is not sent twice.
+    """
+
+    msecs = False
+    include_exception = True
+    _time_cache = None
+
+    def formatTime(self, record, datefmt=None):
+        datefmt = datefmt or self.datefmt or DEFAULT_DATEFMT
+        cache = self._time_cache
+        if (
+            cache is None
+            or cache.datefmt != datefmt
+            or cache.converter is not self.converter
+            or cache.msecs != self.msecs
+        ):
+            cache = TimestampCache(datefmt, self.converter, self.msecs)
+            self._time_cache = cache
+        return cache.format(record)
+
+
+# Size of the per-(logger, function, line) location fragment caches
+LOCATION_CACHE_SIZE = 4096
+
+_DT_PREFIX = "\033[32m"
 
-    location = f"{record.name}:{record.funcName}:{record.lineno}"
-    return f"{dt} | {level} | {location} - {record.getMessage()}"
 
+def _level_fragments(levelname, color):
+    """(text between timestamp and location, text before the message) for a level."""
+    level = levelname.ljust(8)
+    if not color:
+        return f" | {level} | ", " - "
+    level_color = LEVEL_COLORS.get(levelname, "")
+    return f"{RESET} | {level_color}{level}{RESET} | ", f"{RESET} - {level_color}"
 
-class LogifyxFormatter(logging.Formatter):
+
+_COLOR_FRAGMENTS = {name: _level_fragments(name, True) for name in LEVEL_COLORS}
+_PLAIN_FRAGMENTS = {name: _level_fragments(name, False) for name in LEVEL_COLORS}
+
+
+@lru_cache(maxsize=LOCATION_CACHE_SIZE)
+def _location(name, func, lineno):
+    return f"{name}:{func}:{lineno}"
+
+
+@lru_cache(maxsize=LOCATION_CACHE_SIZE)
+def _colored_location(name, func, lineno):
+    return f"{BLUE}{name}{WHITE}:{BLUE}{func}:{lineno}"
+
+
+def _format_line(record, dt, color=True, include_exception=True):
+    event = get_event(record)
+    levelname = event.levelname
+    if color:
+        fragments = _COLOR_FRAGMENTS.get(levelname)
+        if fragments is None:
+            fragments = _COLOR_FRAGMENTS[levelname] = _level_fragments(levelname, True)
+        head, tail = fragments
+        line = (
+            _DT_PREFIX + dt + head
+            + _colored_location(event.name, event.func, event.lineno)
+            + tail + event.message + RESET
+        )
+    else:
+        fragments = _PLAIN_FRAGMENTS.get(levelname)
+        if fragments is None:
+            fragments = _PLAIN_FRAGMENTS[levelname] = _level_fragments(levelname, False)
+        head, tail = fragments
+        line = dt + head + _location(event.name, event.func, event.lineno) + tail + event.message
+
+    if include_exception:
+        if event.exc_text:
+            line += "\n" + event.exc_text
+        if event.stack_info:
+            line += "\n" + event.stack_info
+    return line
+
+
+class LogifyxFormatter(_FormatterMixin, logging.Formatter):
     """Default formatter: entire line colored by level."""
 
     def format(self, record):
-        return _format_line(record, self.datefmt, color=True)
+        return _format_line(record, self.formatTime(record), True, self.include_exception)
 
 
-class PlainLogifyxFormatter(logging.Formatter):
+class PlainLogifyxFormatter(_FormatterMixin, logging.Formatter):
     """Plain formatter: no color (opt-in via color=False)."""
 
     def format(self, record):
-        return _format_line(record, self.datefmt, color=False)
+        return _format_line(record, self.formatTime(record), False, self.include_exception)
 
 
-class CompactJsonFormatter(jsonlogger.JsonFormatter):
-    """JSON-mode formatter: single-line JSON object per record."""
+def _json_value(value) -> str:
+    """Encode one field exactly as json.dumps(value, ensure_ascii=False) would."""
+    if value.__class__ is str:
+        return encode_basestring(value)
+    if value.__class__ is int:
+        return int.__repr__(value)
+    if value is None:
+        return "null"
+    return json.dumps(value, ensure_ascii=False)
 
-    def format(self, record):
-        dt = logging.Formatter(datefmt=self.datefmt).formatTime(record, self.datefmt)
-        func = record.filename.replace(".py", "") if record.funcName == "<module>" else record.funcName
-        return json.dumps({
-            "timestamp": dt,
-            "level":     record.levelname,
-            "logger":    record.name,
-            "function":  func,
-            "line":      record.lineno,
-            "message":   record.getMessage(),
-        }, ensure_ascii=False)
 
+class CompactJsonFormatter(_FormatterMixin, logging.Formatter):
+    """
+    JSON-mode formatter: single-line JSON object per record.
 
-def get_formatter(json_mode=False, color=True):
-    datefmt = "%Y-%m-%d %H:%M:%S"
+    The field set is fixed, so the object is assembled from pre-built key
+    fragments and the stdlib C string escaper instead of going through
+    json.dumps. Output is byte-identical to
+    json.dumps({...}, ensure_ascii=False). A record carrying an exception gets
+    an extra "exception" field with the formatted traceback.
+    """
+
+    def format(self, record):
+        event = get_event(record)
+        func = event.filename.replace(".py", "") if event.func == "<module>" else event.func
+        line = (
+            '{"timestamp": ' + encode_basestring(self.formatTime(record))
+            + ', "level": ' + _json_value(event.levelname)
+            + ', "logger": ' + _json_value(event.name)
+            + ', "function": ' + _json_value(func)
+            + ', "line": ' + _json_value(event.lineno)
+            + ', "message": ' + _json_value(event.message)
+        )
+        if event.exc_text and self.include_exception:
+            line += ', "exception": ' + encode_basestring(event.exc_text)
+        return line + "}"
+
+
+def get_formatter(json_mode=False, color=True, msecs=False):
+    """
+    Build the formatter for a handler.
+
+    msecs=True appends ",mmm" milliseconds to the timestamp.
+    """
+    datefmt = DEFAULT_DATEFMT
 
     if json_mode:
         formatter = CompactJsonFormatter()
         formatter.datefmt = datefmt
-        return formatter
-
-    if color is False:
-        return PlainLogifyxFormatter(datefmt=datefmt)
+    elif color is False:
+        formatter = PlainLogifyxFormatter(datefmt=datefmt)
+    else:
+        formatter = LogifyxFormatter(datefmt=datefmt)
 
-    return LogifyxFormatter(datefmt=datefmt)
+    formatter.msecs = msecs
+    return formatter
@@ -1,20 +1,59 @@
+"""
+Handler specs for a resolved config.
+
+Handler modules and their dependencies (concurrent_log_handler, requests,
+aiokafka, fastavro) are imported only when a config asks for that handler,
+so `import logifyx` and console-only loggers stay cheap to start.
+"""
+
 import logging
-from concurrent_log_handler import ConcurrentRotatingFileHandler
-from .remote import RemoteHandler
 import os
+import sys
 import warnings
+from typing import Callable, List, NamedTuple
 
 
-# Optional Kafka support
-try:
-    from .kafka import KafkaHandler
-    KAFKA_AVAILABLE = True
-except ImportError:
-    KAFKA_AVAILABLE = False
-    KafkaHandler = None
+def kafka_available() -> bool:
+    """True if the Kafka dependencies (aiokafka, fastavro) can be imported."""
+    try:
+        from . import kafka  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 
-def get_handlers(config):
+class HandlerSpec(NamedTuple):
+    """
+    A handler that a config asks for, before it is created.
+
+    kind and identity name the destination (file path, URL, Kafka cluster and
+    topic); settings holds every other option that changes the handler's
+    behaviour. Two specs with equal (kind, identity, settings) describe
+    interchangeable handlers, which is what the sink registry relies on.
+    """
+
+    kind: str
+    identity: str
+    settings: tuple
+    factory: Callable[[], logging.Handler]
+
+
+def get_handler_specs(config) -> List[HandlerSpec]:
+
+    # Workers of a multi-process server ship everything but console output to
+    # a LogCollector, which owns the file, remote and Kafka handlers.
+    collector_socket = config.get("collector_socket")
+    if collector_socket:
+        from .collector import CollectorHandler
+        return [
+            _console_spec(),
+            HandlerSpec(
+                "collector",
+                os.path.abspath(collector_socket),
+                (),
+                lambda: CollectorHandler(collector_socket),
+            ),
+        ]
 
     try:
         log_dir = config['log_dir']
@@ -22,35 +61,148 @@ def get_handlers(config):
     except PermissionError:
         raise RuntimeError(f"Cannot create log directory: {log_dir}")
 
-    handlers = []
-
-    file_handler = ConcurrentRotatingFileHandler(
-        os.path.join(log_dir, config["file"]),
-        maxBytes=config["max_bytes"],
-        backupCount=config["backup_count"]
-    )
+    specs = []
 
-    handlers.append(file_handler)
+    path = os.path.abspath(os.path.join(log_dir, config["file"]))
+    specs.append(HandlerSpec(
+        "file",
+        path,
+        (config["max_bytes"], config["backup_count"]),
+        lambda: _file_handler(path, config),
+    ))
 
-    console = logging.StreamHandler()
-    handlers.append(console)
+    specs.append(_console_spec())
 
     if config.get("remote_url"):
-        handlers.append(RemoteHandler(config["remote_url"], config['remote_timeout'], config['max_remote_retries'], config['remote_headers']))
+        settings = (
+            config['remote_timeout'],
+            config['max_remote_retries'],
+            tuple(sorted((str(k), str(v)) for k, v in (config['remote_headers'] or {}).items())),
+            config.get("remote_batch_size", 0),
+            config.get("remote_batch_bytes", 1_000_000),
+            config.get("remote_batch_linger_ms", 1000),
+            config.get("remote_batch_format", "ndjson"),
+            config.get("remote_pool_size", 10),
+            config.get("remote_compression", "none"),
+            config.get("remote_compression_level", 3),
+            config.get("remote_compression_min_bytes", 1024),
+            *_network_settings(config),
+        )
+        specs.append(HandlerSpec("remote", config["remote_url"], settings, lambda: _remote_handler(config)))
 
     # Kafka handler with Avro + Schema Registry
-    if config.get("kafka_servers") and KAFKA_AVAILABLE:
-        handlers.append(KafkaHandler(
-            bootstrap_servers=config["kafka_servers"],
-            topic=config.get("kafka_topic", "logs"),
-            schema_registry_url=config.get("schema_registry_url"),
-            schema_compatibility=config.get("schema_compatibility", "BACKWARD")
-        ))
-    elif config.get("kafka_servers") and not KAFKA_AVAILABLE:
+    if config.get("kafka_servers") and kafka_available():
+        servers = config["kafka_servers"]
+        if isinstance(servers, (list, tuple)):
+            servers = ",".join(servers)
+        topic = config.get("kafka_topic", "logs")
+        settings = (
+            config.get("schema_registry_url"),
+            config.get("schema_compatibility", "BACKWARD"),
+            config.get("kafka_linger_ms", 5),
+            config.get("kafka_batch_size", 65536),
+            config.get("kafka_batch_records", 0),
+            config.get("kafka_batch_codec", "deflate"),
+            config.get("kafka_schema_version", 1),
+            *_network_settings(config),
+        )
+        specs.append(HandlerSpec("kafka", f"{servers}/{topic}", settings, lambda: _kafka_handler(config, topic)))
+    elif config.get("kafka_servers"):
         warnings.warn(
             "Kafka logging requested but kafka dependencies not installed. "
             "Install with: pip install kafka-python fastavro",
             RuntimeWarning
         )
 
-    return handlers
+    return specs
+
+
+def _console_spec() -> HandlerSpec:
+    # StreamHandler binds sys.stderr at creation, so loggers created while it
+    # is redirected (contextlib.redirect_stderr, pytest's capsys) need their
+    # own handler. The handler keeps the stream alive, so its id is not reused
+    # while the handler is registered.
+    stream = sys.stderr
+    return HandlerSpec("console", f"stderr:{id(stream)}", (), lambda: logging.StreamHandler(stream))
+
+
+def _network_settings(config) -> tuple:
+    spool_dir = config.get("spool_dir")
+    return (
+        os.path.abspath(spool_dir) if spool_dir else None,
+        config.get("spool_max_bytes", 268_435_456),
+        config.get("spool_fsync", "interval"),
+        config.get("spool_replay_rate", 200),
+        config.get("breaker_backoff_ms", 1000),
+        config.get("breaker_max_backoff_ms", 60_000),
+    )
+
+
+def _network_kwargs(config) -> dict:
+    spool_dir, max_bytes, fsync, replay_rate, backoff_ms, max_backoff_ms = _network_settings(config)
+    return {
+        "spool_dir": spool_dir,
+        "spool_max_bytes": max_bytes,
+        "spool_fsync": fsync,
+        "spool_replay_rate": replay_rate,
+        "backoff_ms": backoff_ms,
+        "max_backoff_ms": max_backoff_ms,
+    }
+
+
+def _file_handler(path: str, config) -> logging.Handler:
+    from concurrent_log_handler import ConcurrentRotatingFileHandler
+
+    return ConcurrentRotatingFileHandler(
+        path,
+        maxBytes=config["max_bytes"],
+        backupCount=config["backup_count"]
+    )
+
+
+def _remote_handler(config) -> logging.Handler:
+    from .remote import RemoteHandler
+
+    return RemoteHandler(
+        config["remote_url"],
+        config['remote_timeout'],
+        config['max_remote_retries'],
+        config['remote_headers'],
+        batch_size=config.get("remote_batch_size", 0),
+        batch_max_bytes=config.get("remote_batch_bytes", 1_000_000),
+        batch_linger_ms=config.get("remote_batch_linger_ms", 1000),
+        batch_format=config.get("remote_batch_format", "ndjson"),
+        pool_size=config.get("remote_pool_size", 10),
+        compression=config.get("remote_compression", "none"),
+        compression_level=config.get("remote_compression_level", 3),
+        compression_min_bytes=config.get("remote_compression_min_bytes", 1024),
+        **_network_kwargs(config),
+    )
+
+
+def _kafka_handler(config, topic: str) -> logging.Handler:
+    from .kafka import KafkaHandler
+
+    return KafkaHandler(
+        bootstrap_servers=config["kafka_servers"],
+        topic=topic,
+        schema_registry_url=config.get("schema_registry_url"),
+        schema_compatibility=config.get("schema_compatibility", "BACKWARD"),
+        linger_ms=config.get("kafka_linger_ms", 5),
+        max_batch_size=config.get("kafka_batch_size", 65536),
+        batch_records=config.get("kafka_batch_records", 0),
+        batch_codec=config.get("kafka_batch_codec", "deflate"),
+        schema_version=config.get("kafka_schema_version", 1),
+        **_network_kwargs(config),
+    )
+
+
+def __getattr__(name):
+    # KAFKA_AVAILABLE used to be computed at import time
+    if name == "KAFKA_AVAILABLE":
+        return kafka_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_handlers(config):
+    return [spec.factory() for spec in get_handler_specs(config)]
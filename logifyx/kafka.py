@@ -2,10 +2,12 @@
 Kafka Log Handler with Avro Schema Registry Support
 
 Features:
-- Async Kafka producer (aiokafka)
-- Avro serialization with schema versioning
+- Async Kafka producer (aiokafka) on a dedicated event loop thread
+- Batched, fire-and-forget sends with per-batch ack collection
+- Avro serialization with schema versioning (v1, and the compact typed v2)
+- Optional batch mode: many records per message as an Avro Object Container File
 - Schema Registry integration with compatibility modes
-- Auto-retry with circuit breaker pattern
+- Circuit breaker with half-open probes and jittered exponential backoff
 
 Usage:
     log = Logifyx(
@@ -17,18 +19,23 @@ Usage:
     )
 """
 
+import hashlib
 import logging
-import traceback
+import sys
+import threading
 import asyncio
 import fastavro
 import requests
 from fastavro.schema import parse_schema
 import json
+from .breaker import CLOSED, CircuitBreaker
 import io
 import struct
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
 from aiokafka import AIOKafkaProducer
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from .event import get_event
 
 # Avro schema for log records (versioned)
 LOG_SCHEMA_V1 = {
@@ -51,18 +58,110 @@ LOG_SCHEMA_V1 = {
     ]
 }
 
+# v2: native types instead of strings. timestamp_us is epoch microseconds
+# (timestamp-micros), severity an enum, attributes a map of typed values. The
+# v1 fields level, timestamp and extra stay as nullable fields (written as
+# null), so a v2 reader resolves v1 data without losing them: v2 is
+# BACKWARD compatible with v1 and both can be registered under one subject.
+LEVEL_SYMBOLS = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+LOG_SCHEMA_V2 = {
+    "type": "record",
+    "name": "LogRecord",
+    "namespace": "com.logifyx.logs",
+    "doc": "Log record schema v2",
+    "fields": [
+        {"name": "severity", "type": {"type": "enum", "name": "Level", "symbols": LEVEL_SYMBOLS, "default": "INFO"},
+         "default": "INFO", "doc": "Log level; custom levels map to the standard level below them"},
+        {"name": "message", "type": "string", "doc": "Log message"},
+        {"name": "service", "type": "string", "doc": "Service/logger name"},
+        {"name": "timestamp_us", "type": {"type": "long", "logicalType": "timestamp-micros"},
+         "default": 0, "doc": "UTC time of the record, microseconds since the epoch"},
+        {"name": "file", "type": ["null", "string"], "default": None, "doc": "Source file path"},
+        {"name": "line", "type": ["null", "int"], "default": None, "doc": "Line number"},
+        {"name": "function", "type": ["null", "string"], "default": None, "doc": "Function name"},
+        {"name": "exception", "type": ["null", "string"], "default": None, "doc": "Exception traceback if any"},
+        {"name": "attributes", "type": ["null", {"type": "map", "values": ["null", "boolean", "long", "double", "string"]}],
+         "default": None, "doc": "Extra fields; values that are not scalars are JSON strings"},
+        {"name": "schema_version", "type": "int", "default": 2, "doc": "Schema version for evolution"},
+        # v1 fields, null in v2 data
+        {"name": "level", "type": ["null", "string"], "default": None, "doc": "v1 log level"},
+        {"name": "timestamp", "type": ["null", "string"], "default": None, "doc": "v1 ISO8601 timestamp"},
+        {"name": "extra", "type": ["null", "string"], "default": None, "doc": "v1 extra JSON data"},
+    ]
+}
+
+SCHEMAS = {1: LOG_SCHEMA_V1, 2: LOG_SCHEMA_V2}
+
+# Kafka header on single-record v2 messages; without it a message is read as v1.
+# Batches carry their schema in the container header.
+SCHEMA_HEADER_KEY = "logifyx-schema"
+
+# Record attributes that are not extra fields
+_RESERVED_ATTRS = frozenset((
+    'name', 'msg', 'args', 'created', 'filename', 'funcName', 'levelname', 'levelno',
+    'lineno', 'module', 'msecs', 'pathname', 'process', 'processName',
+    'relativeCreated', 'stack_info', 'thread', 'threadName', 'exc_info',
+    'exc_text', 'message', 'asctime', 'taskName',
+))
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
 # Compatibility modes for schema registry
 COMPATIBILITY_MODES = ["BACKWARD", "BACKWARD_TRANSITIVE", "FORWARD", "FORWARD_TRANSITIVE", "FULL", "FULL_TRANSITIVE", "NONE"]
 
+# Batch mode: codec name -> fastavro codec. zstd needs the zstandard package.
+BATCH_CODECS = {"null": "null", "deflate": "deflate", "zstd": "zstandard"}
+
+# Every Avro Object Container File starts with these bytes
+OCF_MAGIC = b"Obj\x01"
+
+# Kafka header marking a batch message, so consumers can tell it from a single record
+BATCH_HEADER = ("logifyx-encoding", b"avro-ocf")
+
+# One OCF block per message: records are compressed together, not in 16 KB chunks
+_OCF_SYNC_INTERVAL = 64 * 1024 * 1024
+
+# Headers of an outgoing message, by the index stored with it in the spool:
+# single v1 record, batch, single v2 record
+_MESSAGE_HEADERS = (None, [BATCH_HEADER], [(SCHEMA_HEADER_KEY, b"2")])
+_HEADERS_NONE, _HEADERS_BATCH, _HEADERS_SCHEMA = range(3)
+
+# Spooled message: header index, key length, then key and value
+_SPOOL_PREFIX = struct.Struct(">BH")
+
+# Longest a spool replay waits for the broker; above aiokafka's request timeout
+_REPLAY_TIMEOUT = 60.0
+
+
+def _spool_frame(value: bytes, key: bytes, headers: int) -> bytes:
+    return _SPOOL_PREFIX.pack(headers, len(key)) + key + value
+
+
+def _spooled_message(frame: bytes):
+    headers, key_length = _SPOOL_PREFIX.unpack_from(frame)
+    start = _SPOOL_PREFIX.size
+    return frame[start + key_length:], frame[start:start + key_length], headers
+
 
 class AvroSerializer:
     """Handles Avro serialization with schema registry."""
 
-    def __init__(self, schema_registry_url: Optional[str] = None, compatibility: str = "BACKWARD"):
+    def __init__(
+        self,
+        schema_registry_url: Optional[str] = None,
+        compatibility: str = "BACKWARD",
+        codec: str = "deflate",
+        schema_version: int = 1,
+    ):
+        if schema_version not in SCHEMAS:
+            raise ValueError(f"schema_version must be one of {sorted(SCHEMAS)}, got {schema_version!r}")
         self.schema_registry_url = schema_registry_url
         self.compatibility = compatibility
+        self.codec = _available_codec(codec)
+        self.schema_version = schema_version
         self.schema_id = None
-        self._schema = LOG_SCHEMA_V1
+        self._schema = SCHEMAS[schema_version]
         self._writer = None
         self._fastavro_available = False
         
@@ -111,7 +210,7 @@ class AvroSerializer:
         """Serialize record to Avro binary format."""
         if not self._fastavro_available:
             # Fallback to JSON if fastavro not available
-            return json.dumps(record).encode('utf-8')
+            return json.dumps(_untagged(record)).encode('utf-8')
 
         buffer = io.BytesIO()
         
@@ -124,11 +223,172 @@ class AvroSerializer:
         
         return buffer.getvalue()
 
+    def serialize_batch(self, records: List[Dict[str, Any]]) -> bytes:
+        """
+        Serialize records as one Avro Object Container File: a header carrying
+        the schema and codec, then a single block with every record, compressed
+        together. Read it back with decode_message().
+        """
+        if not self._fastavro_available:
+            return json.dumps([_untagged(r) for r in records]).encode('utf-8')
+
+        buffer = io.BytesIO()
+        fastavro.writer(
+            buffer, self._parsed_schema, records,
+            codec=BATCH_CODECS[self.codec], sync_interval=_OCF_SYNC_INTERVAL,
+        )
+        return buffer.getvalue()
+
     @property
     def schema(self) -> Dict:
         return self._schema
 
 
+def _extra_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """Attributes added to the record by extra= or filters."""
+    return {k: v for k, v in record.__dict__.items()
+            if k not in _RESERVED_ATTRS and not k.startswith('_logifyx')}
+
+
+def _attribute(value: Any) -> Any:
+    """
+    An extra field as a v2 attribute: scalars keep their type, the rest becomes
+    JSON. Values are tagged with their union branch in fastavro's tuple
+    notation, which spares the writer from testing each branch in turn.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return ("boolean", value)
+    if isinstance(value, int):
+        return ("long", value) if _INT64_MIN <= value <= _INT64_MAX else ("string", str(value))
+    if isinstance(value, float):
+        return ("double", value)
+    if isinstance(value, str):
+        return ("string", value)
+    return ("string", json.dumps(value, default=str))
+
+
+def _untagged(record: Dict[str, Any]) -> Dict[str, Any]:
+    """A v2 record with attribute tuples replaced by their values, for JSON."""
+    attributes = record.get("attributes")
+    if not attributes:
+        return record
+    record = dict(record)
+    record["attributes"] = {k: v[1] if isinstance(v, tuple) else v for k, v in attributes.items()}
+    return record
+
+
+def _severity(levelno: int, levelname: str) -> str:
+    """The Level enum symbol for a record; custom levels round down to a standard one."""
+    if levelname in _LEVEL_SET:
+        return levelname
+    for number, name in _LEVELS_DESC:
+        if levelno >= number:
+            return name
+    return "NOTSET"
+
+
+_LEVEL_SET = frozenset(LEVEL_SYMBOLS)
+_LEVELS_DESC = sorted(((logging.getLevelName(name), name) for name in LEVEL_SYMBOLS), reverse=True)
+
+
+def _available_codec(codec: str) -> str:
+    """Validate a batch codec; fall back to deflate if zstd's package is missing."""
+    if codec not in BATCH_CODECS:
+        raise ValueError(f"Kafka batch codec must be one of {sorted(BATCH_CODECS)}, got {codec!r}")
+    if codec == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print(
+                "⚠️ Logifyx Kafka batch codec 'zstd' needs the zstandard package "
+                "(pip install logifyx[zstd]) — using deflate",
+                file=sys.stderr
+            )
+            return "deflate"
+    return codec
+
+
+def decode_message(
+    value: bytes,
+    headers: Optional[list] = None,
+    schema: Optional[Dict] = None,
+    normalize: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Decode one Kafka message written by KafkaHandler into its log records.
+
+    Accepts every format the handler produces: a batch (Avro Object Container
+    File, schema read from its header), a single record in Confluent wire
+    format or plain schemaless Avro, and the JSON fallback. The writer schema
+    of a single record is schema if given, else LOG_SCHEMA_V2 if the message's
+    headers (as a consumer returns them) mark it as v2, else LOG_SCHEMA_V1.
+
+    With normalize=True every record is returned in one shape whatever its
+    schema version; see normalize_record().
+
+        for message in consumer:
+            for record in decode_message(message.value, message.headers, normalize=True):
+                print(record["level"], record["message"])
+    """
+    if value[:4] == OCF_MAGIC:
+        records = list(fastavro.reader(io.BytesIO(value)))
+    elif value[:1] in (b"{", b"["):
+        decoded = json.loads(value)
+        records = decoded if isinstance(decoded, list) else [decoded]
+    else:
+        if schema is None:
+            version = dict(headers or ()).get(SCHEMA_HEADER_KEY)
+            schema = LOG_SCHEMA_V2 if version == b"2" else LOG_SCHEMA_V1
+        buffer = io.BytesIO(value)
+        if value[:1] == b"\0":
+            buffer.seek(5)  # magic byte + schema ID
+        records = [fastavro.schemaless_reader(buffer, _parsed(schema))]
+    if normalize:
+        return [normalize_record(record) for record in records]
+    return records
+
+
+_parsed_schemas: Dict[int, Any] = {}
+
+
+def _parsed(schema: Dict) -> Any:
+    parsed = _parsed_schemas.get(id(schema))
+    if parsed is None:
+        parsed = _parsed_schemas[id(schema)] = parse_schema(schema)
+    return parsed
+
+
+def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a decoded v1 or v2 record in one shape: level (str), message,
+    service, timestamp (timezone-aware datetime, UTC), file, line, function,
+    exception, extra (dict or None) and schema_version.
+    """
+    if record.get("schema_version", 1) >= 2:
+        timestamp = record["timestamp_us"]
+        if isinstance(timestamp, int):  # JSON fallback or a reader without logical types
+            timestamp = datetime.fromtimestamp(timestamp / 1e6, tz=timezone.utc)
+        level, extra = record["severity"], record.get("attributes")
+    else:
+        timestamp = datetime.fromisoformat(record["timestamp"].rstrip("Z")).replace(tzinfo=timezone.utc)
+        level, extra = record["level"], record.get("extra")
+        extra = json.loads(extra) if extra else None
+    return {
+        "level": level,
+        "message": record["message"],
+        "service": record["service"],
+        "timestamp": timestamp,
+        "file": record.get("file"),
+        "line": record.get("line"),
+        "function": record.get("function"),
+        "exception": record.get("exception"),
+        "extra": extra,
+        "schema_version": record.get("schema_version", 1),
+    }
+
+
 class KafkaHandler(logging.Handler):
     """
     Async Kafka logging handler with Avro serialization.
@@ -137,7 +397,30 @@ class KafkaHandler(logging.Handler):
     - Async message production (non-blocking)
     - Avro schema with schema registry
     - Schema versioning and compatibility
-    - Circuit breaker pattern for failures
+    - Circuit breaker for failures (see breaker.py): after max_failures
+      failed messages records are dropped until a probe record, sent after
+      backoff_ms (doubling up to max_backoff_ms, jittered), is acked
+
+    The producer lives on a dedicated background event loop thread for the
+    whole life of the handler. emit() only appends to a thread-safe buffer;
+    the loop drains it in batches, hands every message to the producer with
+    fire-and-forget send() (the producer groups them using linger_ms and
+    max_batch_size) and gathers the broker acks once per batch.
+
+    With batch_records > 1, up to that many records with the same key go into
+    one Kafka message as an Avro Object Container File compressed with
+    batch_codec ("deflate", "zstd" or "null"), tagged with BATCH_HEADER. The
+    loop then waits linger_ms before draining a partly filled buffer. Use
+    decode_message() to read the messages back.
+
+    schema_version selects LOG_SCHEMA_V1 (default) or the compact LOG_SCHEMA_V2.
+    Single-record v2 messages carry a "logifyx-schema: 2" header so
+    decode_message() knows which schema wrote them.
+
+    With spool_dir set, messages the broker fails to take are written to a
+    disk spool (see spool.py), followed by every message after them, and
+    replayed once the broker is back, instead of being dropped while the
+    circuit breaker is open; the breaker paces the replay thread's retries.
     """
 
     def __init__(
@@ -149,6 +432,18 @@ class KafkaHandler(logging.Handler):
         max_failures: int = 5,
         acks: str = "all",
         compression_type: str = "gzip",
+        linger_ms: int = 5,
+        max_batch_size: int = 65536,
+        max_pending: int = 100_000,
+        batch_records: int = 0,
+        batch_codec: str = "deflate",
+        schema_version: int = 1,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: int = 268_435_456,
+        spool_fsync: str = "interval",
+        spool_replay_rate: int = 200,
+        backoff_ms: int = 1000,
+        max_backoff_ms: int = 60_000,
         **kafka_kwargs
     ):
         super().__init__()
@@ -160,39 +455,102 @@ class KafkaHandler(logging.Handler):
         self.max_failures = max_failures
         self.acks = acks
         self.compression_type = compression_type
+        self.linger_ms = linger_ms
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.batch_records = batch_records
+        self.batch_codec = _available_codec(batch_codec)
+        self.schema_version = schema_version
+        self._headers = _HEADERS_SCHEMA if schema_version >= 2 else _HEADERS_NONE
         self.kafka_kwargs = kafka_kwargs
         
-        self.failures = 0
-        self.disabled = False
+        servers = ",".join(bootstrap_servers) if isinstance(bootstrap_servers, (list, tuple)) else bootstrap_servers
+        label = f"Kafka topic {topic!r} at {servers}"
+        self.breaker = CircuitBreaker(label, max_failures, backoff_ms, max_backoff_ms)
+        self.dropped = 0
         self._producer = None
-        self._loop = None
         self._serializer = None
+
+        # Background loop state
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._buffer: deque = deque()
+        self._wake: Optional[asyncio.Event] = None
+        self._drain_lock: Optional[asyncio.Lock] = None
+        self._wake_scheduled = False
+        self._inflight: set = set()
+        self._inflight_records = 0
+        self._stopping = False
         
         # Initialize serializer
         self._init_serializer()
 
+        self._spooler = None
+        if spool_dir:
+            from .spool import Spooler
+            self._spooler = Spooler(
+                spool_dir,
+                "kafka-" + hashlib.sha1(f"{servers}/{topic}".encode("utf-8")).hexdigest()[:12],
+                self._replay,
+                label,
+                replay_rate=spool_replay_rate,
+                max_bytes=spool_max_bytes,
+                fsync=spool_fsync,
+                breaker=self.breaker,
+            )
+
+    @property
+    def spooling(self) -> bool:
+        """True if failed messages go to a disk spool instead of being dropped."""
+        return self._spooler is not None
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failed messages counted towards opening the circuit breaker."""
+        return self.breaker.failures
+
+    @property
+    def disabled(self) -> bool:
+        """True while the circuit breaker is open or half-open."""
+        return self.breaker.state != CLOSED
+
+    @disabled.setter
+    def disabled(self, value: bool) -> None:
+        # Manual switch: True holds the breaker open until set back to False
+        if value:
+            self.breaker.trip()
+        else:
+            self.breaker.reset()
+
     def _init_serializer(self):
         """Initialize Avro serializer."""
         self._serializer = AvroSerializer(
             schema_registry_url=self.schema_registry_url,
-            compatibility=self.schema_compatibility
+            compatibility=self.schema_compatibility,
+            codec=self.batch_codec,
+            schema_version=self.schema_version,
         )
         # Register schema if registry is configured
         if self.schema_registry_url:
             self._serializer.register_schema(self.topic)
 
     async def _get_producer(self):
-        """Lazily initialize async Kafka producer."""
+        """Lazily initialize async Kafka producer (runs on the handler's loop)."""
         if self._producer is None:
             try:
                 
-                self._producer = AIOKafkaProducer(
+                producer = AIOKafkaProducer(
                     bootstrap_servers=self.bootstrap_servers,
                     acks=self.acks,
                     compression_type=self.compression_type,
+                    linger_ms=self.linger_ms,
+                    max_batch_size=self.max_batch_size,
                     **self.kafka_kwargs
                 )
-                await self._producer.start()
+                # Kept only once started, so the next drain retries a failed start
+                await producer.start()
+                self._producer = producer
                 
             except ImportError:
                 raise ImportError(
@@ -202,105 +560,329 @@ class KafkaHandler(logging.Handler):
         return self._producer
 
     def _build_record(self, record: logging.LogRecord) -> Dict[str, Any]:
-        """Build Avro-compatible log record."""
+        """Build Avro-compatible log record for the handler's schema version."""
+        if self.schema_version >= 2:
+            return self._build_record_v2(record)
+        event = get_event(record)
         payload = {
-            "level": record.levelname,
-            "message": record.getMessage(),
-            "service": record.name,
-            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
-            "file": record.pathname,
-            "line": record.lineno,
-            "function": record.funcName,
-            "exception": None,
+            "level": event.levelname,
+            "message": event.message,
+            "service": event.name,
+            "timestamp": datetime.utcfromtimestamp(event.created).isoformat() + "Z",
+            "file": event.pathname,
+            "line": event.lineno,
+            "function": event.func,
+            "exception": event.exc_text,
             "extra": None,
             "schema_version": 1
         }
 
-        # Add exception info if present
-        if record.exc_info:
-            payload["exception"] = ''.join(traceback.format_exception(*record.exc_info))
-
         # Add extra fields as JSON
-        extra_fields = {k: v for k, v in record.__dict__.items() 
-                       if k not in ('name', 'msg', 'args', 'created', 'filename',
-                                   'funcName', 'levelname', 'levelno', 'lineno',
-                                   'module', 'msecs', 'pathname', 'process',
-                                   'processName', 'relativeCreated', 'stack_info',
-                                   'thread', 'threadName', 'exc_info', 'exc_text',
-                                   'message', 'asctime')}
+        extra_fields = _extra_fields(record)
         if extra_fields:
-            payload["extra"] = json.dumps(extra_fields)
+            payload["extra"] = json.dumps(extra_fields, default=str)
 
         return payload
 
-    async def _send_async(self, record: logging.LogRecord):
-        """Send log record to Kafka asynchronously."""
+    def _build_record_v2(self, record: logging.LogRecord) -> Dict[str, Any]:
+        """Build a LOG_SCHEMA_V2 record: no timestamp formatting, no JSON encoding."""
+        event = get_event(record)
+        extra_fields = _extra_fields(record)
+        if extra_fields:
+            extra_fields = {k: _attribute(v) for k, v in extra_fields.items()}
+        return {
+            "severity": _severity(event.levelno, event.levelname),
+            "message": event.message,
+            "service": event.name,
+            "timestamp_us": int(event.created * 1_000_000),
+            "file": event.pathname,
+            "line": event.lineno,
+            "function": event.func,
+            "exception": event.exc_text,
+            "attributes": extra_fields or None,
+            "schema_version": 2,
+            "level": None,
+            "timestamp": None,
+            "extra": None,
+        }
+
+    # ------------------------------------------------------------------
+    # Background loop
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the producer's event loop thread on first use."""
+        if self._thread is not None and self._thread.is_alive():
+            return self._loop
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                ready = threading.Event()
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run_loop, args=(ready,), name="logifyx-kafka", daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+        return self._loop
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._drain_lock = asyncio.Lock()
+        ready.set()
+        try:
+            loop.run_until_complete(self._drain_forever())
+        finally:
+            loop.close()
+
+    async def _drain_forever(self) -> None:
+        """Move buffered payloads into the producer until close() is called."""
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            self._wake_scheduled = False
+            if self.batch_records > 1 and len(self._buffer) < self.batch_records and not self._stopping:
+                await asyncio.sleep(self.linger_ms / 1000)  # let a batch fill
+            await self._drain_buffer()
+            if self._stopping and not self._buffer:
+                return
+
+    def _wakeup(self) -> None:
+        """Wake the loop. Only one wakeup is queued at a time to keep emit() cheap."""
+        if self._wake_scheduled:
+            return
+        self._wake_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # Loop already closed (handler closed or interpreter shutting down)
+            self._wake_scheduled = False
+
+    async def _drain_buffer(self) -> None:
+        """Send everything currently buffered and collect acks for the batch."""
+        # Serialise drains so flush() and the drain loop never reorder records
+        async with self._drain_lock:
+            await self._drain_locked()
+
+    async def _drain_locked(self) -> None:
+        if not self._buffer:
+            return
+        messages = self._serialize_buffer()
+        if not messages:
+            return
+        spooler = self._spooler
         try:
             producer = await self._get_producer()
-            payload = self._build_record(record)
-            
-            # Serialize with Avro
-            value = self._serializer.serialize(payload)
-            
-            # Send to Kafka
-            await producer.send_and_wait(
-                self.topic,
-                value=value,
-                key=record.name.encode('utf-8')
-            )
-            
-            self.failures = 0  # Reset on success
-            
-        except Exception as e:
-            self.failures += 1
-            if self.failures >= self.max_failures:
-                self.disabled = True
+        except Exception:
+            if spooler is not None:
+                spooler.spill([_spool_frame(value, key, headers) for value, key, headers, _ in messages])
+            self._record_failures(sum(count for *_, count in messages))
+            return
+
+        sends = []  # (ack future, records in the message, message)
+        for message in messages:
+            value, key, headers, count = message
+            # Older messages are still spooled: queue behind them to keep order
+            if spooler is not None and spooler.active and spooler.divert(_spool_frame(value, key, headers)):
+                continue
+            try:
+                future = await self._send_message(producer, value, key, headers)
+                sends.append((future, count, message))
+            except Exception:
+                if spooler is not None:
+                    spooler.spill([_spool_frame(value, key, headers)])
+                self._record_failures(1)
+
+        if sends:
+            self._inflight_records += sum(count for _, count, _ in sends)
+            task = asyncio.ensure_future(self._collect_acks(sends))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    def _serialize_buffer(self) -> list:
+        """Turn everything buffered into (value, key, headers, records) messages."""
+        messages = []
+        buffer = self._buffer
+        if self.batch_records > 1:
+            # Group by key so each batch still lands on its key's partition
+            groups: Dict[bytes, list] = {}
+            while buffer:
+                payload, key = buffer.popleft()
+                groups.setdefault(key, []).append(payload)
+            for key, payloads in groups.items():
+                for i in range(0, len(payloads), self.batch_records):
+                    chunk = payloads[i:i + self.batch_records]
+                    try:
+                        messages.append((self._serializer.serialize_batch(chunk), key, _HEADERS_BATCH, len(chunk)))
+                    except Exception:
+                        self._record_failures(1)
+        else:
+            while buffer:
+                payload, key = buffer.popleft()
+                try:
+                    messages.append((self._serializer.serialize(payload), key, self._headers, 1))
+                except Exception:
+                    self._record_failures(1)
+        return messages
+
+    async def _send_message(self, producer, value: bytes, key: bytes, headers: int):
+        if headers == _HEADERS_NONE:
+            return await producer.send(self.topic, value=value, key=key)
+        return await producer.send(self.topic, value=value, key=key, headers=_MESSAGE_HEADERS[headers])
+
+    async def _collect_acks(self, sends: list) -> None:
+        results = await asyncio.gather(*(future for future, _, _ in sends), return_exceptions=True)
+        self._inflight_records -= sum(count for _, count, _ in sends)
+        failed = [message for (_, _, message), r in zip(sends, results) if isinstance(r, BaseException)]
+        if failed:
+            if self._spooler is not None:
+                self._spooler.spill([_spool_frame(value, key, headers) for value, key, headers, _ in failed])
+            # Counted per message: a failed batch is one failure, like a failed record
+            self._record_failures(len(failed))
+        else:
+            self.breaker.success()
+
+    def _replay(self, frames: list) -> int:
+        """Send spooled messages in order (spool thread); returns how many were acked."""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._send_spooled(frames), loop)
+        return future.result(_REPLAY_TIMEOUT)
+
+    async def _send_spooled(self, frames: list) -> int:
+        producer = await self._get_producer()
+        futures = []
+        try:
+            for frame in frames:
+                futures.append(await self._send_message(producer, *_spooled_message(frame)))
+        except Exception:
+            pass  # the rest stays spooled
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        delivered = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                break
+            delivered += 1
+        return delivered
+
+    def _record_failures(self, count: int) -> None:
+        self.breaker.failure(count)
+
+    async def _flush_pending(self) -> None:
+        await self._drain_buffer()
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+        if self._producer:
+            await self._producer.flush()
+
+    async def _shutdown(self) -> None:
+        await self._flush_pending()
+        if self._producer:
+            await self._producer.stop()
+            self._producer = None
+        self._stopping = True
+        self._wake.set()
+
+    def _call_in_loop(self, coro, timeout: Optional[float] = None) -> None:
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.result(timeout)
+
+    # ------------------------------------------------------------------
+    # logging.Handler API
+    # ------------------------------------------------------------------
 
     def emit(self, record: logging.LogRecord):
         """Emit log record to Kafka."""
-        if self.disabled:
+        if self._spooler is None and not self.breaker.allow():
             return
 
         try:
-            # Run async send in background
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self._send_async(record))
-            else:
-                loop.run_until_complete(self._send_async(record))
-                
-        except RuntimeError:
-            # No event loop, create one
-            asyncio.run(self._send_async(record))
+            if len(self._buffer) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._buffer.append((self._build_record(record), record.name.encode('utf-8')))
+            self._ensure_loop()
+            self._wakeup()
+        except Exception:
+            self.handleError(record)
+
+    def _reinit_after_fork(self) -> None:
+        """
+        Reset state in a forked child. The loop thread did not survive the fork
+        and the producer's connections belong to the parent, so both are
+        recreated on the next emit(). Records the parent had buffered are left
+        to the parent.
+        """
+        self._producer = None
+        self._loop = None
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._buffer = deque()
+        self._wake = None
+        self._drain_lock = None
+        self._wake_scheduled = False
+        self._inflight = set()
+        self._inflight_records = 0
+        self._stopping = False
+        self.breaker._reinit_after_fork()
+        if self._spooler is not None:
+            self._spooler._reinit_after_fork()
+
+    def pending(self) -> int:
+        """Records buffered or sent but not yet acked by the broker."""
+        return len(self._buffer) + self._inflight_records
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Block until every buffered record has been acked by the broker.
+
+        Returns False if the timeout expired (or the flush failed) first.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        try:
+            self._call_in_loop(self._flush_pending(), timeout)
+        except Exception:
+            return False
+        return True
 
     async def flush_async(self):
-        """Flush pending messages."""
-        if self._producer:
-            await self._producer.flush()
+        """Flush pending messages without blocking the caller's event loop."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._flush_pending(), self._loop)
+        )
 
     async def close_async(self):
-        """Close Kafka producer."""
-        if self._producer:
-            await self._producer.flush()
-            await self._producer.stop()
-            self._producer = None
+        """Close Kafka producer without blocking the caller's event loop."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        )
 
     def close(self):
         """Close handler."""
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(self.close_async())
-            else:
-                loop.run_until_complete(self.close_async())
-        except RuntimeError:
-            asyncio.run(self.close_async())
+        spooler = self._spooler
+        if spooler is not None:
+            spooler.stop()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._call_in_loop(self._shutdown(), timeout=10.0)
+            except Exception:
+                pass
+            thread.join(timeout=10.0)
+        if spooler is not None:
+            spooler.close()  # after the final flush, which may still spool
         super().close()
 
 
-def get_log_schema() -> Dict:
-    """Get the current Avro schema for log records."""
-    return LOG_SCHEMA_V1
+def get_log_schema(version: int = 1) -> Dict:
+    """Get the Avro schema for log records of the given version (1 or 2)."""
+    return SCHEMAS[version]
 
 
 def get_compatibility_modes() -> list:
@@ -0,0 +1,218 @@
+"""
+Self-metrics: counters and latency histograms, recorded without locks.
+
+Each thread records into its own shard (a thread-local dict of counters and
+one of histograms), so a log call never contends with other threads or with
+a reader. stats() in core merges the shards on read. Shards of threads that
+have exited are folded into one retired shard, so their counts are kept
+without holding on to one shard per thread ever started.
+
+Histograms are log-linear, like HdrHistogram: 16 buckets per power of two,
+so any recorded value is off by at most 1/32 (~3%) of itself, from 1 ns to
+hours, in a few dozen sparse buckets per key. Recording is one dict update
+and merging two histograms is adding their bucket counts.
+
+Keys recorded by logifyx:
+
+    ("logger", name, levelno)  histogram  caller-side time of a log call
+    ("emit", sink)             histogram  time the sink's handler took per call
+                                          (one call per batch in async_local mode)
+    ("lag", sink)              histogram  time from the log call to delivery
+    ("handled", sink)          counter    records the sink's workers handled
+    ("errors", sink)           counter    handler calls that raised
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+# Sub-buckets per power of two, as a bit count
+_SUB_BITS = 4
+_SUB = 1 << _SUB_BITS
+# Values below this get one bucket each
+_LINEAR = _SUB << 1
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def bucket_of(value: int) -> int:
+    """Bucket index of a non-negative integer value."""
+    if value < _LINEAR:
+        return value
+    shift = value.bit_length() - _SUB_BITS - 1
+    return (shift << _SUB_BITS) + (value >> shift)
+
+
+def bucket_range(index: int) -> tuple:
+    """Lowest and highest value that fall in bucket index."""
+    if index < _LINEAR:
+        return index, index
+    shift = (index >> _SUB_BITS) - 1
+    low = (index - (shift << _SUB_BITS)) << shift
+    return low, low + (1 << shift) - 1
+
+
+class Histogram:
+    """
+    Log-linear histogram of non-negative integer values (logifyx records
+    nanoseconds).
+
+    Only bucket counts are kept, so recording a value is one dict update.
+    Count, mean, percentiles and max are all derived from the buckets and
+    reported as the middle of their bucket, like HdrHistogram does.
+
+    record() is meant for the owning thread only; merge() and summary() may
+    run on another thread and miss a value being recorded at that moment.
+    """
+
+    __slots__ = ("buckets",)
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+
+    def record(self, value: int) -> None:
+        buckets = self.buckets
+        index = bucket_of(value)
+        buckets[index] = buckets.get(index, 0) + 1
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets.values())
+
+    def merge(self, other: "Histogram") -> None:
+        """Add other's values to this histogram."""
+        buckets = self.buckets
+        for index, count in other.buckets.copy().items():
+            buckets[index] = buckets.get(index, 0) + count
+
+    def percentile(self, pct: float) -> int:
+        """Value at or below which pct percent of the recorded values fall."""
+        buckets = self.buckets.copy()
+        rank = max(1, -(-sum(buckets.values()) * pct // 100))
+        running = 0
+        value = 0
+        for index in sorted(buckets):
+            running += buckets[index]
+            value = _midpoint(index)
+            if running >= rank:
+                break
+        return value
+
+    def summary(self, scale: float = 1e-3, digits: int = 1) -> dict:
+        """
+        Count, mean, percentiles and max. Values are multiplied by scale and
+        rounded: the default turns nanoseconds into microseconds.
+        """
+        buckets = self.buckets.copy()
+        count = sum(buckets.values())
+        summary = {"count": count}
+        if not count:
+            return summary
+        total = sum(_midpoint(index) * n for index, n in buckets.items())
+        summary["mean"] = round(total / count * scale, digits)
+        for pct in PERCENTILES:
+            summary[f"p{pct:g}"] = round(self.percentile(pct) * scale, digits)
+        summary["max"] = round(_midpoint(max(buckets)) * scale, digits)
+        return summary
+
+
+def _midpoint(index: int) -> int:
+    low, high = bucket_range(index)
+    return (low + high) // 2
+
+
+class _Shard:
+    """One thread's counters and histograms."""
+
+    __slots__ = ("thread", "counters", "histograms")
+
+    def __init__(self, thread: Optional[threading.Thread]):
+        self.thread = thread
+        self.counters: Dict[tuple, int] = {}
+        self.histograms: Dict[tuple, Histogram] = {}
+
+    def absorb(self, other: "_Shard") -> None:
+        counters = self.counters
+        for key, value in other.counters.copy().items():
+            counters[key] = counters.get(key, 0) + value
+        histograms = self.histograms
+        for key, histogram in other.histograms.copy().items():
+            mine = histograms.get(key)
+            if mine is None:
+                mine = histograms[key] = Histogram()
+            mine.merge(histogram)
+
+
+class _Local(threading.local):
+    """Creates and registers the calling thread's shard on first use."""
+
+    def __init__(self):
+        shard = _Shard(threading.current_thread())
+        self.counters = shard.counters
+        self.histograms = shard.histograms
+        with _lock:
+            _shards.append(shard)
+
+
+_lock = threading.Lock()
+_shards: List[_Shard] = []
+_retired = _Shard(None)
+_local = _Local()
+
+
+def count(key: tuple, n: int = 1) -> None:
+    """Add n to the calling thread's counter for key."""
+    counters = _local.counters
+    counters[key] = counters.get(key, 0) + n
+
+
+def observe(key: tuple, value: int) -> None:
+    """Record value (nanoseconds, by convention) in the calling thread's histogram for key."""
+    histograms = _local.histograms
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = Histogram()
+    # Histogram.record() and bucket_of(), inlined: this runs on every log call
+    if value < _LINEAR:
+        index = value
+    else:
+        shift = value.bit_length() - _SUB_BITS - 1
+        index = (shift << _SUB_BITS) + (value >> shift)
+    buckets = histogram.buckets
+    buckets[index] = buckets.get(index, 0) + 1
+
+
+def snapshot() -> _Shard:
+    """
+    Merge every thread's shard into a new one. Shards of exited threads are
+    folded into the retired shard first.
+    """
+    with _lock:
+        live = []
+        for shard in _shards:
+            if shard.thread.is_alive():
+                live.append(shard)
+            else:
+                _retired.absorb(shard)
+        _shards[:] = live
+        merged = _Shard(None)
+        merged.absorb(_retired)
+        for shard in live:
+            merged.absorb(shard)
+    return merged
+
+
+def reset() -> None:
+    """Forget everything recorded so far, in every thread."""
+    with _lock:
+        for shard in _shards + [_retired]:
+            shard.counters.clear()
+            shard.histograms.clear()
+
+
+def _reinit_after_fork() -> None:
+    """Start the child with no shards: the parent's counts are the parent's."""
+    global _lock, _shards, _retired, _local
+    _lock = threading.Lock()
+    _shards = []
+    _retired = _Shard(None)
+    _local = _Local()
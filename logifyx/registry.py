@@ -0,0 +1,85 @@
+"""
+Process-wide registry of shared sinks.
+
+Loggers that write to the same destination with the same settings share one
+handler (or one AsyncSink) instead of each opening their own file lock, TCP
+pool or Kafka producer. Each entry is reference counted: the last logger to
+release it closes it.
+
+    handler = registry.acquire(key, factory, close)   # refs += 1, created on first use
+    registry.release(handler)                         # refs -= 1, closed at zero
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class _Entry:
+    __slots__ = ("key", "obj", "close", "refs")
+
+    def __init__(self, key: Hashable, obj: Any, close: Callable[[Any], None]):
+        self.key = key
+        self.obj = obj
+        self.close = close
+        self.refs = 0
+
+
+class SinkRegistry:
+    """Reference-counted map from sink key to a shared handler or sink."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_key: Dict[Hashable, _Entry] = {}
+        self._by_id: Dict[int, _Entry] = {}
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any], close: Callable[[Any], None]) -> Any:
+        """
+        Return the object registered under key, creating it with factory() if
+        needed. close(obj) is called when its last reference is released.
+        """
+        with self._lock:
+            entry = self._by_key.get(key)
+            if entry is None:
+                entry = _Entry(key, factory(), close)
+                self._by_key[key] = entry
+                self._by_id[id(entry.obj)] = entry
+            entry.refs += 1
+            return entry.obj
+
+    def release(self, obj: Any) -> None:
+        """Drop one reference to obj; close it if that was the last one."""
+        with self._lock:
+            entry = self._by_id.get(id(obj))
+            if entry is None or entry.obj is not obj:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._by_key[entry.key]
+            del self._by_id[id(obj)]
+        try:
+            entry.close(obj)
+        except Exception:
+            pass
+
+    def refcount(self, obj: Any) -> int:
+        """Number of loggers currently holding obj (0 if it is not registered)."""
+        with self._lock:
+            entry = self._by_id.get(id(obj))
+            return entry.refs if entry is not None and entry.obj is obj else 0
+
+    def _reinit_after_fork(self) -> None:
+        """Replace the lock in a forked child (another thread may have held it)."""
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_key)
+
+    def clear(self) -> List[tuple]:
+        """Forget every entry without closing it. Returns the (obj, close) pairs."""
+        with self._lock:
+            entries = list(self._by_key.values())
+            self._by_key.clear()
+            self._by_id.clear()
+        return [(entry.obj, entry.close) for entry in entries]
@@ -1,103 +1,492 @@
+import hashlib
+import json
 import logging
+import sys
 import threading
+import time
+import zlib
+from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
+from .breaker import CLOSED, CircuitBreaker
+from .event import get_event
+
+
+BATCH_FORMATS = ("ndjson", "json")
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+_COMPRESSION_LEVELS = {
+    "gzip": range(0, 10),
+    "zstd": range(1, 23),
+}
+
+_BATCH_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json":   "application/json",
+}
+
+# Spooled requests start with the index of their Content-Type in this tuple
+_SPOOL_CONTENT_TYPES = ("application/json", "application/x-ndjson")
+
+# One pooled session per remote URL, shared by every RemoteHandler in the process.
+# Keeping connections open avoids a TCP (and TLS) handshake per record.
+_sessions: dict = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(url: str, pool_size: int = 10) -> requests.Session:
+    """
+    Return the shared keep-alive session for url, creating it on first use.
+
+    The first caller for a URL decides the pool size; later callers reuse the
+    same connection pool so all loggers targeting one collector share sockets.
+    """
+    with _sessions_lock:
+        session = _sessions.get(url)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["Connection"] = "keep-alive"
+            _sessions[url] = session
+        return session
+
+
+def reset_sessions_after_fork() -> None:
+    """
+    Forget the parent's sessions in a forked child. Their pooled sockets are
+    shared with the parent, so the child must open its own connections.
+    """
+    global _sessions_lock
+    _sessions_lock = threading.Lock()
+    _sessions.clear()
+
+
+def close_sessions() -> None:
+    """Close every shared session and drop its pooled connections."""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def _spool_frame(content_type: str, body: bytes) -> bytes:
+    return bytes((_SPOOL_CONTENT_TYPES.index(content_type),)) + body
+
+
+def _available_compression(compression: str) -> str:
+    """Validate a compression name; fall back to gzip if zstd's package is missing."""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {list(COMPRESSIONS)}, got {compression!r}")
+    if compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print(
+                "⚠️ Logifyx remote compression 'zstd' needs the zstandard package "
+                "(pip install logifyx[zstd]) — using gzip",
+                file=sys.stderr
+            )
+            return "gzip"
+    return compression
+
+
+def _compressor(compression: str, level: int):
+    """Return a thread-safe function compressing a request body, or None for "none"."""
+    if compression == "none":
+        return None
+    levels = _COMPRESSION_LEVELS[compression]
+    if level not in levels:
+        raise ValueError(
+            f"{compression} compression level must be {levels.start}-{levels.stop - 1}, got {level!r}"
+        )
+    if compression == "gzip":
+        def gzip_body(body: bytes) -> bytes:
+            # 16 + window bits: gzip header and trailer. A window and hash table
+            # sized to the body make setup far cheaper for small bodies.
+            window = min(15, max(9, len(body).bit_length()))
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + window, window - 7)
+            return compressor.compress(body) + compressor.flush()
+        return gzip_body
+
+    import zstandard
+    local = threading.local()  # a ZstdCompressor must not be shared between threads
+
+    def zstd_body(body: bytes) -> bytes:
+        compressor = getattr(local, "compressor", None)
+        if compressor is None:
+            compressor = local.compressor = zstandard.ZstdCompressor(level=level)
+        return compressor.compress(body)
+    return zstd_body
 
 
 class RemoteHandler(logging.Handler):
     """
     Thread-safe HTTP handler for sending logs to a remote server.
-    
-    Designed to work with QueueListener for non-blocking async logging.
-    Uses internal lock for thread-safe state management.
+
+    Designed to run behind an AsyncSink worker for non-blocking async logging.
+    Uses internal lock for thread-safe state management. Requests go through
+    a keep-alive session shared by all handlers posting to the same URL.
+
+    With batch_size > 1 records are buffered and POSTed together as one
+    NDJSON (or JSON array) body. A batch is sent as soon as it holds
+    batch_size records or batch_max_bytes of encoded payload, or when the
+    oldest buffered record has waited batch_linger_ms.
+
+    With compression "gzip" or "zstd", request bodies of at least
+    compression_min_bytes are compressed and sent with a Content-Encoding
+    header. Bodies are built and compressed by the thread that sends them
+    (the AsyncSink worker or the batch linger thread), never by the logging
+    call.
+
+    After max_failures consecutive failed requests the circuit breaker
+    (see breaker.py) opens: records are dropped without a request until a
+    probe request after backoff_ms (doubling up to max_backoff_ms, jittered)
+    gets through.
+
+    With spool_dir set, a request that fails is written to a disk spool
+    (see spool.py) together with every request after it, and replayed once
+    the server answers again; nothing is dropped while the breaker is open,
+    and the breaker paces the replay thread's retries instead.
     """
 
-    def __init__(self, url: str, timeout: int = 2, max_failures: int = 3, headers: dict = None):
+    def __init__(
+        self,
+        url: str,
+        timeout: int = 2,
+        max_failures: int = 3,
+        headers: dict = None,
+        batch_size: int = 0,
+        batch_max_bytes: int = 1_000_000,
+        batch_linger_ms: int = 1000,
+        batch_format: str = "ndjson",
+        pool_size: int = 10,
+        compression: str = "none",
+        compression_level: int = 3,
+        compression_min_bytes: int = 1024,
+        spool_dir: str = None,
+        spool_max_bytes: int = 268_435_456,
+        spool_fsync: str = "interval",
+        spool_replay_rate: int = 200,
+        backoff_ms: int = 1000,
+        max_backoff_ms: int = 60_000,
+    ):
         super().__init__()
+        if batch_format not in BATCH_FORMATS:
+            raise ValueError(
+                f"batch_format must be one of {list(BATCH_FORMATS)}, got {batch_format!r}"
+            )
+
         self.url = url
         self.timeout = timeout
         self.max_failures = max_failures
         self.headers = headers or {}
-        
-        # Thread-safe state
-        self._lock = threading.Lock()
-        self._failures = 0
-        self._disabled = False
+        self.batch_size = batch_size
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_linger_ms = batch_linger_ms
+        self.batch_format = batch_format
+        self.pool_size = pool_size
+        self.compression = _available_compression(compression)
+        if self.compression != compression:
+            compression_level = min(compression_level, 9)  # zstd level on the gzip fallback
+        self.compression_level = compression_level
+        self.compression_min_bytes = compression_min_bytes
+        self._compress = _compressor(self.compression, compression_level)
+        self._session = get_session(url, pool_size)
+
+        self.breaker = CircuitBreaker(url, max_failures, backoff_ms, max_backoff_ms)
+
+        # Batch buffer — guarded by _batch_cond
+        self._batch_cond = threading.Condition(threading.Lock())
+        self._batch: list = []
+        self._batch_bytes = 0
+        self._batch_record = None  # first record of the batch, used for handleError
+        self._batch_deadline = 0.0
+        self._in_flight = 0  # records taken out of _batch and not sent yet
+        self._flusher = None
+        self._closed = False
+
+        self._spooler = None
+        if spool_dir:
+            from .spool import Spooler
+            self._spooler = Spooler(
+                spool_dir,
+                "remote-" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:12],
+                self._replay,
+                url,
+                replay_rate=spool_replay_rate,
+                max_bytes=spool_max_bytes,
+                fsync=spool_fsync,
+                breaker=self.breaker,
+            )
+
+    @property
+    def batching(self) -> bool:
+        return self.batch_size > 1
+
+    @property
+    def spooling(self) -> bool:
+        """True if failed requests go to a disk spool instead of being dropped."""
+        return self._spooler is not None
 
     @property
     def disabled(self) -> bool:
-        with self._lock:
-            return self._disabled
+        """True while the circuit breaker is open or half-open."""
+        return self.breaker.state != CLOSED
 
     @disabled.setter
     def disabled(self, value: bool) -> None:
-        with self._lock:
-            self._disabled = value
+        # Manual switch: True holds the breaker open until set back to False
+        if value:
+            self.breaker.trip()
+        else:
+            self.breaker.reset()
+
+    @property
+    def _failures(self) -> int:
+        return self.breaker.failures
+
+    def _build_payload(self, record: logging.LogRecord) -> dict:
+        event = get_event(record)
+        log_entry = self.format(record)
+
+        payload = {
+            "level": event.levelname,
+            "message": log_entry,
+            "service": event.name,
+            "timestamp": event.created,
+            "file": event.pathname,
+            "line": event.lineno,
+            "func": event.func,
+        }
+
+        # Add exception info if present
+        if event.exc_text:
+            payload["exception"] = event.exc_text
+
+        return payload
 
     def emit(self, record: logging.LogRecord) -> None:
         """
         Emit a log record to the remote server.
         Thread-safe and failure-tolerant.
         """
-        if self.disabled:
+        if self.batching:
+            try:
+                self._add_to_batch(record, self._build_payload(record))
+            except Exception:
+                self.handleError(record)
             return
 
+        spooler = self._spooler
+        if spooler is None and not self.breaker.allow():
+            return
+        payload = None
         try:
-            log_entry = self.format(record)
-            
-            payload = {
-                "level": record.levelname,
-                "message": log_entry,
-                "service": record.name,
-                "timestamp": record.created,
-                "file": record.pathname,
-                "line": record.lineno,
-                "func": record.funcName,
-            }
-
-            # Add exception info if present
-            if record.exc_info:
-                payload["exception"] = self.formatter.formatException(record.exc_info)
-
+            payload = self._build_payload(record)
+            # Older requests are still spooled: queue behind them to keep order
+            if spooler is not None and spooler.active and spooler.divert(self._spool_message(payload)):
+                return
             self._send(payload)
-            
-            # Reset failures on success
-            with self._lock:
-                self._failures = 0
+            self.breaker.success()
+        except Exception:
+            if spooler is not None and payload is not None:
+                self.breaker.failure()
+                spooler.spill([self._spool_message(payload)])
+            else:
+                self._handle_failure(record)
+
+    def _add_to_batch(self, record: logging.LogRecord, payload: dict) -> None:
+        """Buffer one payload, sending the batch if a size or byte limit is hit."""
+        line = json.dumps(payload, ensure_ascii=False, default=str)
+        size = len(line.encode("utf-8")) + 1
+
+        ready = None
+        with self._batch_cond:
+            # Adding this record would overflow the byte budget — ship what we have first
+            if self._batch and self._batch_bytes + size > self.batch_max_bytes:
+                ready = self._take_batch()
+
+            if not self._batch:
+                self._batch_record = record
+                self._batch_deadline = time.monotonic() + self.batch_linger_ms / 1000.0
+            self._batch.append(line)
+            self._batch_bytes += size
+
+            if ready is None and (
+                len(self._batch) >= self.batch_size or self._batch_bytes >= self.batch_max_bytes
+            ):
+                ready = self._take_batch()
+
+            self._ensure_flusher()
+            self._batch_cond.notify()
+
+        if ready:
+            self._send_batch(*ready)
+
+    def _take_batch(self):
+        """
+        Detach the current batch. Caller must hold _batch_cond and pass the
+        batch to _send_batch(), which marks it sent.
+        """
+        batch = (self._batch, self._batch_record)
+        self._in_flight += len(self._batch)
+        self._batch = []
+        self._batch_bytes = 0
+        self._batch_record = None
+        return batch
+
+    def _ensure_flusher(self) -> None:
+        """Start the linger thread on first use. Caller must hold _batch_cond."""
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(
+                target=self._linger_loop, name="logifyx-remote-batch", daemon=True
+            )
+            self._flusher.start()
+
+    def _linger_loop(self) -> None:
+        """Send partially-filled batches once their linger time has expired."""
+        while True:
+            with self._batch_cond:
+                while not self._closed and not self._batch:
+                    self._batch_cond.wait()
+                if self._closed:
+                    return
+                remaining = self._batch_deadline - time.monotonic()
+                if remaining > 0:
+                    self._batch_cond.wait(remaining)
+                    continue
+                ready = self._take_batch()
+            self._send_batch(*ready)
+
+    def _encode_batch(self, lines: list) -> bytes:
+        if self.batch_format == "json":
+            body = "[" + ",".join(lines) + "]"
+        else:
+            body = "\n".join(lines) + "\n"
+        return body.encode("utf-8")
+
+    def _send_batch(self, lines: list, record: logging.LogRecord) -> None:
+        if not lines:
+            return
+        try:
+            self._deliver_batch(lines, record)
+        finally:
+            with self._batch_cond:
+                self._in_flight -= len(lines)
+                if not self._in_flight:
+                    self._batch_cond.notify_all()
 
+    def _deliver_batch(self, lines: list, record: logging.LogRecord) -> None:
+        spooler = self._spooler
+        if spooler is None and not self.breaker.allow():
+            return
+        body = self._encode_batch(lines)
+        content_type = _BATCH_CONTENT_TYPES[self.batch_format]
+        if spooler is not None and spooler.active and spooler.divert(_spool_frame(content_type, body)):
+            return
+        try:
+            self._post_body(body, content_type)
+            self.breaker.success()
         except Exception:
-            self._handle_failure(record)
+            if spooler is not None:
+                self.breaker.failure()
+                spooler.spill([_spool_frame(content_type, body)])
+            else:
+                self._handle_failure(record)
+
+    def _spool_message(self, payload: dict) -> bytes:
+        """The request body _send() posts for payload, framed for the spool."""
+        return _spool_frame("application/json", json.dumps(payload, default=str).encode("utf-8"))
+
+    def _replay(self, messages: list) -> int:
+        """Post spooled requests in order; returns how many succeeded."""
+        delivered = 0
+        for message in messages:
+            try:
+                self._post_body(message[1:], _SPOOL_CONTENT_TYPES[message[0]])
+            except Exception:
+                break
+            delivered += 1
+        return delivered
 
     def _send(self, payload: dict) -> None:
         """Send payload to remote server."""
-        response = requests.post(
-            self.url,
-            json=payload,
-            timeout=self.timeout,
-            headers=self.headers
-        )
+        if self._compress is None:
+            self._post(json=payload, headers=self.headers)
+        else:
+            self._post_body(json.dumps(payload, default=str).encode("utf-8"), "application/json")
+
+    def _post_body(self, body: bytes, content_type: str) -> None:
+        """POST an encoded body, compressed if it is large enough."""
+        headers = dict(self.headers)
+        headers["Content-Type"] = content_type
+        if self._compress is not None and len(body) >= self.compression_min_bytes:
+            body = self._compress(body)
+            headers["Content-Encoding"] = self.compression
+        self._post(data=body, headers=headers)
+
+    def _post(self, **kwargs) -> None:
+        response = self._session.post(self.url, timeout=self.timeout, **kwargs)
         response.raise_for_status()
 
     def _handle_failure(self, record: logging.LogRecord) -> None:
-        """Handle sending failure with auto-disable after max failures."""
-        with self._lock:
-            self._failures += 1
-            current_failures = self._failures
-            
-            if current_failures >= self.max_failures:
-                self._disabled = True
-
+        """Count a failed request towards opening the circuit breaker."""
+        self.breaker.failure()
         self.handleError(record)
-        
-        if current_failures >= self.max_failures:
-            # Log warning about disabling (outside lock)
-            import sys
-            print(
-                f"⚠️ Remote logging to {self.url} disabled after {current_failures} failures",
-                file=sys.stderr
-            )
+
+    def _reinit_after_fork(self) -> None:
+        """
+        Reset state in a forked child: new locks and session, no linger thread.
+        The inherited partial batch is left to the parent to send.
+        """
+        self._session = get_session(self.url, self.pool_size)
+        self.breaker._reinit_after_fork()
+        self._batch_cond = threading.Condition(threading.Lock())
+        self._batch = []
+        self._batch_bytes = 0
+        self._batch_record = None
+        self._in_flight = 0
+        self._flusher = None
+        if self._spooler is not None:
+            self._spooler._reinit_after_fork()
+
+    def pending(self) -> int:
+        """Records buffered in the current batch or in a batch still being sent."""
+        return len(self._batch) + self._in_flight
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send any buffered batch immediately, then wait until batches other
+        threads took (e.g. the linger thread) have been sent too.
+
+        Returns False if the timeout expired first.
+        """
+        if not self.batching:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._batch_cond:
+            ready = self._take_batch()
+        self._send_batch(*ready)
+        with self._batch_cond:
+            while self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._batch_cond.wait(remaining)
+        return True
 
     def close(self) -> None:
         """Clean up handler resources."""
+        self.flush()
+        with self._batch_cond:
+            self._closed = True
+            self._batch_cond.notify_all()
+        if self._spooler is not None:
+            self._spooler.close()
         self.acquire()
         try:
             super().close()
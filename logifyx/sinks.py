@@ -0,0 +1,611 @@
+"""
+Per-sink async delivery.
+
+Every async handler (remote HTTP, Kafka) is wrapped in an AsyncSink: its own
+bounded queue drained by its own worker thread(s). A slow or hung sink only
+backs up its own queue — other sinks keep delivering. With async_local the
+file and console handlers get sinks too, drained in batches (one write() per
+batch instead of one per record).
+
+    your code → log.info()
+                   ↓
+           SinkQueueHandler   (prepares the record once, enqueues per sink)
+              ↓          ↓
+        AsyncSink      AsyncSink
+        (remote)       (kafka)
+        queue+workers  queue+worker
+"""
+
+import copy
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+from . import metrics
+from .event import attach_event, get_event
+
+
+_STOP = object()
+# Marks a queued entry that drop_below evicted; workers skip it
+_EVICTED = object()
+
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest", "drop_below")
+
+# Rough per-record cost of a prepared LogRecord (object, __dict__ and its small
+# attributes) on top of the message text. Used for the queue's byte budget.
+_RECORD_OVERHEAD = 600
+
+# Minimum seconds between "records dropped" warnings for one sink
+_DROP_REPORT_INTERVAL = 10.0
+
+
+def _record_size(record) -> int:
+    msg = record.msg
+    size = _RECORD_OVERHEAD + (len(msg) if isinstance(msg, str) else 0)
+    if record.exc_text:
+        size += len(record.exc_text)
+    return size
+
+
+def _accepts_timeout(func) -> bool:
+    import inspect  # only needed when a sink is created
+
+    try:
+        return "timeout" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def sink_name(handler: logging.Handler) -> str:
+    """Human-readable identity of the sink behind a handler."""
+    url = getattr(handler, "url", None)
+    if url:
+        return f"remote:{url}"
+    servers = getattr(handler, "bootstrap_servers", None)
+    if servers:
+        if isinstance(servers, (list, tuple)):
+            servers = ",".join(servers)
+        return f"kafka:{servers}/{getattr(handler, 'topic', '')}"
+    socket_path = getattr(handler, "socket_path", None)
+    if socket_path:
+        return f"collector:{socket_path}"
+    path = getattr(handler, "baseFilename", None)
+    if path:
+        return f"file:{path}"
+    if isinstance(handler, logging.StreamHandler):
+        return "console"
+    return handler.__class__.__name__
+
+
+def write_batch(handler: logging.Handler, records: list) -> None:
+    """
+    Format records and write them to a stream or file handler with one write().
+
+    Level and filters are applied per record, as Handler.handle() would. For
+    ConcurrentRotatingFileHandler the file lock is taken once per batch and the
+    rollover check runs once per batch. Other handlers fall back to handle()
+    per record. Handlers with an emit_batch() method (the collector client)
+    take the whole batch as is.
+    """
+    emit_batch = getattr(handler, "emit_batch", None)
+    if emit_batch is not None:
+        emit_batch(records)
+        return
+
+    locked_file = hasattr(handler, "do_write") and hasattr(handler, "_do_lock")
+    if not locked_file and getattr(handler, "stream", None) is None:
+        for record in records:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return
+
+    messages = []
+    for record in records:
+        if record.levelno < handler.level or not handler.filter(record):
+            continue
+        try:
+            messages.append(handler.format(record))
+        except Exception:
+            handler.handleError(record)
+    if not messages:
+        return
+
+    text = handler.terminator.join(messages)
+    try:
+        if locked_file:
+            _write_locked_file(handler, text, records[0])
+        else:
+            handler.acquire()
+            try:
+                handler.stream.write(text + handler.terminator)
+                handler.flush()
+            finally:
+                handler.release()
+    except Exception:
+        handler.handleError(records[0])
+
+
+def _write_locked_file(handler, text: str, record: logging.LogRecord) -> None:
+    """ConcurrentRotatingFileHandler.emit() for an already formatted batch."""
+    handler._do_lock()
+    try:
+        check_stream = getattr(handler, "_check_stream", None)
+        if check_stream is not None:
+            check_stream()
+        try:
+            if handler.shouldRollover(record):
+                handler.doRollover()
+        except Exception:
+            pass  # same as emit(): keep writing to the current file
+        handler.do_write(text)
+    finally:
+        handler._do_unlock()
+
+
+class AsyncSink:
+    """
+    A bounded queue in front of one handler, drained by `workers` threads.
+
+    Records are handed to the handler with its level respected, the same way
+    QueueListener(respect_handler_level=True) does.
+
+    The queue is bounded both by record count (maxsize) and by an estimate of
+    the memory its records hold (max_bytes). When a new record does not fit,
+    the overflow policy decides what happens:
+
+        block        wait up to block_timeout seconds for room, then drop the new record
+        drop_newest  drop the new record
+        drop_oldest  evict the oldest queued records until the new one fits
+        drop_below   drop new records below drop_level; records at or above it
+                     evict the oldest queued records below drop_level
+
+    Every dropped record is counted in `dropped`, and a warning is printed to
+    stderr at most every 10 seconds per sink while drops continue.
+
+    drop_below keeps the queued records below drop_level in a FIFO of their
+    own, so finding the oldest one is O(1) and a full queue with none to
+    evict refuses the new record at once. The evicted entry is marked rather
+    than deleted from the middle of the queue; workers skip it, and the
+    queue is compacted once such entries outnumber the live ones.
+
+    While the handler's circuit breaker is open (see breaker.py), new records
+    are refused before taking the queue lock and counted in the breaker's
+    `rejected`, not in `dropped`. Handlers that spool to disk never refuse.
+
+    With batch_size > 1 a worker takes up to batch_size queued records at a
+    time and hands them to write_batch() — used for the file and console
+    handlers in async_local mode.
+
+    A record counts as pending from the moment it is queued until the handler
+    has finished with it, so flush() waits for records a worker is still
+    sending — not just for the queue to empty.
+
+    The workers record, under the sink's name, how long each handler call
+    took and how long each record took from the log call to delivery (see
+    metrics.py). Both are measured on the worker, off the caller's path.
+    """
+
+    def __init__(
+        self,
+        handler: logging.Handler,
+        maxsize: int = 100_000,
+        workers: int = 1,
+        name: Optional[str] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        overflow: str = "drop_newest",
+        block_timeout: float = 1.0,
+        drop_level: int = logging.WARNING,
+        batch_size: int = 1,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow must be one of {list(OVERFLOW_POLICIES)}, got {overflow!r}"
+            )
+        self.handler = handler
+        self.name = name or sink_name(handler)
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.drop_level = drop_level
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.dropped = 0
+
+        self._items: deque = deque()  # [record, size] entries, oldest first
+        self._queued = 0  # entries in _items that are not _EVICTED
+        self._below: deque = deque()  # drop_below: queued entries below drop_level, oldest first
+        self._bytes = 0
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._idle = threading.Condition(self._mutex)
+        self._pending = 0  # queued + being handled
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._unreported_drops = 0
+        self._last_drop_report = 0.0
+        self._successor: Optional["AsyncSink"] = None
+        self._flush_takes_timeout = _accepts_timeout(handler.flush)
+        breaker = getattr(handler, "breaker", None)
+        self._breaker = None if getattr(handler, "spooling", False) else breaker
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def depth(self) -> int:
+        """Number of records waiting in this sink's queue."""
+        return self._queued
+
+    def pending(self) -> int:
+        """
+        Records accepted by this sink that are not delivered yet: queued, being
+        handled by a worker, or buffered inside the handler (e.g. a partial
+        remote batch or Kafka records awaiting acks).
+        """
+        handler_pending = getattr(self.handler, "pending", None)
+        return self._pending + (handler_pending() if handler_pending else 0)
+
+    def queued_bytes(self) -> int:
+        """Estimated memory held by the records waiting in this sink's queue."""
+        return self._bytes
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work, name=f"logifyx-sink-{self.name}-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def _fits(self, size: int) -> bool:
+        """Caller must hold _mutex. An empty queue always accepts one record."""
+        queued = self._queued
+        return not queued or (queued < self.maxsize and self._bytes + size <= self.max_bytes)
+
+    def _evict_oldest(self) -> bool:
+        """Drop the oldest queued record. Caller holds _mutex."""
+        items = self._items
+        if not items or items[0][0] is _STOP:
+            return False
+        _, size = items.popleft()
+        self._count_eviction(size)
+        return True
+
+    def _evict_below(self) -> bool:
+        """Drop the oldest queued record below drop_level, in O(1). Caller holds _mutex."""
+        below = self._below
+        if not below:
+            return False
+        entry = below.popleft()
+        entry[0] = _EVICTED
+        self._count_eviction(entry[1])
+        items = self._items
+        if len(items) > 2 * self._queued + 64:
+            self._items = deque(queued for queued in items if queued[0] is not _EVICTED)
+        return True
+
+    def _count_eviction(self, size: int) -> None:
+        """Caller holds _mutex."""
+        self._queued -= 1
+        self._bytes -= size
+        self._unreported_drops += 1
+        self.dropped += 1
+        self._task_done()
+
+    def _make_room(self, record: logging.LogRecord, size: int) -> bool:
+        """Apply the overflow policy. Caller holds _mutex. True if the record now fits."""
+        policy = self.overflow
+        if policy == "block":
+            deadline = time.monotonic() + self.block_timeout
+            while self._successor is None and not self._fits(size):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._not_full.wait(remaining)
+            return True
+        if policy == "drop_oldest":
+            while not self._fits(size) and self._evict_oldest():
+                pass
+            return self._fits(size)
+        if policy == "drop_below":
+            if record.levelno < self.drop_level:
+                return False
+            while not self._fits(size) and self._evict_below():
+                pass
+            return self._fits(size)
+        return False  # drop_newest
+
+    def enqueue(self, record: logging.LogRecord) -> bool:
+        """Queue a record for this sink. Returns False if it was dropped."""
+        breaker = self._breaker
+        if breaker is not None and breaker.shedding():
+            return False
+        size = _record_size(record)
+        report = 0
+        with self._mutex:
+            successor = self._successor
+            if successor is None:
+                accepted = self._fits(size) or self._make_room(record, size)
+                successor = self._successor  # may be handed off while blocked
+            if successor is None:
+                if accepted:
+                    entry = [record, size]
+                    self._items.append(entry)
+                    if self.overflow == "drop_below" and record.levelno < self.drop_level:
+                        self._below.append(entry)
+                    self._queued += 1
+                    self._bytes += size
+                    self._pending += 1
+                    self._not_empty.notify()
+                else:
+                    self._unreported_drops += 1
+                    self.dropped += 1
+                report = self._take_drop_report()
+        if report:
+            self._report_drops(report)
+        if successor is not None:
+            return successor.enqueue(record)
+        return accepted
+
+    def hand_off(self, successor: "AsyncSink") -> None:
+        """
+        Send records enqueued from now on to successor instead. Used on reload
+        when this sink is replaced: a log call that still holds the old handler
+        list reaches the new sink, rather than landing behind stop()'s sentinel.
+        Records already queued here are still delivered by this sink.
+        """
+        with self._mutex:
+            self._successor = successor
+            self._breaker = None  # the successor's handler decides
+            self._not_full.notify_all()
+
+    def _take_drop_report(self) -> int:
+        """Caller holds _mutex. Returns the drop count to report now, or 0."""
+        if not self._unreported_drops:
+            return 0
+        now = time.monotonic()
+        if now - self._last_drop_report < _DROP_REPORT_INTERVAL:
+            return 0
+        count, self._unreported_drops = self._unreported_drops, 0
+        self._last_drop_report = now
+        return count
+
+    def _report_drops(self, count: int) -> None:
+        print(
+            f"⚠️ Logifyx dropped {count} record(s) for {self.name} — queue full "
+            f"(overflow={self.overflow}, {self.dropped} dropped in total)",
+            file=sys.stderr
+        )
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def _next_entry(self) -> list:
+        """Drop evicted entries from the head of the queue and return the next one. Caller holds _mutex."""
+        items = self._items
+        while items[0][0] is _EVICTED:
+            items.popleft()
+        return items[0]
+
+    def _take(self):
+        """Remove the next queued record. Caller holds _mutex and has checked _queued."""
+        entry = self._next_entry()
+        self._items.popleft()
+        below = self._below
+        if below and below[0] is entry:
+            below.popleft()
+        self._queued -= 1
+        self._bytes -= entry[1]
+        return entry[0]
+
+    def _get(self):
+        with self._mutex:
+            while not self._queued:
+                self._not_empty.wait()
+            record = self._take()
+            self._not_full.notify()
+            return record
+
+    def _get_batch(self) -> list:
+        """Take up to batch_size records, waiting for at least one. Stops at a sentinel."""
+        with self._mutex:
+            while not self._queued:
+                self._not_empty.wait()
+            batch = []
+            while self._queued and len(batch) < self.batch_size:
+                if self._next_entry()[0] is _STOP:
+                    if not batch:
+                        batch.append(self._take())
+                    break
+                batch.append(self._take())
+            self._not_full.notify_all()
+            return batch
+
+    def _task_done(self, count: int = 1) -> None:
+        """Caller holds _mutex. Mark accepted records as finished."""
+        self._pending -= count
+        if not self._pending:
+            self._idle.notify_all()
+
+    def _work(self) -> None:
+        if self.batch_size > 1:
+            self._work_batches()
+            return
+        handler = self.handler
+        name = self.name
+        while True:
+            record = self._get()
+            if record is _STOP:
+                return
+            start = time.perf_counter_ns()
+            try:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            except Exception:
+                metrics.count(("errors", name))
+                handler.handleError(record)
+            finally:
+                with self._mutex:
+                    self._task_done()
+            self._record_metrics(name, start, (record,))
+
+    def _work_batches(self) -> None:
+        handler = self.handler
+        name = self.name
+        while True:
+            batch = self._get_batch()
+            if batch[0] is _STOP:
+                return
+            start = time.perf_counter_ns()
+            try:
+                write_batch(handler, batch)
+            except Exception:
+                metrics.count(("errors", name))
+                handler.handleError(batch[0])
+            finally:
+                with self._mutex:
+                    self._task_done(len(batch))
+            self._record_metrics(name, start, batch)
+
+    @staticmethod
+    def _record_metrics(name: str, start: int, records) -> None:
+        """Record one handler call that began at start (perf_counter_ns) and delivered records."""
+        metrics.observe(("emit", name), time.perf_counter_ns() - start)
+        metrics.count(("handled", name), len(records))
+        now = time.time()
+        key = ("lag", name)
+        for record in records:
+            metrics.observe(key, max(0, int((now - record.created) * 1e9)))
+
+    # ------------------------------------------------------------------
+    # Fork
+    # ------------------------------------------------------------------
+
+    def _reinit_after_fork(self) -> None:
+        """
+        Rebuild this sink in a forked child.
+
+        The child inherits the queue but not the worker threads. The queued
+        records are discarded (the parent delivers them), the locks are
+        replaced, the handler resets its own connections if it knows how, and
+        new workers are started if the sink was running.
+        """
+        was_running = bool(self._threads)
+        self._items = deque()
+        self._queued = 0
+        self._below = deque()
+        self._bytes = 0
+        self._pending = 0
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._idle = threading.Condition(self._mutex)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._unreported_drops = 0
+        reinit = getattr(self.handler, "_reinit_after_fork", None)
+        if reinit is not None:
+            reinit()
+        if was_running:
+            self.start()
+
+    # ------------------------------------------------------------------
+    # Flush / stop
+    # ------------------------------------------------------------------
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every accepted record has been handled. False on timeout."""
+        with self._mutex:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the workers to hand every queued record to the handler, then
+        flush the handler so buffered batches are sent (and, for Kafka, acked).
+
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self.wait_idle(timeout):
+            return False
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            if self._flush_takes_timeout:
+                result = self.handler.flush(timeout=remaining)
+            else:
+                result = self.handler.flush()
+        except Exception:
+            return False
+        return result is not False
+
+    def stop(self) -> None:
+        """Deliver everything already queued, then stop the workers and close the handler."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        with self._mutex:
+            # Sentinels bypass the bounds so stop() never blocks or gets dropped
+            for _ in threads:
+                self._items.append([_STOP, 0])
+                self._queued += 1
+            self._not_empty.notify_all()
+        for thread in threads:
+            thread.join()
+        try:
+            self.handler.flush()
+            self.handler.close()
+        except Exception:
+            pass
+
+
+class SinkQueueHandler(logging.Handler):
+    """
+    Queue handler that fans one prepared record out to several AsyncSinks.
+
+    The record is rendered into a LogEvent once (message merged, traceback
+    formatted) and the same prepared copy, carrying that event, is enqueued on
+    every sink. Works like logging.handlers.QueueHandler without importing
+    logging.handlers (and socket, pickle and queue with it).
+    """
+
+    def __init__(self, sinks: List[AsyncSink]):
+        super().__init__()
+        self.sinks = list(sinks)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Copy the record with its text already rendered, so it is safe to hand
+        to other threads. Unlike QueueHandler.prepare() the traceback stays
+        separate (exc_text) instead of being merged into the message, and
+        every sink reads the same cached LogEvent.
+        """
+        event = get_event(record)
+        record = copy.copy(record)
+        record.msg = event.message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = event.exc_text
+        attach_event(record, event)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        for sink in self.sinks:
+            sink.enqueue(record)
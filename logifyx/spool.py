@@ -0,0 +1,507 @@
+"""
+Disk spool for network sinks: an append-only, segment-based write-ahead
+buffer that holds outgoing messages while a remote endpoint or Kafka broker
+is unreachable.
+
+A handler configured with spool_dir sends as usual while its destination
+answers. When a send fails, the failed message and every message after it
+are appended to the spool instead of being dropped or piling up in memory.
+A replay thread retries the oldest spooled message when the handler's
+circuit breaker (see breaker.py) allows a probe, or every RETRY_INTERVAL
+seconds without a breaker. Once one gets through it sends the rest in order, at most
+replay_rate messages per second, and deletes each segment when every
+message in it has been delivered. When the spool is empty the handler sends
+directly again.
+
+Layout of a spool directory:
+
+    lock              flock()ed by the handler that owns the spool
+    cursor            segment and offset of the oldest undelivered message
+    0000000001.seg    segments, oldest first, each a run of frames:
+    0000000002.seg        [length: u32][crc32: u32][message]
+
+Messages are stored exactly as they go on the wire, so replay does not
+depend on the handler's current settings. Delivery is at-least-once: after
+a crash, messages delivered since the cursor was last written are sent
+again. A frame that fails its CRC (a write torn by a crash) ends its segment.
+"""
+
+import errno
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, one process per spool directory
+    fcntl = None
+
+
+FSYNC_POLICIES = ("always", "interval", "never")
+SEGMENT_BYTES = 8 * 1024 * 1024
+FSYNC_INTERVAL = 1.0
+RETRY_INTERVAL = 5.0
+REPLAY_BATCH = 100
+MAX_INSTANCES = 64
+
+_FRAME = struct.Struct(">II")    # length, crc32
+_CURSOR = struct.Struct(">QQ")   # segment, offset
+_SEGMENT_SUFFIX = ".seg"
+
+
+class SpoolLocked(OSError):
+    """The spool directory is owned by another handler or process."""
+
+
+def _lock_directory(directory: Path) -> int:
+    fd = os.open(directory / "lock", os.O_RDWR | os.O_CREAT | getattr(os, "O_CLOEXEC", 0), 0o644)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            raise SpoolLocked(errno.EWOULDBLOCK, "spool directory is in use", str(directory))
+    return fd
+
+
+def _segment_path(directory: Path, seq: int) -> Path:
+    return directory / f"{seq:010d}{_SEGMENT_SUFFIX}"
+
+
+def has_segments(directory: Path) -> bool:
+    """True if directory holds spooled messages left by an earlier process."""
+    try:
+        return any(name.endswith(_SEGMENT_SUFFIX) for name in os.listdir(directory))
+    except OSError:
+        return False
+
+
+class DiskSpool:
+    """
+    Append-only message spool in one directory.
+
+    One writer and one reader, from any threads. read() returns the oldest
+    messages without removing them; commit(n) marks the first n of them as
+    delivered.
+
+    Args:
+        directory:     Spool directory, created if missing. Raises SpoolLocked
+                       if another DiskSpool has it open.
+        max_bytes:     Size cap of all segments. append() drops messages
+                       that do not fit and counts them in `dropped`.
+        segment_bytes: Start a new segment once the current one reaches this size.
+        fsync:         "always" (every append), "interval" (at most once per
+                       FSYNC_INTERVAL) or "never" (leave it to the OS).
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_bytes: int = 268_435_456,
+        segment_bytes: int = SEGMENT_BYTES,
+        fsync: str = "interval",
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {list(FSYNC_POLICIES)}, got {fsync!r}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = _lock_directory(self.directory)
+
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._last_sync = 0.0
+        self._reader = None
+        self._reader_seq = 0
+        self._peeked: List[tuple] = []  # (segment, end offset) of each frame read() returned
+
+        # Valid length of every segment; frames past it were torn by a crash
+        self._ends: Dict[int, int] = {}
+        segments = sorted(
+            int(name[:-len(_SEGMENT_SUFFIX)]) for name in os.listdir(self.directory)
+            if name.endswith(_SEGMENT_SUFFIX) and name[:-len(_SEGMENT_SUFFIX)].isdigit()
+        )
+        self._cursor_fd = os.open(
+            self.directory / "cursor", os.O_RDWR | os.O_CREAT | getattr(os, "O_CLOEXEC", 0), 0o644
+        )
+        raw = os.pread(self._cursor_fd, _CURSOR.size, 0)
+        read_seq, read_off = _CURSOR.unpack(raw) if len(raw) == _CURSOR.size else (0, 0)
+
+        self._count = 0
+        self._segments: List[int] = []
+        for seq in segments:
+            if seq < read_seq:
+                os.unlink(_segment_path(self.directory, seq))  # delivered before a crash
+                continue
+            end, count = self._scan(seq, read_off if seq == read_seq else 0)
+            self._segments.append(seq)
+            self._ends[seq] = end
+            self._count += count
+        if not self._segments or self._segments[0] != read_seq:
+            read_off = 0
+        self._read_seq = self._segments[0] if self._segments else read_seq
+        self._read_off = read_off
+        self._bytes = sum(self._ends.values())
+
+        # Appends always go to a fresh segment, leaving any torn tail behind
+        self._write_seq = max(self._segments[-1] if self._segments else 0, read_seq)
+        self._write_fd: Optional[int] = None
+
+    def _scan(self, seq: int, offset: int):
+        """Valid length of a segment and the number of frames from offset on."""
+        count = 0
+        end = 0
+        with open(_segment_path(self.directory, seq), "rb") as f:
+            while True:
+                header = f.read(_FRAME.size)
+                if len(header) < _FRAME.size:
+                    break
+                length, crc = _FRAME.unpack(header)
+                data = f.read(length)
+                if len(data) < length or zlib.crc32(data) != crc:
+                    break
+                end += _FRAME.size + length
+                if end > offset:
+                    count += 1
+        return end, count
+
+    def __len__(self) -> int:
+        """Messages spooled and not yet committed."""
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """Bytes on disk across all segments."""
+        return self._bytes
+
+    def append(self, message: bytes) -> bool:
+        """Add message to the spool. False if the spool is full (or closed)."""
+        frame = _FRAME.pack(len(message), zlib.crc32(message)) + message
+        with self._lock:
+            if self._closed or self._bytes + len(frame) > self.max_bytes:
+                self.dropped += 1
+                return False
+            if self._write_fd is None or (
+                self._ends[self._write_seq] and self._ends[self._write_seq] + len(frame) > self.segment_bytes
+            ):
+                self._roll()
+            os.write(self._write_fd, frame)
+            self._ends[self._write_seq] += len(frame)
+            self._bytes += len(frame)
+            self._count += 1
+            if self.fsync == "always":
+                os.fsync(self._write_fd)
+            elif self.fsync == "interval":
+                now = time.monotonic()
+                if now - self._last_sync >= FSYNC_INTERVAL:
+                    os.fsync(self._write_fd)
+                    self._last_sync = now
+        return True
+
+    def _roll(self) -> None:
+        """Close the current segment and start the next. Caller holds _lock."""
+        if self._write_fd is not None:
+            if self.fsync != "never":
+                os.fsync(self._write_fd)
+            os.close(self._write_fd)
+        self._write_seq += 1
+        path = _segment_path(self.directory, self._write_seq)
+        self._write_fd = os.open(
+            path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND | getattr(os, "O_CLOEXEC", 0), 0o644
+        )
+        self._segments.append(self._write_seq)
+        self._ends[self._write_seq] = 0
+
+    def read(self, max_messages: int) -> List[bytes]:
+        """Up to max_messages of the oldest messages, starting at the last commit."""
+        messages: List[bytes] = []
+        with self._lock:
+            self._peeked = []
+            if self._closed:
+                return messages
+            offset = self._read_off
+            for seq in [s for s in self._segments if s >= self._read_seq]:
+                end = self._ends[seq]
+                if offset < end:
+                    f = self._open_reader(seq)
+                    f.seek(offset)
+                    while offset < end and len(messages) < max_messages:
+                        length, _ = _FRAME.unpack(f.read(_FRAME.size))
+                        messages.append(f.read(length))
+                        offset += _FRAME.size + length
+                        self._peeked.append((seq, offset))
+                if len(messages) >= max_messages:
+                    break
+                offset = 0
+        return messages
+
+    def _open_reader(self, seq: int):
+        if self._reader is None or self._reader_seq != seq:
+            if self._reader is not None:
+                self._reader.close()
+            self._reader = open(_segment_path(self.directory, seq), "rb")
+            self._reader_seq = seq
+        return self._reader
+
+    def commit(self, count: int) -> None:
+        """Mark the first count messages of the last read() as delivered."""
+        with self._lock:
+            if self._closed or count <= 0:
+                return
+            seq, offset = self._peeked[count - 1]
+            self._peeked = []
+            self._count -= count
+            # Delete segments that are fully delivered, except the one being written
+            done = offset >= self._ends[seq]
+            while self._segments and self._segments[0] != self._write_seq and (
+                self._segments[0] < seq or (self._segments[0] == seq and done)
+            ):
+                self._delete(self._segments.pop(0))
+            if self._segments and self._segments[0] > seq:
+                seq, offset = self._segments[0], 0
+            self._read_seq, self._read_off = seq, offset
+            os.pwrite(self._cursor_fd, _CURSOR.pack(seq, offset), 0)
+
+    def _delete(self, seq: int) -> None:
+        if self._reader is not None and self._reader_seq == seq:
+            self._reader.close()
+            self._reader = None
+        self._bytes -= self._ends.pop(seq)
+        try:
+            os.unlink(_segment_path(self.directory, seq))
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Sync and close the spool. An empty spool leaves no segments behind."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._write_fd is not None:
+                if self.fsync != "never":
+                    os.fsync(self._write_fd)
+                os.close(self._write_fd)
+            if self._reader is not None:
+                self._reader.close()
+            if not self._count:
+                for seq in self._segments:
+                    self._delete(seq)
+                os.pwrite(self._cursor_fd, _CURSOR.pack(0, 0), 0)
+            os.close(self._cursor_fd)
+            os.close(self._lock_fd)
+
+    def _abandon(self) -> None:
+        """Forget an inherited spool in a forked child without touching its files."""
+        with self._lock:
+            self._closed = True
+            for fd in (self._write_fd, self._cursor_fd, self._lock_fd):
+                if fd is not None:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+            if self._reader is not None:
+                self._reader.close()
+
+
+def open_spool(base_dir, name: str, **kwargs) -> DiskSpool:
+    """
+    Open the first spool directory among base_dir/name, base_dir/name.1, ...
+    that no other handler has open. Prefork workers sharing one spool_dir
+    each get their own directory this way.
+    """
+    for i in range(MAX_INSTANCES):
+        try:
+            return DiskSpool(Path(base_dir) / (name if i == 0 else f"{name}.{i}"), **kwargs)
+        except SpoolLocked:
+            continue
+    raise SpoolLocked(errno.EWOULDBLOCK, "every spool directory is in use", str(Path(base_dir) / name))
+
+
+class Spooler:
+    """
+    Spools a handler's messages while its destination fails and replays them.
+
+    The handler calls divert(message) before each send and skips the send if
+    it returns True; it calls spill(messages) with messages whose send failed.
+    send(messages) is called on the replay thread: it delivers messages in
+    order and returns how many were delivered before the first failure.
+
+    Args:
+        base_dir:    The spool_dir setting.
+        name:        Subdirectory for this handler, derived from its destination.
+        send:        Delivery function used for replay.
+        label:       Destination shown in warnings, e.g. the URL.
+        replay_rate: Max messages replayed per second.
+        max_bytes:   Size cap of the spool.
+        fsync:       Spool fsync policy.
+        breaker:     The handler's CircuitBreaker. Replay reports to it and waits
+                     for its backoff after a failure; without one it retries
+                     every retry_interval seconds.
+    """
+
+    def __init__(
+        self,
+        base_dir: str,
+        name: str,
+        send: Callable[[List[bytes]], int],
+        label: str,
+        replay_rate: int = 200,
+        max_bytes: int = 268_435_456,
+        fsync: str = "interval",
+        retry_interval: float = RETRY_INTERVAL,
+        breaker=None,
+    ):
+        self.base_dir = base_dir
+        self.name = name
+        self.label = label
+        self.replay_rate = replay_rate
+        self.retry_interval = retry_interval
+        self.breaker = breaker
+        self.replayed = 0
+        self._send = send
+        self._spool_kwargs = {"max_bytes": max_bytes, "fsync": fsync}
+        self._setup()
+        # Pick up messages an earlier process left behind
+        if has_segments(Path(base_dir) / name):
+            try:
+                self._open()
+            except SpoolLocked:
+                pass
+            else:
+                if len(self.spool):
+                    self.active = True
+                    self._start()
+
+    def _setup(self) -> None:
+        self.spool: Optional[DiskSpool] = None
+        self.active = False
+        self._cond = threading.Condition(threading.Lock())
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warned_full = False
+
+    def _open(self) -> DiskSpool:
+        if self.spool is None:
+            self.spool = open_spool(self.base_dir, self.name, **self._spool_kwargs)
+        return self.spool
+
+    def divert(self, message: bytes) -> bool:
+        """Spool message if older messages are still spooled. True if it was spooled."""
+        if not self.active:
+            return False
+        with self._cond:
+            if not self.active:
+                return False
+            self._append(message)
+        return True
+
+    def spill(self, messages: List[bytes]) -> None:
+        """Spool messages whose send failed and start replaying."""
+        with self._cond:
+            try:
+                self._open()
+            except OSError as e:
+                print(f"⚠️ Logifyx could not open a spool for {self.label}: {e}", file=sys.stderr)
+                return
+            if not self.active:
+                self.active = True
+                print(
+                    f"⚠️ Logging to {self.label} failed, spooling to {self.spool.directory} "
+                    f"until it recovers",
+                    file=sys.stderr
+                )
+            for message in messages:
+                self._append(message)
+            self._start()
+            self._cond.notify()
+
+    def _append(self, message: bytes) -> None:
+        """Caller holds _cond."""
+        if not self.spool.append(message) and not self._warned_full:
+            self._warned_full = True
+            print(
+                f"⚠️ Spool for {self.label} is full ({self.spool.max_bytes} bytes), "
+                f"dropping new messages",
+                file=sys.stderr
+            )
+
+    def _start(self) -> None:
+        """Caller holds _cond."""
+        if self._thread is None and not self._stopping.is_set():
+            self._thread = threading.Thread(target=self._replay, name="logifyx-spool-replay", daemon=True)
+            self._thread.start()
+
+    def _replay(self) -> None:
+        # About ten sends a second, so the rate holds over short intervals too
+        batch = max(1, min(REPLAY_BATCH, self.replay_rate // 10))
+        breaker = self.breaker
+        while not self._stopping.is_set():
+            messages = self.spool.read(batch)
+            if not messages:
+                with self._cond:
+                    if not len(self.spool):
+                        self.active = False
+                        self._warned_full = False
+                        self._cond.wait()
+                continue
+            # Wait out the backoff first: a refused allow() counts as a rejected record
+            if breaker is not None and (breaker.retry_in() > 0 or not breaker.allow()):
+                self._stopping.wait(min(breaker.retry_in(), self.retry_interval))
+                continue
+
+            start = time.monotonic()
+            try:
+                delivered = self._send(messages)
+            except Exception:
+                delivered = 0
+            self.spool.commit(delivered)
+            self.replayed += delivered
+
+            if breaker is not None:
+                if delivered:
+                    breaker.success()
+                if delivered < len(messages):
+                    breaker.failure()
+                    continue
+            elif delivered < len(messages):
+                self._stopping.wait(self.retry_interval)
+                continue
+            # Pace replay so a recovering destination is not flooded
+            delay = len(messages) / self.replay_rate - (time.monotonic() - start)
+            if delay > 0:
+                self._stopping.wait(delay)
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop replaying. The spool stays open for spill()."""
+        self._stopping.set()
+        with self._cond:
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop replaying and close the spool; undelivered messages stay on disk."""
+        self.stop(timeout)
+        with self._cond:
+            if self.spool is not None:
+                self.spool.close()
+
+    def _reinit_after_fork(self) -> None:
+        """
+        The parent keeps its spool and replay thread. A forked child starts
+        without a spool and opens its own on its first failed send.
+        """
+        if self.spool is not None:
+            self.spool._abandon()
+        self._setup()
@@ -0,0 +1,345 @@
+"""
+Reload loggers when their logifyx.yaml or .env changes on disk.
+
+A logger opts in with watch_config=True (or LOG_WATCH_CONFIG=true). One
+watcher thread per process then follows the config files of every such
+logger and calls reload() on the ones whose files changed, so an operator can
+flip LOG_LEVEL to DEBUG in logifyx.yaml on a running process:
+
+    log = Logifyx("api", watch_config=True)
+    # edit logifyx.yaml: LOG_LEVEL: DEBUG  ->  log.level is DEBUG shortly after
+
+On Linux the watcher uses inotify on the directories holding the files, so it
+sleeps in the kernel and uses no CPU until something is written there. Other
+platforms (or a failed inotify setup) fall back to comparing file stats every
+POLL_INTERVAL seconds. Either way changes are debounced: the reload runs once
+the files have been quiet for DEBOUNCE_SECONDS, so an editor's save sequence
+(truncate, write, rename) causes a single reload.
+
+Reloads are incremental (see Logifyx.reload()). A config that fails to load
+leaves the logger as it was and a warning is printed to stderr.
+"""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Set
+
+from .config import config_file_paths
+
+
+DEBOUNCE_SECONDS = 0.3
+POLL_INTERVAL = 1.0
+
+# inotify(7)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class _Inotify:
+    """Minimal inotify binding through ctypes: directory watches, non-blocking reads."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self.fd = fd
+        self._dirs: Dict[int, Path] = {}
+
+    def add(self, directory: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), str(directory))
+        self._dirs[wd] = directory
+
+    def read(self) -> Optional[Set[Path]]:
+        """Paths touched since the last read; None if the kernel queue overflowed."""
+        changed: Set[Path] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    return None
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)  # directory was removed
+                elif name and wd in self._dirs:
+                    changed.add(self._dirs[wd] / os.fsdecode(name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _file_state(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ConfigWatcher:
+    """
+    Follows the config files of a set of loggers and reloads a logger when
+    one of its files changes.
+
+    Args:
+        debounce:      Quiet period after the last change before reloading. Default: 0.3.
+        poll_interval: Stat interval when inotify is unavailable. Default: 1.0.
+        use_inotify:   Set False to force polling. Default: True.
+    """
+
+    def __init__(
+        self,
+        debounce: float = DEBOUNCE_SECONDS,
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.reloads = 0
+        self._loggers: "weakref.WeakKeyDictionary[object, FrozenSet[Path]]" = weakref.WeakKeyDictionary()
+        self._setup()
+
+    def _setup(self) -> None:
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._states: Dict[Path, Optional[tuple]] = {}
+        self._inotify: Optional[_Inotify] = None
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                pass  # no inotify in this libc, or out of instances: poll instead
+        self._wake_r, self._wake_w = os.pipe()
+        for paths in list(self._loggers.values()):
+            self._follow(paths)
+
+    @property
+    def backend(self) -> str:
+        """"inotify" or "poll"."""
+        return "poll" if self._inotify is None else "inotify"
+
+    def add(self, logger) -> None:
+        """Follow logger's config files, starting the watcher thread if needed."""
+        params = {
+            k: v if isinstance(v, str) else None
+            for k, v in logger._init_params.items()
+            if k in ("config_dir", "env_file", "yaml_file")
+        }
+        paths = frozenset(config_file_paths(**params))
+        with self._lock:
+            self._loggers[logger] = paths
+            self._follow(paths)
+            if self._thread is None and not self._stopping.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="logifyx-config-watcher", daemon=True
+                )
+                self._thread.start()
+
+    def remove(self, logger) -> None:
+        """Stop reloading logger. Its directories stay watched until stop()."""
+        with self._lock:
+            self._loggers.pop(logger, None)
+
+    def _follow(self, paths: FrozenSet[Path]) -> None:
+        for path in paths:
+            if path in self._states:
+                continue
+            self._states[path] = _file_state(path)
+            if self._inotify is not None and path.parent not in self._inotify._dirs.values():
+                try:
+                    self._inotify.add(path.parent)
+                except OSError:
+                    pass  # directory does not exist (yet); nothing to watch
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release the inotify instance."""
+        self._stopping.set()
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+        thread = self._thread
+        if thread is threading.current_thread():
+            return  # stopped from a reload; the thread exits after it
+        if thread is not None:
+            thread.join()
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    # ------------------------------------------------------------------
+    # Watcher thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            changed = self._wait(None)
+            if changed is None:
+                return
+            if not changed:
+                continue
+            # Keep collecting until the files have been quiet for `debounce`
+            deadline = time.monotonic() + self.debounce
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                more = self._wait(remaining)
+                if more is None:
+                    return
+                if more:
+                    changed |= more
+                    deadline = time.monotonic() + self.debounce
+            self._apply(changed)
+
+    def _wait(self, timeout: Optional[float]) -> Optional[Set[Path]]:
+        """
+        Block until a followed file may have changed, or timeout (None waits
+        forever). Returns the changed paths, empty on timeout, None on stop().
+        """
+        if self._inotify is None:
+            return self._poll(timeout)
+        readable, _, _ = select.select([self._inotify.fd, self._wake_r], [], [], timeout)
+        if self._stopping.is_set():
+            return None
+        if not readable:
+            return set()
+        touched = self._inotify.read()
+        with self._lock:
+            if touched is None:
+                touched = set(self._states)  # events were lost: check everything
+            return {path for path in touched if self._changed(path)}
+
+    def _poll(self, timeout: Optional[float]) -> Optional[Set[Path]]:
+        remaining = timeout
+        while True:
+            interval = self.poll_interval if remaining is None else min(self.poll_interval, remaining)
+            if self._stopping.wait(interval):
+                return None
+            with self._lock:
+                changed = {path for path in list(self._states) if self._changed(path)}
+            if changed:
+                return changed
+            if remaining is not None:
+                remaining -= interval
+                if remaining <= 0:
+                    return changed
+
+    def _changed(self, path: Path) -> bool:
+        """Caller holds _lock. True if path is followed and its stat changed."""
+        if path not in self._states:
+            return False
+        state = _file_state(path)
+        if state == self._states[path]:
+            return False
+        self._states[path] = state
+        return True
+
+    def _apply(self, changed: Set[Path]) -> None:
+        with self._lock:
+            targets = [log for log, paths in self._loggers.items() if paths & changed]
+        for log in targets:
+            try:
+                log.reload()
+            except Exception as e:
+                print(
+                    f"⚠️ Logifyx could not reload {log.name!r} after a config change, "
+                    f"keeping its current settings: {e}",
+                    file=sys.stderr
+                )
+        self.reloads += 1
+
+    def _reinit_after_fork(self) -> None:
+        """
+        Give a forked child its own inotify instance and thread. The parent's
+        thread does not exist here, and reading the shared inotify descriptor
+        would steal the parent's events.
+        """
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        if self._inotify is not None:
+            self._inotify.close()
+        stopped = self._stopping.is_set()
+        self._setup()
+        if stopped:
+            self._stopping.set()
+        elif len(self._loggers):
+            self._thread = threading.Thread(
+                target=self._run, name="logifyx-config-watcher", daemon=True
+            )
+            self._thread.start()
+
+
+# The process-wide watcher behind watch_config=True
+_watcher: Optional[ConfigWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def watch(logger) -> ConfigWatcher:
+    """Reload logger whenever its config files change."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ConfigWatcher()
+        watcher = _watcher
+    watcher.add(logger)
+    return watcher
+
+
+def unwatch(logger) -> None:
+    """Stop reloading logger on config changes."""
+    watcher = _watcher
+    if watcher is not None:
+        watcher.remove(logger)
+
+
+def stop_watching() -> None:
+    """Stop the process-wide watcher. A later watch() starts a new one."""
+    global _watcher
+    with _watcher_lock:
+        watcher, _watcher = _watcher, None
+    if watcher is not None:
+        watcher.stop()
+
+
+def _reinit_after_fork() -> None:
+    global _watcher_lock
+    _watcher_lock = threading.Lock()
+    if _watcher is not None:
+        _watcher._reinit_after_fork()
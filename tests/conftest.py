@@ -107,3 +107,60 @@ def clean_env():
             os.environ[var] = value
         elif var in os.environ:
             del os.environ[var]
+
+
+class _LogServer:
+    """Records every request body POSTed to a local stand-in HTTP server."""
+
+    def __init__(self):
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        received = self.requests = []
+        self._lock = lock = threading.Lock()
+        self.status = 200
+        self.delay = 0.0  # seconds to wait before taking each request
+
+        server_ref = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                if server_ref.delay:
+                    time.sleep(server_ref.delay)
+                with lock:
+                    received.append((dict(self.headers), body))
+                self.send_response(server_ref.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/logs"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def bodies(self):
+        with self._lock:
+            return [body for _, body in self.requests]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def http_log_server():
+    """
+    Local HTTP server standing in for a remote log collector.
+    """
+    server = _LogServer()
+    yield server
+    server.close()
@@ -0,0 +1,253 @@
+"""
+Tests for the circuit breaker (breaker.py) and its use by the network sinks.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, breaker_stats, flush
+from logifyx.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from logifyx.kafka import KafkaHandler
+from logifyx.remote import RemoteHandler, close_sessions
+from logifyx.sinks import AsyncSink
+from tests.test_kafka import FakeProducer
+
+
+def _record(msg, name="svc"):
+    return logging.LogRecord(name, logging.INFO, "app.py", 10, msg, (), None)
+
+
+class TestCircuitBreaker:
+    """Tests for the breaker's state machine and backoff."""
+
+    def _open(self, backoff_ms=1000, max_backoff_ms=60_000):
+        breaker = CircuitBreaker("test", max_failures=2, backoff_ms=backoff_ms, max_backoff_ms=max_backoff_ms)
+        breaker.failure()
+        breaker.failure()
+        return breaker
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("test", max_failures=3)
+        breaker.failure()
+        breaker.failure()
+        breaker.success()
+        breaker.failure()
+        breaker.failure()
+        assert breaker.state == CLOSED
+
+        breaker.failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.shedding()
+        assert breaker.rejected == 2
+        assert breaker.transitions["closed->open"] == 1
+
+    def test_backoff_is_jittered_within_bounds(self):
+        delays = set()
+        for _ in range(20):
+            breaker = self._open(backoff_ms=1000)
+            delay = breaker.retry_in()
+            assert 0.45 <= delay <= 1.0
+            delays.add(round(delay, 3))
+        assert len(delays) > 1
+
+    def test_one_probe_after_backoff_then_closes(self):
+        breaker = self._open(backoff_ms=20)
+        time.sleep(0.03)
+
+        assert not breaker.shedding()
+        assert breaker.allow()  # the probe
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()
+
+        breaker.success()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+        assert breaker.transitions == {
+            "closed->open": 1, "open->half_open": 1, "half_open->closed": 1, "half_open->open": 0,
+        }
+
+    def test_failed_probe_doubles_backoff_up_to_max(self):
+        breaker = self._open(backoff_ms=20, max_backoff_ms=50)
+        time.sleep(0.03)
+        assert breaker.allow()
+        breaker.failure()
+        assert breaker.state == OPEN
+        assert 0.019 <= breaker.retry_in() <= 0.04
+
+        time.sleep(0.05)
+        assert breaker.allow()
+        breaker.failure()
+        assert 0.024 <= breaker.retry_in() <= 0.05  # capped at max_backoff_ms
+        assert breaker.transitions["half_open->open"] == 2
+
+    def test_failures_in_flight_when_opened_are_ignored(self):
+        breaker = self._open(backoff_ms=1000)
+        retry_at = breaker.retry_at
+
+        breaker.failure(10)
+
+        assert breaker.retry_at == retry_at
+        assert breaker.transitions["closed->open"] == 1
+
+    def test_lost_probe_allows_another(self):
+        breaker = self._open(backoff_ms=20)
+        time.sleep(0.03)
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        time.sleep(0.05)  # the probe never reported back
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+
+    def test_trip_and_reset(self):
+        breaker = CircuitBreaker("test")
+        breaker.trip()
+        assert not breaker.allow()
+        breaker.reset()
+        assert breaker.state == CLOSED and breaker.allow()
+
+
+class TestRemoteBreaker:
+    """Tests for RemoteHandler's breaker against a local server."""
+
+    @pytest.fixture(autouse=True)
+    def sessions(self):
+        yield
+        close_sessions()
+
+    def _handler(self, url, **kwargs):
+        handler = RemoteHandler(url, timeout=2, max_failures=2, backoff_ms=50, **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.handleError = lambda record: None
+        return handler
+
+    def test_recovers_after_outage(self, http_log_server):
+        handler = self._handler(http_log_server.url)
+        http_log_server.status = 503
+        handler.emit(_record("lost 1"))
+        handler.emit(_record("lost 2"))
+        assert handler.disabled
+
+        sent = len(http_log_server.requests)
+        handler.emit(_record("shed"))
+        assert len(http_log_server.requests) == sent  # no request while open
+
+        http_log_server.status = 200
+        time.sleep(0.06)
+        handler.emit(_record("probe"))
+        handler.emit(_record("after"))
+
+        assert not handler.disabled
+        messages = [json.loads(body)["message"] for body in http_log_server.bodies()]
+        assert messages[-2:] == ["probe", "after"]
+        assert "shed" not in messages
+
+    def test_batches_probe_after_backoff(self, http_log_server):
+        handler = self._handler(http_log_server.url, batch_size=100, batch_linger_ms=60_000)
+        http_log_server.status = 500
+        for _ in range(2):
+            handler.emit(_record("lost"))
+            handler.flush()
+        assert handler.disabled
+
+        http_log_server.status = 200
+        time.sleep(0.06)
+        handler.emit(_record("probe"))
+        handler.flush()
+
+        assert not handler.disabled
+        assert b'"probe"' in http_log_server.requests[-1][1]
+        handler.close()
+
+    def test_sink_sheds_while_open(self):
+        handler = self._handler("http://127.0.0.1:9/logs")
+        sink = AsyncSink(handler, name="remote")
+        handler.breaker.trip()
+
+        assert sink.enqueue(_record("shed")) is False
+        assert sink.depth() == 0
+        assert sink.dropped == 0
+        assert handler.breaker.rejected == 1
+
+    def test_spooling_sink_never_sheds(self, temp_log_dir):
+        handler = self._handler("http://127.0.0.1:9/logs", spool_dir=temp_log_dir)
+        sink = AsyncSink(handler, name="remote")
+        handler.breaker.trip()
+
+        assert sink.enqueue(_record("kept")) is True
+        assert sink.depth() == 1
+        handler.close()
+
+
+class TestKafkaBreaker:
+    """Tests for KafkaHandler's breaker with a fake producer."""
+
+    @pytest.fixture
+    def producer(self):
+        FakeProducer.instances = []
+        with patch("logifyx.kafka.AIOKafkaProducer", FakeProducer):
+            yield FakeProducer
+
+    def test_recovers_after_broker_outage(self, producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", max_failures=2, backoff_ms=50)
+        handler.emit(_record("warm-up"))
+        handler.flush()
+        fake = producer.instances[0]
+
+        fake.fail = True
+        for i in range(2):
+            handler.emit(_record(f"lost {i}"))
+        handler.flush()
+        assert handler.breaker.state == OPEN
+
+        sent = len(fake.sent)
+        handler.emit(_record("shed"))
+        handler.flush()
+        assert len(fake.sent) == sent
+
+        fake.fail = False
+        time.sleep(0.06)
+        handler.emit(_record("probe"))
+        handler.flush()
+
+        assert handler.breaker.state == CLOSED
+        assert handler.failures == 0
+        handler.emit(_record("after"))
+        handler.flush()
+        assert len(fake.sent) == sent + 2
+        handler.close()
+
+
+class TestBreakerStats:
+    """Tests for logifyx.breaker_stats()."""
+
+    def test_reports_state_per_sink(self, temp_log_dir, http_log_server):
+        log = Logifyx(
+            name="breaker-stats",
+            log_dir=temp_log_dir,
+            remote_url=http_log_server.url,
+            max_remote_retries=1,
+            breaker_backoff_ms=60_000,
+        )
+        name = f"remote:{http_log_server.url}"
+        assert breaker_stats()[name]["state"] == CLOSED
+
+        http_log_server.status = 500
+        with patch.object(RemoteHandler, "handleError"):
+            log.info("fails")
+            flush(timeout=5)
+            log.info("shed")
+
+        stats = breaker_stats()[name]
+        assert stats["state"] == OPEN
+        assert stats["transitions"]["closed->open"] == 1
+        assert stats["rejected"] >= 1
+        assert 0 < stats["retry_in"] <= 60
@@ -0,0 +1,149 @@
+"""
+Tests for the multi-process collector (collector.py) and its wiring in core.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, LogCollector, CollectorHandler, flush
+from logifyx.collector import MAX_FRAME_BYTES, _HEADER, decode_frames, encode_frame
+from logifyx.event import get_event
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+@pytest.fixture
+def socket_dir():
+    # AF_UNIX paths are limited to ~100 bytes, so keep them short
+    path = tempfile.mkdtemp(prefix="lfx", dir="/tmp")
+    yield path
+    import shutil
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class TestFrames:
+    """Tests for the wire format."""
+
+    def _record(self, msg="user %s logged in", args=("alice",), exc_info=None):
+        return logging.LogRecord("svc", logging.WARNING, "/app/auth.py", 42, msg, args, exc_info, "login")
+
+    def test_round_trip_keeps_event_fields(self):
+        record = self._record()
+        (decoded,) = decode_frames(bytearray(encode_frame([record])))
+
+        assert get_event(decoded) == get_event(record)
+        assert decoded.getMessage() == "user alice logged in"
+        assert decoded.process == record.process
+        assert decoded.threadName == record.threadName
+        assert decoded.module == "auth"
+
+    def test_traceback_travels_as_text(self):
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            record = self._record("failed", (), sys.exc_info())
+        (decoded,) = decode_frames(bytearray(encode_frame([record])))
+
+        assert decoded.exc_info is None
+        assert "ValueError: bad" in decoded.exc_text
+
+    def test_partial_frame_stays_in_buffer(self):
+        frame = encode_frame([self._record()])
+        buffer = bytearray(frame + frame[:10])
+
+        assert len(decode_frames(buffer)) == 1
+        assert bytes(buffer) == frame[:10]
+        buffer += frame[10:]
+        assert len(decode_frames(buffer)) == 1
+        assert not buffer
+
+    def test_oversized_frame_rejected(self):
+        with pytest.raises(ValueError):
+            decode_frames(bytearray(_HEADER.pack(MAX_FRAME_BYTES + 1)))
+
+
+class TestCollector:
+    """End-to-end tests through a real Unix socket."""
+
+    def test_workers_write_through_collector(self, socket_dir, temp_log_dir):
+        path = os.path.join(socket_dir, "c.sock")
+        collector = LogCollector(path, log_dir=temp_log_dir, file="agg.log", color=False).start()
+        try:
+            worker_dir = os.path.join(temp_log_dir, "worker")
+            log = Logifyx("worker", collector_socket=path, log_dir=worker_dir, color=False)
+            log.info("hello %s", "collector")
+            log.info("password=hunter2")
+            assert flush(timeout=5)
+            assert _wait_for(lambda: collector.received == 2)
+        finally:
+            collector.stop()
+
+        with open(os.path.join(temp_log_dir, "agg.log")) as f:
+            content = f.read()
+        assert "hello collector" in content
+        assert "hunter2" not in content
+        assert "worker:" in content
+        # The worker never creates its own log file
+        assert not os.path.exists(worker_dir)
+        assert not os.path.exists(path)
+
+    def test_worker_keeps_console_only(self, socket_dir):
+        log = Logifyx("worker", collector_socket=os.path.join(socket_dir, "c.sock"))
+        sink_handlers = [sink.handler for sink in log._sinks]
+        assert [type(h) for h in sink_handlers] == [CollectorHandler]
+        assert not any(hasattr(h, "baseFilename") for h in log.handlers)
+
+    def test_reconnects_after_collector_restart(self, socket_dir, temp_log_dir):
+        path = os.path.join(socket_dir, "c.sock")
+        handler = CollectorHandler(path, retry_timeout=5.0)
+        record = logging.LogRecord("w", logging.INFO, __file__, 1, "msg %d", (1,), None)
+
+        first = LogCollector(path, log_dir=temp_log_dir, file="a.log").start()
+        handler.emit_batch([record])
+        assert _wait_for(lambda: first.received == 1)
+        first.stop()
+
+        second = LogCollector(path, log_dir=temp_log_dir, file="b.log")
+        threading.Timer(0.2, second.start).start()
+        try:
+            handler.emit_batch([record])  # retries until the new collector listens
+            assert _wait_for(lambda: second.received == 1)
+            assert handler.dropped == 0
+        finally:
+            _wait_for(lambda: second._thread is not None)
+            second.stop()
+            handler.close()
+
+    def test_drops_batch_when_collector_stays_down(self, socket_dir, capsys):
+        handler = CollectorHandler(os.path.join(socket_dir, "none.sock"), retry_timeout=0.1)
+        record = logging.LogRecord("w", logging.INFO, __file__, 1, "msg", (), None)
+
+        handler.emit_batch([record, record])
+
+        assert handler.dropped == 2
+        assert "unreachable" in capsys.readouterr().err
+
+    def test_refuses_socket_of_running_collector(self, socket_dir, temp_log_dir):
+        path = os.path.join(socket_dir, "c.sock")
+        collector = LogCollector(path, log_dir=temp_log_dir).start()
+        try:
+            with pytest.raises(RuntimeError):
+                LogCollector(path, log_dir=temp_log_dir).start()
+        finally:
+            collector.stop()
+
+    def test_collector_socket_type_validated(self):
+        with pytest.raises(TypeError):
+            Logifyx("bad", collector_socket=123)
@@ -4,11 +4,13 @@ Tests for configuration loading (config.py).
 
 import os
 import sys
+import time
+from unittest.mock import patch
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from logifyx.config import load_config
+from logifyx.config import clear_config_cache, load_config
 
 
 @pytest.fixture(autouse=True)
@@ -21,7 +23,17 @@ def clean_env():
         "LOG_DIR", "LOG_FILE", "LOG_MODE", "LOG_JSON", "LOG_MASK",
         "LOG_REMOTE", "LOG_KAFKA_SERVERS", "LOG_KAFKA_TOPIC",
         "LOG_SCHEMA_REGISTRY", "LOG_SCHEMA_COMPATIBILITY",
-        "LOG_REMOTE_TIMEOUT", "LOG_REMOTE_RETRIES"
+        "LOG_REMOTE_TIMEOUT", "LOG_REMOTE_RETRIES",
+        "LOG_REMOTE_BATCH_SIZE", "LOG_REMOTE_BATCH_BYTES",
+        "LOG_REMOTE_BATCH_LINGER_MS", "LOG_REMOTE_BATCH_FORMAT",
+        "LOG_REMOTE_POOL_SIZE", "LOG_QUEUE_SIZE", "LOG_QUEUE_MAX_BYTES",
+        "LOG_QUEUE_OVERFLOW", "LOG_QUEUE_BLOCK_TIMEOUT_MS", "LOG_QUEUE_DROP_LEVEL",
+        "LOG_ASYNC_LOCAL", "LOG_COLLECTOR_SOCKET", "LOG_WATCH_CONFIG",
+        "LOG_KAFKA_BATCH_RECORDS", "LOG_KAFKA_BATCH_CODEC", "LOG_KAFKA_SCHEMA_VERSION",
+        "LOG_SPOOL_DIR", "LOG_SPOOL_MAX_BYTES", "LOG_SPOOL_FSYNC", "LOG_SPOOL_REPLAY_RATE",
+        "LOG_BREAKER_BACKOFF_MS", "LOG_BREAKER_MAX_BACKOFF_MS",
+        "LOG_REMOTE_COMPRESSION", "LOG_REMOTE_COMPRESSION_LEVEL", "LOG_REMOTE_COMPRESSION_MIN_BYTES",
+        "LOG_METRICS"
     ]
     
     for var in env_vars:
@@ -108,6 +120,12 @@ class TestLoadConfigDefaults:
         assert config["max_remote_retries"] == 3
 
 
+    def test_default_remote_pool_size(self):
+        """Test default remote_pool_size is 10."""
+        config = load_config()
+        assert config["remote_pool_size"] == 10
+
+
 class TestLoadConfigPaths:
     """Tests for explicit config file path loading."""
 
@@ -270,5 +288,225 @@ class TestConfigStructure:
         assert isinstance(config["max_remote_retries"], int)
 
 
+class TestRemoteBatchConfig:
+    """Tests for LOG_REMOTE_BATCH_* settings."""
+
+    def test_batch_defaults(self):
+        config = load_config()
+        assert config["remote_batch_size"] == 0
+        assert config["remote_batch_bytes"] == 1_000_000
+        assert config["remote_batch_linger_ms"] == 1000
+        assert config["remote_batch_format"] == "ndjson"
+
+    def test_batch_env_override(self):
+        os.environ["LOG_REMOTE_BATCH_SIZE"] = "500"
+        os.environ["LOG_REMOTE_BATCH_BYTES"] = "65536"
+        os.environ["LOG_REMOTE_BATCH_LINGER_MS"] = "250"
+        os.environ["LOG_REMOTE_BATCH_FORMAT"] = "JSON"
+        config = load_config()
+        assert config["remote_batch_size"] == 500
+        assert config["remote_batch_bytes"] == 65536
+        assert config["remote_batch_linger_ms"] == 250
+        assert config["remote_batch_format"] == "json"
+
+    def test_batch_yaml(self, tmp_path):
+        (tmp_path / "logifyx.yaml").write_text(
+            "LOG_REMOTE_BATCH_SIZE: 200\nLOG_REMOTE_BATCH_FORMAT: ndjson\n",
+            encoding="utf-8",
+        )
+        config = load_config(config_dir=str(tmp_path))
+        assert config["remote_batch_size"] == 200
+        assert config["remote_batch_format"] == "ndjson"
+
+    def test_invalid_batch_format(self):
+        os.environ["LOG_REMOTE_BATCH_FORMAT"] = "xml"
+        with pytest.raises(ValueError):
+            load_config()
+
+    def test_invalid_linger(self):
+        os.environ["LOG_REMOTE_BATCH_LINGER_MS"] = "0"
+        with pytest.raises(ValueError):
+            load_config()
+
+
+
+class TestQueueConfig:
+    """Tests for LOG_QUEUE_* settings."""
+
+    def test_queue_defaults(self):
+        config = load_config()
+        assert config["queue_size"] == 100_000
+        assert config["queue_max_bytes"] == 67_108_864
+        assert config["queue_overflow"] == "drop_newest"
+        assert config["queue_block_timeout_ms"] == 1000
+        assert config["queue_drop_level"] == "WARNING"
+
+    def test_queue_env_override(self, monkeypatch):
+        monkeypatch.setenv("LOG_QUEUE_MAX_BYTES", "1048576")
+        monkeypatch.setenv("LOG_QUEUE_OVERFLOW", "DROP_OLDEST")
+        monkeypatch.setenv("LOG_QUEUE_DROP_LEVEL", "error")
+        config = load_config()
+        assert config["queue_max_bytes"] == 1_048_576
+        assert config["queue_overflow"] == "drop_oldest"
+        assert config["queue_drop_level"] == "ERROR"
+
+    def test_async_local_env(self, monkeypatch):
+        assert load_config()["async_local"] is False
+        monkeypatch.setenv("LOG_ASYNC_LOCAL", "true")
+        assert load_config()["async_local"] is True
+
+    def test_collector_socket_env(self, monkeypatch):
+        assert load_config()["collector_socket"] is None
+        monkeypatch.setenv("LOG_COLLECTOR_SOCKET", "/tmp/logifyx.sock")
+        assert load_config()["collector_socket"] == "/tmp/logifyx.sock"
+
+    def test_kafka_batch_env(self, monkeypatch):
+        config = load_config()
+        assert config["kafka_batch_records"] == 0
+        assert config["kafka_batch_codec"] == "deflate"
+        monkeypatch.setenv("LOG_KAFKA_BATCH_RECORDS", "500")
+        monkeypatch.setenv("LOG_KAFKA_BATCH_CODEC", "ZSTD")
+        config = load_config()
+        assert config["kafka_batch_records"] == 500
+        assert config["kafka_batch_codec"] == "zstd"
+
+    def test_kafka_schema_version_env(self, monkeypatch):
+        assert load_config()["kafka_schema_version"] == 1
+        monkeypatch.setenv("LOG_KAFKA_SCHEMA_VERSION", "2")
+        assert load_config()["kafka_schema_version"] == 2
+        monkeypatch.setenv("LOG_KAFKA_SCHEMA_VERSION", "3")
+        with pytest.raises(ValueError):
+            load_config()
+
+    def test_spool_env(self, monkeypatch):
+        config = load_config()
+        assert config["spool_dir"] is None
+        assert config["spool_fsync"] == "interval"
+        monkeypatch.setenv("LOG_SPOOL_DIR", "/var/spool/app")
+        monkeypatch.setenv("LOG_SPOOL_MAX_BYTES", "1048576")
+        monkeypatch.setenv("LOG_SPOOL_FSYNC", "ALWAYS")
+        monkeypatch.setenv("LOG_SPOOL_REPLAY_RATE", "50")
+        config = load_config()
+        assert config["spool_dir"] == "/var/spool/app"
+        assert config["spool_max_bytes"] == 1048576
+        assert config["spool_fsync"] == "always"
+        assert config["spool_replay_rate"] == 50
+        monkeypatch.setenv("LOG_SPOOL_FSYNC", "sometimes")
+        with pytest.raises(ValueError):
+            load_config()
+
+    def test_remote_compression_env(self, monkeypatch):
+        config = load_config()
+        assert config["remote_compression"] == "none"
+        assert config["remote_compression_level"] == 3
+        assert config["remote_compression_min_bytes"] == 1024
+        monkeypatch.setenv("LOG_REMOTE_COMPRESSION", "GZIP")
+        monkeypatch.setenv("LOG_REMOTE_COMPRESSION_LEVEL", "6")
+        monkeypatch.setenv("LOG_REMOTE_COMPRESSION_MIN_BYTES", "0")
+        config = load_config()
+        assert config["remote_compression"] == "gzip"
+        assert config["remote_compression_level"] == 6
+        assert config["remote_compression_min_bytes"] == 0
+        monkeypatch.setenv("LOG_REMOTE_COMPRESSION", "brotli")
+        with pytest.raises(ValueError):
+            load_config()
+
+    def test_breaker_backoff_env(self, monkeypatch):
+        config = load_config()
+        assert config["breaker_backoff_ms"] == 1000
+        assert config["breaker_max_backoff_ms"] == 60_000
+        monkeypatch.setenv("LOG_BREAKER_BACKOFF_MS", "250")
+        monkeypatch.setenv("LOG_BREAKER_MAX_BACKOFF_MS", "30000")
+        config = load_config()
+        assert config["breaker_backoff_ms"] == 250
+        assert config["breaker_max_backoff_ms"] == 30_000
+
+    def test_invalid_kafka_batch_codec(self, monkeypatch):
+        monkeypatch.setenv("LOG_KAFKA_BATCH_CODEC", "lzma")
+        with pytest.raises(ValueError):
+            load_config()
+
+    def test_watch_config_env(self, monkeypatch):
+        assert load_config()["watch_config"] is False
+        monkeypatch.setenv("LOG_WATCH_CONFIG", "true")
+        assert load_config()["watch_config"] is True
+
+    def test_metrics_env(self, monkeypatch):
+        assert load_config()["metrics"] is True
+        monkeypatch.setenv("LOG_METRICS", "false")
+        assert load_config()["metrics"] is False
+
+    def test_invalid_overflow(self, monkeypatch):
+        monkeypatch.setenv("LOG_QUEUE_OVERFLOW", "explode")
+        with pytest.raises(ValueError):
+            load_config()
+
+
+class TestConfigCache:
+    """Tests for the process-wide load_config() cache."""
+
+    @pytest.fixture
+    def config_dir(self, tmp_path):
+        clear_config_cache()
+        yield tmp_path
+        clear_config_cache()
+
+    def _write(self, path, text, age=60):
+        """Write a file and backdate it past the racy window, so it can be cached."""
+        path.write_text(text, encoding="utf-8")
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    def test_files_parsed_once(self, config_dir):
+        import yaml
+
+        self._write(config_dir / "logifyx.yaml", "LOG_LEVEL: DEBUG\n")
+        with patch.object(yaml, "safe_load", wraps=yaml.safe_load) as safe_load:
+            first = load_config(config_dir=str(config_dir))
+            second = load_config(config_dir=str(config_dir))
+        assert safe_load.call_count == 1
+        assert first == second
+        assert first["level"] == "DEBUG"
+
+    def test_returns_independent_copies(self, config_dir):
+        first = load_config(config_dir=str(config_dir))
+        first["level"] = "ERROR"
+        first["remote_headers"]["X-Changed"] = "1"
+        second = load_config(config_dir=str(config_dir))
+        assert second["level"] == "INFO"
+        assert "X-Changed" not in second["remote_headers"]
+
+    def test_edited_file_is_reread(self, config_dir):
+        path = config_dir / "logifyx.yaml"
+        self._write(path, "LOG_LEVEL: DEBUG\n", age=60)
+        assert load_config(config_dir=str(config_dir))["level"] == "DEBUG"
+        self._write(path, "LOG_LEVEL: ERROR\n", age=30)  # same size, new mtime
+        assert load_config(config_dir=str(config_dir))["level"] == "ERROR"
+
+    def test_env_change_is_picked_up(self, config_dir, monkeypatch):
+        assert load_config(config_dir=str(config_dir))["level"] == "INFO"
+        monkeypatch.setenv("LOG_LEVEL", "WARNING")
+        assert load_config(config_dir=str(config_dir))["level"] == "WARNING"
+
+    def test_recently_modified_file_not_cached(self, config_dir):
+        import yaml
+
+        (config_dir / "logifyx.yaml").write_text("LOG_LEVEL: DEBUG\n", encoding="utf-8")
+        with patch.object(yaml, "safe_load", wraps=yaml.safe_load) as safe_load:
+            load_config(config_dir=str(config_dir))
+            load_config(config_dir=str(config_dir))
+        assert safe_load.call_count == 2
+
+    def test_clear_config_cache(self, config_dir):
+        import yaml
+
+        self._write(config_dir / "logifyx.yaml", "LOG_LEVEL: DEBUG\n")
+        with patch.object(yaml, "safe_load", wraps=yaml.safe_load) as safe_load:
+            load_config(config_dir=str(config_dir))
+            clear_config_cache()
+            load_config(config_dir=str(config_dir))
+        assert safe_load.call_count == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,153 @@
+"""
+Tests for render-once log events (event.py) and the encoders that read them.
+"""
+
+import json
+import logging
+import os
+import sys
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logifyx.event as event_module
+from logifyx.event import LogEvent, get_event
+from logifyx.filters import MaskFilter
+from logifyx.formatter import get_formatter
+from logifyx.kafka import KafkaHandler
+from logifyx.remote import RemoteHandler
+from logifyx.sinks import SinkQueueHandler
+
+
+class CountingRecord(logging.LogRecord):
+    """LogRecord that counts getMessage() calls."""
+
+    renders = 0
+
+    def getMessage(self):
+        CountingRecord.renders += 1
+        return super().getMessage()
+
+
+def _record(msg="user %s logged in", args=("alice",), exc_info=None):
+    CountingRecord.renders = 0
+    return CountingRecord("svc", logging.ERROR, "/app/main.py", 12, msg, args, exc_info, func="login")
+
+
+def _exc_info():
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        return sys.exc_info()
+
+
+class TestLogEvent:
+    """Tests for building and caching LogEvent."""
+
+    def test_event_fields(self):
+        event = get_event(_record())
+
+        assert isinstance(event, LogEvent)
+        assert event.message == "user alice logged in"
+        assert (event.name, event.levelname, event.lineno, event.func) == ("svc", "ERROR", 12, "login")
+        assert event.exc_text is None
+
+    def test_cached_on_record(self):
+        record = _record()
+
+        assert get_event(record) is get_event(record)
+        assert CountingRecord.renders == 1
+
+    def test_rewritten_message_renders_fresh_event(self):
+        record = _record()
+        first = get_event(record)
+
+        record.msg, record.args = "changed", None
+
+        assert get_event(record) is not first
+        assert get_event(record).message == "changed"
+
+    def test_event_is_immutable(self):
+        event = get_event(_record())
+        with pytest.raises(AttributeError):
+            event.message = "x"
+
+    def test_masked_event_holds_only_masked_text(self):
+        record = _record("login password=%s", ("hunter2",))
+        MaskFilter().filter(record)
+
+        event = get_event(record)
+        assert event.masked is True
+        assert "hunter2" not in event.message
+
+
+class TestRenderOnce:
+    """Every encoder reads the same event."""
+
+    def _encode_everywhere(self, record):
+        console = get_formatter(json_mode=False, color=True)
+        plain = get_formatter(json_mode=False, color=False)
+        as_json = get_formatter(json_mode=True)
+        remote = RemoteHandler(url="http://example.com/logs")
+        remote.setFormatter(get_formatter(json_mode=False, color=False))
+        kafka = KafkaHandler(bootstrap_servers="localhost:9092")
+
+        return (
+            console.format(record),
+            plain.format(record),
+            as_json.format(record),
+            remote._build_payload(record),
+            kafka._build_record(record),
+        )
+
+    def test_message_rendered_once_for_all_sinks(self):
+        record = _record()
+        _, plain, as_json, payload, kafka_record = self._encode_everywhere(record)
+
+        assert CountingRecord.renders == 1
+        assert plain.endswith("user alice logged in")
+        assert json.loads(as_json)["message"] == "user alice logged in"
+        assert kafka_record["message"] == "user alice logged in"
+        assert payload["message"] == plain
+
+    def test_traceback_formatted_once_for_all_sinks(self):
+        record = _record(exc_info=_exc_info())
+        formatter = event_module._exception_formatter
+        with patch.object(formatter, "formatException", wraps=formatter.formatException) as fmt:
+            _, plain, as_json, payload, kafka_record = self._encode_everywhere(record)
+
+        assert fmt.call_count == 1
+        assert "ValueError: bad input" in plain
+        assert "ValueError: bad input" in json.loads(as_json)["exception"]
+        assert payload["exception"] == kafka_record["exception"] == get_event(record).exc_text
+
+
+class TestQueuePrepare:
+    """Tests for SinkQueueHandler.prepare()."""
+
+    def test_prepared_copy_shares_event(self):
+        record = _record(exc_info=_exc_info())
+        prepared = SinkQueueHandler([]).prepare(record)
+
+        assert prepared is not record
+        assert get_event(prepared) is get_event(record)
+        assert prepared.exc_info is None
+        assert prepared.getMessage() == "user alice logged in"  # traceback not merged in
+        assert "ValueError" in prepared.exc_text
+
+    def test_queued_remote_payload_keeps_exception(self):
+        prepared = SinkQueueHandler([]).prepare(_record(exc_info=_exc_info()))
+        remote = RemoteHandler(url="http://example.com/logs")
+        formatter = get_formatter(json_mode=False, color=False)
+        formatter.include_exception = False
+        remote.setFormatter(formatter)
+
+        payload = remote._build_payload(prepared)
+
+        assert "ValueError: bad input" in payload["exception"]
+        assert "Traceback" not in payload["message"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
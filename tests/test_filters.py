@@ -4,8 +4,10 @@ Tests for sensitive data masking (MaskFilter).
 
 import logging
 import os
+import re
 import sys
 import pytest
+from unittest.mock import MagicMock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -142,5 +144,82 @@ class TestMaskPatterns:
         # The pattern (?i)\b\w*api_key\w*\b should match
 
 
+
+def _mask_per_pattern(msg):
+    """The original MaskFilter: one re.sub() per SENSITIVE pattern, in order."""
+    for pattern in MaskFilter.SENSITIVE:
+        msg = re.sub(pattern, "****", msg)
+    return msg
+
+
+class TestMaskEngine:
+    """Tests for the single-pass masking engine."""
+
+    def test_key_value_patterns_compiled_into_one_regex(self, mask_filter):
+        key_value = [p for p in mask_filter.SENSITIVE if "=" in p]
+        assert mask_filter._PATTERN.pattern.count("|") == len(key_value) - 1
+
+    @pytest.mark.parametrize("msg, expected", [
+        ("stripe_api_key=sk_live_123", "stripe_****"),
+        ("my_api_key=xyz other", "my_**** other"),
+        ("deploy aws_access_key=AKIA123 with github_token=ghp_x", "deploy aws_**** with github_****"),
+        ("api_key=abc and my_api_key_name", "**** and ****"),
+    ])
+    def test_prefixed_api_key_matches_per_pattern_masking(self, mask_filter, log_record, msg, expected):
+        record = log_record(msg)
+        mask_filter.filter(record)
+
+        assert record.msg == expected == _mask_per_pattern(msg)
+
+    def test_api_key_word_is_case_insensitive(self, mask_filter, log_record):
+        record = log_record("loaded MY_API_KEY_VALUE from vault")
+        mask_filter.filter(record)
+
+        assert record.msg == "loaded **** from vault"
+
+    def test_access_token_fully_masked(self, mask_filter, log_record):
+        record = log_record("OAuth access_token=ya29.a0AVA9y1uZ")
+        mask_filter.filter(record)
+
+        assert record.msg == "OAuth ****"
+
+    def test_percent_args_are_merged_before_masking(self, mask_filter, log_record):
+        record = log_record("login %s")
+        record.args = ("password=hunter2",)
+        mask_filter.filter(record)
+
+        assert record.msg == "login ****"
+        assert record.args is None
+
+    def test_record_masked_only_once(self, mask_filter, log_record):
+        record = log_record("token=abc")
+        mask_filter.filter(record)
+        record.msg = "token=changed-after-masking"
+
+        # A second pass (e.g. another handler) must not re-run the regex
+        mask_filter.filter(record)
+        assert record.msg == "token=changed-after-masking"
+
+    def test_shared_filter_runs_once_across_handlers(self, log_record):
+        seen = []
+
+        class Capture(logging.Handler):
+            def emit(self, record):
+                seen.append(record.getMessage())
+
+        logger = logging.Logger("mask-once")
+        shared = MaskFilter()
+        shared._PATTERN = MagicMock(wraps=MaskFilter._PATTERN)
+        for _ in range(3):
+            handler = Capture()
+            handler.addFilter(shared)
+            logger.addHandler(handler)
+
+        logger.warning("password=secret")
+
+        assert seen == ["****"] * 3
+        assert shared._PATTERN.sub.call_count == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
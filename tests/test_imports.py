@@ -0,0 +1,62 @@
+"""
+Tests that optional subsystems are imported only when a sink needs them.
+
+Each check runs in a fresh interpreter, since this test process has already
+imported everything.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("requests", "aiokafka", "fastavro", "asyncio", "yaml", "dotenv", "socket")
+
+
+def _loaded_after(code, cwd):
+    """Run code in a new interpreter and return which HEAVY modules it imported."""
+    probe = code + textwrap.dedent(f"""
+        import sys
+        print(",".join(m for m in {HEAVY!r} if m in sys.modules))
+    """)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=cwd, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return set(filter(None, result.stdout.strip().split(",")))
+
+
+class TestLazyImports:
+    """Tests for import-time cost."""
+
+    def test_import_loads_no_optional_dependency(self, temp_log_dir):
+        assert _loaded_after("import logifyx\n", temp_log_dir) == set()
+
+    def test_console_and_file_logger_skips_network_stack(self, temp_log_dir):
+        code = textwrap.dedent("""
+            from logifyx import Logifyx
+            Logifyx("lazy", log_dir="logs").info("hello")
+        """)
+        # socket comes in with the file handler (logging.handlers)
+        assert _loaded_after(code, temp_log_dir) <= {"socket"}
+
+    def test_remote_sink_imports_requests(self, temp_log_dir):
+        code = textwrap.dedent("""
+            from logifyx import Logifyx, shutdown
+            Logifyx("lazy", log_dir="logs", remote_url="http://127.0.0.1:9/logs")
+            shutdown()
+        """)
+        assert "requests" in _loaded_after(code, temp_log_dir)
+
+    def test_yaml_loaded_only_with_config_file(self, temp_log_dir):
+        with open(os.path.join(temp_log_dir, "logifyx.yaml"), "w") as f:
+            f.write("LOG_LEVEL: DEBUG\n")
+        code = "from logifyx import Logifyx\nLogifyx('lazy', log_dir='logs')\n"
+        assert "yaml" in _loaded_after(code, temp_log_dir)
+
+    def test_collector_loaded_on_attribute_access(self, temp_log_dir):
+        code = "import logifyx\nlogifyx.LogCollector\n"
+        assert "socket" in _loaded_after(code, temp_log_dir)
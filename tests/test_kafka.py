@@ -0,0 +1,357 @@
+"""
+Tests for KafkaHandler (background event loop + batched producer).
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.kafka import (
+    BATCH_HEADER, LOG_SCHEMA_V1, LOG_SCHEMA_V2, OCF_MAGIC, SCHEMA_HEADER_KEY,
+    AvroSerializer, KafkaHandler, decode_message, normalize_record,
+)
+
+
+class FakeProducer:
+    """Stands in for AIOKafkaProducer: acks every send() on the next loop tick."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.sent = []
+        self.headers = []
+        self.loops = set()
+        self.started = False
+        self.stopped = False
+        self.fail = False
+        FakeProducer.instances.append(self)
+
+    async def start(self):
+        self.started = True
+
+    async def send(self, topic, value=None, key=None, headers=None):
+        loop = asyncio.get_running_loop()
+        self.loops.add(loop)
+        self.sent.append((topic, value, key))
+        self.headers.append(headers)
+        future = loop.create_future()
+        if self.fail:
+            loop.call_soon(future.set_exception, RuntimeError("broker down"))
+        else:
+            loop.call_soon(future.set_result, None)
+        return future
+
+    async def flush(self):
+        pass
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def fake_producer():
+    FakeProducer.instances = []
+    with patch("logifyx.kafka.AIOKafkaProducer", FakeProducer):
+        yield FakeProducer
+
+
+def _record(msg="hello", name="svc"):
+    return logging.LogRecord(name, logging.INFO, "app.py", 10, msg, (), None)
+
+
+def _payload(msg="hello", schema_version=1, record=None):
+    """The Avro payload KafkaHandler builds for a record."""
+    handler = KafkaHandler(bootstrap_servers="localhost:9092", schema_version=schema_version)
+    return handler._build_record(record or _record(msg))
+
+
+class TestKafkaHandlerLoop:
+    """Tests for the dedicated producer loop thread."""
+
+    def test_single_loop_for_all_records(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", topic="t")
+
+        for i in range(50):
+            handler.emit(_record(f"msg {i}"))
+        assert handler.flush() is True
+        assert handler.pending() == 0
+
+        producer = fake_producer.instances[0]
+        assert len(fake_producer.instances) == 1
+        assert len(producer.sent) == 50
+        assert len(producer.loops) == 1
+        handler.close()
+
+    def test_records_keep_order_and_key(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", topic="t")
+
+        for i in range(20):
+            handler.emit(_record(f"msg {i}", name="orders"))
+        handler.flush()
+
+        sent = fake_producer.instances[0].sent
+        assert all(topic == "t" and key == b"orders" for topic, _, key in sent)
+        assert [b"msg %d" % i in value for i, (_, value, _) in enumerate(sent)] == [True] * 20
+        handler.close()
+
+    def test_emit_from_many_threads(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", topic="t")
+
+        def worker():
+            for _ in range(100):
+                handler.emit(_record())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        handler.flush()
+
+        assert len(fake_producer.instances[0].sent) == 400
+        handler.close()
+
+    def test_batching_options_passed_to_producer(self, fake_producer):
+        handler = KafkaHandler(
+            bootstrap_servers="localhost:9092", linger_ms=20, max_batch_size=131072
+        )
+        handler.emit(_record())
+        handler.flush()
+
+        kwargs = fake_producer.instances[0].kwargs
+        assert kwargs["linger_ms"] == 20
+        assert kwargs["max_batch_size"] == 131072
+        handler.close()
+
+    def test_failed_acks_trip_circuit_breaker(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", max_failures=3)
+        handler.emit(_record())
+        handler.flush()
+        fake_producer.instances[0].fail = True
+
+        for _ in range(3):
+            handler.emit(_record())
+        handler.flush()
+
+        assert handler.disabled is True
+        handler.close()
+
+    def test_close_stops_producer_and_thread(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092")
+        handler.emit(_record())
+        thread = handler._thread
+
+        handler.close()
+
+        assert fake_producer.instances[0].stopped is True
+        assert not thread.is_alive()
+
+    def test_emit_inside_running_event_loop(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092")
+
+        async def app():
+            handler.emit(_record())
+            await handler.flush_async()
+
+        asyncio.run(app())
+
+        assert len(fake_producer.instances[0].sent) == 1
+        handler.close()
+
+
+class TestBatchMode:
+    """Tests for Avro Object Container File batches (batch_records > 1)."""
+
+    def _decoded(self, producer):
+        return [record for _, value, _ in producer.sent for record in decode_message(value)]
+
+    def test_records_packed_into_ocf_messages(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", topic="t", batch_records=10)
+
+        for i in range(25):
+            handler.emit(_record(f"msg {i}", name="orders"))
+        assert handler.flush() is True
+        assert handler.pending() == 0
+
+        producer = fake_producer.instances[0]
+        assert 3 <= len(producer.sent) < 25
+        assert all(value.startswith(OCF_MAGIC) and key == b"orders" for _, value, key in producer.sent)
+        assert all(headers == [BATCH_HEADER] for headers in producer.headers)
+        assert [r["message"] for r in self._decoded(producer)] == [f"msg {i}" for i in range(25)]
+        handler.close()
+
+    def test_batches_split_by_key(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", batch_records=100, linger_ms=50)
+
+        for i in range(10):
+            handler.emit(_record(f"msg {i}", name="a" if i % 2 else "b"))
+        handler.flush()
+
+        producer = fake_producer.instances[0]
+        for _, value, key in producer.sent:
+            assert {r["service"] for r in decode_message(value)} == {key.decode()}
+        assert len(self._decoded(producer)) == 10
+        handler.close()
+
+    def test_deflate_smaller_than_null_codec(self):
+        records = [_payload(f"order {i} shipped") for i in range(100)]
+
+        deflate = AvroSerializer(codec="deflate").serialize_batch(records)
+        null = AvroSerializer(codec="null").serialize_batch(records)
+
+        assert len(deflate) < len(null) / 2
+        assert decode_message(deflate) == decode_message(null)
+
+    def test_failed_batch_counts_once(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", batch_records=50, max_failures=3)
+        handler.emit(_record())
+        handler.flush()
+        fake_producer.instances[0].fail = True
+
+        for _ in range(20):
+            handler.emit(_record())
+        handler.flush()
+
+        assert handler.failures < 3
+        assert handler.disabled is False
+        handler.close()
+
+    def test_invalid_codec(self):
+        with pytest.raises(ValueError):
+            KafkaHandler(bootstrap_servers="localhost:9092", batch_records=10, batch_codec="lzma")
+
+    def test_zstd_without_package_falls_back(self, capsys):
+        try:
+            import zstandard  # noqa: F401
+            pytest.skip("zstandard is installed")
+        except ImportError:
+            pass
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", batch_records=10, batch_codec="zstd")
+
+        assert handler.batch_codec == "deflate"
+        assert "zstandard" in capsys.readouterr().err
+
+
+class TestDecodeMessage:
+    """Tests for decode_message() on single-record messages."""
+
+    def test_schemaless(self):
+        payload = _payload()
+        assert decode_message(AvroSerializer().serialize(payload)) == [payload]
+
+    def test_confluent_wire_format(self):
+        serializer = AvroSerializer()
+        serializer.schema_id = 7
+        payload = _payload()
+        value = serializer.serialize(payload)
+
+        assert value[:5] == b"\x00\x00\x00\x00\x07"
+        assert decode_message(value) == [payload]
+
+    def test_json_fallback(self):
+        serializer = AvroSerializer()
+        serializer._fastavro_available = False
+        payload = _payload()
+
+        assert decode_message(serializer.serialize(payload)) == [payload]
+        assert decode_message(serializer.serialize_batch([payload, payload])) == [payload, payload]
+
+
+class TestSchemaV2:
+    """Tests for the compact, typed LOG_SCHEMA_V2."""
+
+    def _rich_record(self):
+        record = _record("order %s shipped")
+        record.args = ("A-1",)
+        record.user_id = 42
+        record.ok = True
+        record.ratio = 0.5
+        record.tags = ["a", "b"]
+        return record
+
+    def test_payload_uses_native_types(self):
+        record = self._rich_record()
+        payload = _payload(schema_version=2, record=record)
+
+        assert payload["severity"] == "INFO"
+        assert payload["timestamp_us"] == int(record.created * 1_000_000)
+        assert payload["attributes"] == {
+            "user_id": ("long", 42), "ok": ("boolean", True),
+            "ratio": ("double", 0.5), "tags": ("string", '["a", "b"]'),
+        }
+        assert payload["level"] is None and payload["timestamp"] is None and payload["extra"] is None
+
+    def test_custom_level_rounds_down(self):
+        record = logging.LogRecord("svc", 25, "app.py", 10, "notice", (), None)
+        assert _payload(schema_version=2, record=record)["severity"] == "INFO"
+
+    def test_smaller_than_v1(self):
+        record = self._rich_record()
+        v1 = AvroSerializer().serialize(_payload(record=record))
+        v2 = AvroSerializer(schema_version=2).serialize(_payload(schema_version=2, record=record))
+
+        assert len(v2) < len(v1)
+
+    def test_single_messages_tagged_and_decoded(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", schema_version=2)
+        record = self._rich_record()
+        handler.emit(record)
+        handler.flush()
+
+        producer = fake_producer.instances[0]
+        assert producer.headers == [[(SCHEMA_HEADER_KEY, b"2")]]
+        (decoded,) = decode_message(producer.sent[0][1], producer.headers[0], normalize=True)
+        assert decoded["level"] == "INFO"
+        assert decoded["message"] == "order A-1 shipped"
+        assert decoded["timestamp"].timestamp() == pytest.approx(record.created, abs=1e-6)
+        assert decoded["extra"]["user_id"] == 42
+        handler.close()
+
+    def test_batches_decode_without_headers(self, fake_producer):
+        handler = KafkaHandler(bootstrap_servers="localhost:9092", schema_version=2, batch_records=10)
+        for i in range(5):
+            handler.emit(_record(f"msg {i}"))
+        handler.flush()
+
+        values = [value for _, value, _ in fake_producer.instances[0].sent]
+        decoded = [r for value in values for r in decode_message(value, normalize=True)]
+        assert [r["message"] for r in decoded] == [f"msg {i}" for i in range(5)]
+        assert {r["schema_version"] for r in decoded} == {2}
+        handler.close()
+
+    def test_v2_reader_resolves_v1_data(self):
+        import io
+        import fastavro
+        from fastavro.schema import parse_schema
+
+        record = self._rich_record()
+        v1_bytes = AvroSerializer().serialize(_payload(record=record))
+        resolved = fastavro.schemaless_reader(
+            io.BytesIO(v1_bytes), parse_schema(LOG_SCHEMA_V1), parse_schema(LOG_SCHEMA_V2)
+        )
+
+        assert normalize_record(resolved) == decode_message(v1_bytes, normalize=True)[0]
+        assert normalize_record(resolved)["extra"]["tags"] == ["a", "b"]
+
+    def test_json_fallback_untags_attributes(self):
+        serializer = AvroSerializer(schema_version=2)
+        serializer._fastavro_available = False
+        payload = _payload(schema_version=2, record=self._rich_record())
+
+        (decoded,) = decode_message(serializer.serialize(payload), normalize=True)
+        assert decoded["extra"] == {"user_id": 42, "ok": True, "ratio": 0.5, "tags": '["a", "b"]'}
+
+    def test_invalid_schema_version(self):
+        with pytest.raises(ValueError):
+            AvroSerializer(schema_version=3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+"""
+Tests for the self-metrics registry (metrics.py) and logifyx.stats().
+"""
+
+import os
+import random
+import sys
+import threading
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, flush, stats
+from logifyx import metrics
+from logifyx.metrics import Histogram, bucket_of, bucket_range
+from logifyx.remote import RemoteHandler
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestHistogram:
+    """Tests for the log-linear histogram."""
+
+    def test_buckets_cover_values_within_three_percent(self):
+        previous = -1
+        for value in list(range(5000)) + [random.randrange(1 << 40) for _ in range(5000)]:
+            low, high = bucket_range(bucket_of(value))
+            assert low <= value <= high
+            assert (low + high) // 2 - value <= value / 32 + 1
+        for value in range(5000):
+            assert bucket_of(value) >= previous
+            previous = bucket_of(value)
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for value in range(1, 10_001):
+            histogram.record(value * 1000)
+
+        assert histogram.count == 10_000
+        assert histogram.percentile(50) == pytest.approx(5_000_000, rel=0.035)
+        assert histogram.percentile(99) == pytest.approx(9_900_000, rel=0.035)
+        assert histogram.percentile(100) == pytest.approx(10_000_000, rel=0.035)
+        assert len(histogram.buckets) < 250
+
+    def test_merge_and_summary(self):
+        a, b = Histogram(), Histogram()
+        for _ in range(90):
+            a.record(1000)
+        for _ in range(10):
+            b.record(1_000_000)
+        a.merge(b)
+
+        summary = a.summary()
+        assert summary["count"] == 100
+        assert summary["p50"] == pytest.approx(1.0, rel=0.035)
+        assert summary["p99"] == pytest.approx(1000.0, rel=0.035)
+        assert summary["max"] == pytest.approx(1000.0, rel=0.035)
+        assert summary["mean"] == pytest.approx(100.9, rel=0.035)
+        assert Histogram().summary() == {"count": 0}
+
+
+class TestShards:
+    """Tests for per-thread recording and merge on read."""
+
+    def test_threads_merged_on_read(self):
+        def work():
+            for _ in range(1000):
+                metrics.count(("handled", "t"))
+                metrics.observe(("emit", "t"), 500)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics.count(("handled", "t"), 5)
+
+        merged = metrics.snapshot()
+        assert merged.counters[("handled", "t")] == 4005
+        assert merged.histograms[("emit", "t")].count == 4000
+
+    def test_exited_threads_are_retired(self):
+        threads = [threading.Thread(target=metrics.count, args=(("errors", "t"),)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        before = len(metrics._shards)
+
+        assert metrics.snapshot().counters[("errors", "t")] == 20
+        assert len(metrics._shards) < before
+        assert metrics.snapshot().counters[("errors", "t")] == 20
+
+    def test_reset(self):
+        metrics.count(("errors", "t"))
+        metrics.reset()
+        assert metrics.snapshot().counters == {}
+
+
+class TestStats:
+    """Tests for logifyx.stats()."""
+
+    def test_logger_latency_per_level(self, temp_log_dir):
+        log = Logifyx(name="stats-levels", log_dir=temp_log_dir, color=False)
+        for _ in range(10):
+            log.info("info")
+        log.error("error")
+        log.debug("below the level, not timed")
+
+        result = stats()
+        levels = result["loggers"]["stats-levels"]
+        assert levels["INFO"]["count"] == 10
+        assert levels["ERROR"]["count"] == 1
+        assert "DEBUG" not in levels
+        assert 0 < levels["INFO"]["p50"] <= levels["INFO"]["max"]
+        assert result["levels"]["INFO"]["count"] >= 10
+
+    def test_metrics_off_skips_logger_timing(self, temp_log_dir):
+        log = Logifyx(name="stats-off", log_dir=temp_log_dir, metrics=False)
+        log.info("not timed")
+        assert "stats-off" not in stats()["loggers"]
+
+    def test_metrics_type_validated(self):
+        with pytest.raises(TypeError):
+            Logifyx(name="stats-bad", metrics="yes")
+
+    def test_sink_delivery(self, temp_log_dir):
+        log = Logifyx(name="stats-sink", log_dir=temp_log_dir, async_local=True, color=False)
+        for i in range(50):
+            log.info("record %d", i)
+        assert flush(timeout=5)
+
+        sinks = stats()["sinks"]
+        assert "console" in sinks
+        sink = next(entry for name, entry in sinks.items() if name.endswith("stats-sink.log"))
+        assert sink["handled"] == 50
+        assert sink["queued"] == 0 and sink["dropped"] == 0 and sink["errors"] == 0
+        assert sink["lag"]["count"] == 50
+        assert 1 <= sink["emit"]["count"] <= 50
+        assert "breaker" not in sink
+
+    def test_remote_sink_failures(self, temp_log_dir, http_log_server):
+        log = Logifyx(
+            name="stats-remote",
+            log_dir=temp_log_dir,
+            remote_url=http_log_server.url,
+            max_remote_retries=1,
+            breaker_backoff_ms=60_000,
+        )
+        http_log_server.status = 500
+        with patch.object(RemoteHandler, "handleError"):
+            log.info("fails")
+            flush(timeout=5)
+
+        sink = stats()["sinks"][f"remote:{http_log_server.url}"]
+        assert sink["handled"] == 1
+        assert sink["breaker"]["failed"] == 1
+        assert sink["breaker"]["state"] == "open"
@@ -0,0 +1,285 @@
+"""
+Tests for the shared sink registry (registry.py) and how loggers use it.
+"""
+
+import contextlib
+import io
+import logging
+import os
+import sys
+import threading
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, flush
+import logifyx.core as core
+from logifyx.registry import SinkRegistry
+
+
+class TestSinkRegistry:
+    """Tests for SinkRegistry reference counting."""
+
+    def test_acquire_shares_and_counts(self):
+        registry = SinkRegistry()
+        created, closed = [], []
+
+        def factory():
+            created.append(object())
+            return created[-1]
+
+        a = registry.acquire("k", factory, closed.append)
+        b = registry.acquire("k", factory, closed.append)
+
+        assert a is b
+        assert len(created) == 1
+        assert registry.refcount(a) == 2
+
+    def test_closed_on_last_release(self):
+        registry = SinkRegistry()
+        closed = []
+        obj = registry.acquire("k", object, closed.append)
+        registry.acquire("k", object, closed.append)
+
+        registry.release(obj)
+        assert closed == []
+        registry.release(obj)
+        assert closed == [obj]
+        assert len(registry) == 0
+
+    def test_release_unknown_is_noop(self):
+        registry = SinkRegistry()
+        registry.release(object())
+        assert len(registry) == 0
+
+    def test_different_keys_are_separate(self):
+        registry = SinkRegistry()
+        assert registry.acquire("a", object, lambda o: None) is not registry.acquire("b", object, lambda o: None)
+
+
+def _handler_of(log, kind):
+    for handler in log.handlers:
+        if kind == "file" and hasattr(handler, "baseFilename"):
+            return handler
+        if kind == "console" and type(handler) is logging.StreamHandler:
+            return handler
+    raise AssertionError(f"no {kind} handler")
+
+
+class TestSharedSinks:
+    """Tests for loggers sharing handlers and sinks."""
+
+    def test_same_file_shares_handler(self, temp_log_dir):
+        a = Logifyx(name="mod.a", log_dir=temp_log_dir, file="app.log")
+        b = Logifyx(name="mod.b", log_dir=temp_log_dir, file="app.log")
+
+        assert _handler_of(a, "file") is _handler_of(b, "file")
+        assert _handler_of(a, "console") is _handler_of(b, "console")
+        assert core._registry.refcount(_handler_of(a, "file")) == 2
+
+        a.info("from a")
+        b.info("from b")
+        with open(os.path.join(temp_log_dir, "app.log")) as f:
+            content = f.read()
+        assert "from a" in content and "from b" in content
+
+    def test_different_file_or_settings_not_shared(self, temp_log_dir):
+        a = Logifyx(name="mod.a", log_dir=temp_log_dir, file="a.log")
+        b = Logifyx(name="mod.b", log_dir=temp_log_dir, file="b.log")
+        c = Logifyx(name="mod.c", log_dir=temp_log_dir, file="a.log", max_bytes=5_000_000)
+
+        assert _handler_of(a, "file") is not _handler_of(b, "file")
+        assert _handler_of(a, "file") is not _handler_of(c, "file")
+
+    def test_different_levels_share_handler(self, temp_log_dir, monkeypatch):
+        loggers = []
+        for level in ("DEBUG", "INFO", "WARNING"):
+            monkeypatch.setenv("LOG_LEVEL", level)
+            loggers.append(Logifyx(name=f"lvl.{level}", log_dir=temp_log_dir, file="app.log"))
+
+        handler = _handler_of(loggers[0], "file")
+        assert all(_handler_of(log, "file") is handler for log in loggers)
+        assert core._registry.refcount(handler) == 3
+        assert handler.level == logging.NOTSET
+
+        for log in loggers:
+            log.debug(f"debug from {log.name}")
+            log.info(f"info from {log.name}")
+            log.warning(f"warning from {log.name}")
+        with open(os.path.join(temp_log_dir, "app.log")) as f:
+            content = f.read()
+        assert "debug from lvl.DEBUG" in content
+        assert "debug from lvl.INFO" not in content and "info from lvl.INFO" in content
+        assert "info from lvl.WARNING" not in content and "warning from lvl.WARNING" in content
+
+    def test_console_follows_redirected_stderr(self, temp_log_dir):
+        a = Logifyx(name="mod.a", log_dir=temp_log_dir, color=False)
+        captured = io.StringIO()
+        with contextlib.redirect_stderr(captured):
+            b = Logifyx(name="mod.b", log_dir=temp_log_dir, color=False)
+            b.info("to the redirected stream")
+
+        assert _handler_of(a, "console") is not _handler_of(b, "console")
+        assert "to the redirected stream" in captured.getvalue()
+
+    def test_same_remote_url_shares_sink(self, temp_log_dir, http_log_server):
+        loggers = [
+            Logifyx(name=f"svc.{i}", log_dir=temp_log_dir, remote_url=http_log_server.url)
+            for i in range(5)
+        ]
+        other = Logifyx(name="svc.slow", log_dir=temp_log_dir, remote_url=http_log_server.url, remote_timeout=9)
+
+        sink = loggers[0]._sinks[0]
+        assert all(log._sinks[0] is sink for log in loggers)
+        assert other._sinks[0] is not sink
+        assert len(core._sinks) == 2
+
+        for log in loggers:
+            log.info(f"hello from {log.name}")
+        assert flush(timeout=5) is True
+        assert len(http_log_server.bodies()) == 5
+
+    def test_close_releases_last_reference(self, temp_log_dir, http_log_server):
+        a = Logifyx(name="svc.a", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        b = Logifyx(name="svc.b", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        sink = a._sinks[0]
+
+        a.close()
+        assert a.handlers == []
+        assert sink.running
+        b.info("still delivered")
+        assert flush(timeout=5) is True
+
+        b.close()
+        assert not sink.running
+        assert sink not in core._sinks
+        assert any(b"still delivered" in body for body in http_log_server.bodies())
+
+    def test_reload_keeps_shared_sink(self, temp_log_dir, http_log_server):
+        a = Logifyx(name="svc.a", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        b = Logifyx(name="svc.b", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        sink = b._sinks[0]
+
+        a.reload()
+
+        assert sink.running
+        assert a._sinks[0] is sink
+        assert core._registry.refcount(sink) == 2
+
+    def test_shutdown_empties_registry(self, temp_log_dir):
+        Logifyx(name="svc.a", log_dir=temp_log_dir)
+        assert len(core._registry) > 0
+
+        core._stop_queue_listener()
+
+        assert len(core._registry) == 0
+
+
+class TestIncrementalReload:
+    """Tests for reload() rebuilding only the handlers whose settings changed."""
+
+    def test_unchanged_reload_keeps_everything(self, temp_log_dir, http_log_server):
+        log = Logifyx(name="inc.same", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        handlers = list(log.handlers)
+        sink = log._sinks[0]
+        workers = list(sink._threads)
+
+        log.reload()
+
+        assert log.handlers == handlers
+        assert log._sinks[0] is sink
+        assert sink._threads == workers
+        assert core._registry.refcount(sink) == 1
+
+    def test_level_change_keeps_handlers(self, temp_log_dir, http_log_server, monkeypatch):
+        log = Logifyx(name="inc.level", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        handlers = list(log.handlers)
+        sink = log._sinks[0]
+
+        monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+        log.reload()
+
+        assert log.level == logging.DEBUG
+        assert log.handlers == handlers
+        assert log._sinks[0] is sink
+        log.debug("debug after reload")
+        assert flush(timeout=5)
+        assert any(b"debug after reload" in body for body in http_log_server.bodies())
+
+    def test_level_change_on_shared_sink_keeps_sharing(self, temp_log_dir, http_log_server, monkeypatch):
+        a = Logifyx(name="inc.a", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        b = Logifyx(name="inc.b", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        sink = b._sinks[0]
+
+        monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+        a.reload()
+
+        assert a._sinks[0] is sink
+        assert core._registry.refcount(sink) == 2
+        a.debug("debug from a")
+        b.debug("debug from b")
+        assert flush(timeout=5)
+        bodies = b"".join(http_log_server.bodies())
+        assert b"debug from a" in bodies
+        assert b"debug from b" not in bodies
+
+    def test_only_changed_sink_rebuilt(self, temp_log_dir, http_log_server, monkeypatch):
+        log = Logifyx(name="inc.remote", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        file_handler = next(h for h in log.handlers if hasattr(h, "baseFilename"))
+        old_sink = log._sinks[0]
+
+        monkeypatch.setenv("LOG_REMOTE_TIMEOUT", "9")
+        log.reload()
+
+        assert file_handler in log.handlers
+        assert log._sinks[0] is not old_sink
+        assert log._sinks[0].handler.timeout == 9
+        assert not old_sink.running
+        assert old_sink not in core._sinks
+
+    def test_no_records_lost_while_reloading(self, temp_log_dir, http_log_server, monkeypatch):
+        log = Logifyx(name="inc.busy", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        done = threading.Event()
+
+        def reloader():
+            timeout = 5
+            while not done.is_set():
+                timeout = 11 - timeout  # alternate 5 / 6 so the sink is rebuilt
+                monkeypatch.setenv("LOG_REMOTE_TIMEOUT", str(timeout))
+                log.reload()
+
+        thread = threading.Thread(target=reloader)
+        thread.start()
+        try:
+            for i in range(200):
+                log.info("busy %d", i)
+        finally:
+            done.set()
+            thread.join()
+        assert flush(timeout=10)
+
+        bodies = b"".join(http_log_server.bodies())
+        assert all(f"busy {i}\"".encode() in bodies for i in range(200))
+
+    def test_invalid_config_keeps_handlers(self, temp_log_dir, monkeypatch):
+        log = Logifyx(name="inc.bad", log_dir=temp_log_dir)
+        handlers = list(log.handlers)
+
+        monkeypatch.setenv("LOG_LEVEL", "LOUD")
+        with pytest.raises(ValueError):
+            log.reload()
+
+        assert log.handlers == handlers
+
+    def test_application_handlers_survive_reload(self, temp_log_dir):
+        log = Logifyx(name="inc.extra", log_dir=temp_log_dir)
+        extra = logging.NullHandler()
+        log.addHandler(extra)
+
+        log.reload()
+
+        assert extra in log.handlers
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,16 +2,20 @@
 Tests for RemoteHandler and formatter.
 """
 
+import gzip
+import json
 import logging
 import os
 import sys
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock, Mock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from logifyx.remote import RemoteHandler
-from logifyx.formatter import get_formatter
+from logifyx.remote import RemoteHandler, get_session, close_sessions
+from logifyx.formatter import get_formatter, TimestampCache, LOCATION_CACHE_SIZE, _format_line, _location
 
 
 class TestRemoteHandler:
@@ -50,7 +54,7 @@ class TestRemoteHandler:
         handler.disabled = False
         assert handler.disabled is False
         
-    @patch('logifyx.remote.requests.post')
+    @patch('logifyx.remote.requests.Session.post')
     def test_successful_emit(self, mock_post):
         """Test successful log emission."""
         mock_response = MagicMock()
@@ -79,7 +83,7 @@ class TestRemoteHandler:
         assert call_args.kwargs["json"]["level"] == "INFO"
         assert call_args.kwargs["json"]["logger"] == "test"
         
-    @patch('logifyx.remote.requests.post')
+    @patch('logifyx.remote.requests.Session.post')
     def test_emit_when_disabled(self, mock_post):
         """Test that emit does nothing when disabled."""
         handler = RemoteHandler(url="http://example.com/logs")
@@ -100,7 +104,7 @@ class TestRemoteHandler:
         # requests.post should not be called
         mock_post.assert_not_called()
         
-    @patch('logifyx.remote.requests.post')
+    @patch('logifyx.remote.requests.Session.post')
     def test_failure_tracking(self, mock_post):
         """Test that failures are tracked and handler disables after max."""
         mock_post.side_effect = Exception("Connection failed")
@@ -128,7 +132,7 @@ class TestRemoteHandler:
         
         assert handler.disabled is True
         
-    @patch('logifyx.remote.requests.post')
+    @patch('logifyx.remote.requests.Session.post')
     def test_failure_counter_resets_on_success(self, mock_post):
         """Test that failure counter resets on successful send."""
         handler = RemoteHandler(
@@ -210,10 +214,135 @@ class TestFormatter:
         assert "42" in output  # Line number
 
 
+class TestTimestampCache:
+    """Tests for the per-second timestamp cache."""
+
+    def _record(self, created):
+        record = logging.LogRecord("t", logging.INFO, "t.py", 1, "m", (), None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        return record
+
+    def test_matches_strftime(self):
+        cache = TimestampCache("%Y-%m-%d %H:%M:%S")
+        for created in (1_700_000_000.25, 1_700_000_000.75, 1_700_000_001.0, 1_600_000_000.5):
+            expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+            assert cache.format(self._record(created)) == expected
+
+    def test_strftime_once_per_second(self):
+        cache = TimestampCache("%H:%M:%S")
+        with patch("logifyx.formatter.time.strftime", wraps=time.strftime) as strftime:
+            for i in range(10):
+                cache.format(self._record(1_700_000_000 + i / 20))
+        assert strftime.call_count == 1
+
+    def test_msecs_suffix(self):
+        cache = TimestampCache("%H:%M:%S", msecs=True)
+        record = self._record(1_700_000_000.042)
+        expected = logging.Formatter(datefmt="%H:%M:%S").formatTime(record, "%H:%M:%S")
+        assert cache.format(record) == f"{expected},042"
+
+    def test_formatters_use_cache(self):
+        record = self._record(1_700_000_000.5)
+        expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(1_700_000_000.5))
+        for json_mode, color in ((False, False), (False, True), (True, False)):
+            formatter = get_formatter(json_mode=json_mode, color=color)
+            assert expected in formatter.format(record)
+            assert formatter._time_cache is not None
+
+    def test_formatter_msecs(self):
+        formatter = get_formatter(json_mode=False, color=False, msecs=True)
+        assert formatter.format(self._record(1_700_000_000.5)).split(" | ")[0].endswith(",500")
+
+    def test_thread_safe(self):
+        cache = TimestampCache("%Y-%m-%d %H:%M:%S")
+        base = 1_700_000_000
+        errors = []
+
+        def worker(offset):
+            for i in range(2000):
+                created = base + (i + offset) % 5 + 0.5
+                expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+                if cache.format(self._record(created)) != expected:
+                    errors.append(created)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+
+
+class TestLineFragments:
+    """Tests for the precomputed level and location fragments."""
+
+    def _record(self, level=logging.INFO):
+        return logging.LogRecord("app.db", level, "db.py", 12, "query %s", ("ok",), None, func="run")
+
+    def test_plain_line(self):
+        assert _format_line(self._record(), "DT", color=False) == "DT | INFO     | app.db:run:12 - query ok"
+
+    def test_color_line(self):
+        expected = (
+            "\033[32mDT\033[0m | \033[31mERROR   \033[0m | "
+            "\033[34mapp.db\033[97m:\033[34mrun:12\033[0m - \033[31mquery ok\033[0m"
+        )
+        assert _format_line(self._record(logging.ERROR), "DT", color=True) == expected
+
+    def test_custom_level(self):
+        logging.addLevelName(25, "NOTICE")
+        assert _format_line(self._record(25), "DT", color=False) == "DT | NOTICE   | app.db:run:12 - query ok"
+        assert "NOTICE  \033[0m | " in _format_line(self._record(25), "DT", color=True)
+
+    def test_location_cache_bounded(self):
+        assert _location.cache_info().maxsize == LOCATION_CACHE_SIZE
+        for i in range(LOCATION_CACHE_SIZE + 10):
+            _location("app", "run", i)
+        assert _location.cache_info().currsize == LOCATION_CACHE_SIZE
+
+
+class TestJsonEncoder:
+    """CompactJsonFormatter output must match json.dumps byte for byte."""
+
+    MESSAGES = [
+        "plain",
+        "quote \" backslash \\ slash /",
+        "newline \n tab \t control \x01 \x1f del \x7f",
+        "unicode é ü 日本 😀 \u2028 \u2029",
+        "lone surrogate \ud800",
+        "",
+    ]
+
+    def _expected(self, formatter, record, func):
+        return json.dumps({
+            "timestamp": formatter.formatTime(record),
+            "level":     record.levelname,
+            "logger":    record.name,
+            "function":  func,
+            "line":      record.lineno,
+            "message":   record.getMessage(),
+        }, ensure_ascii=False)
+
+    @pytest.mark.parametrize("msg", MESSAGES)
+    def test_byte_identical_to_json_dumps(self, msg):
+        formatter = get_formatter(json_mode=True)
+        record = logging.LogRecord("svc.ünï", logging.WARNING, "/app/main.py", 7, msg, (), None, func="handle")
+        assert formatter.format(record) == self._expected(formatter, record, "handle")
+
+    def test_module_level_and_missing_function(self):
+        formatter = get_formatter(json_mode=True)
+        module = logging.LogRecord("svc", logging.INFO, "/app/main.py", 1, "m", (), None, func="<module>")
+        missing = logging.LogRecord("svc", logging.INFO, "/app/main.py", 1, "m", (), None)
+
+        assert formatter.format(module) == self._expected(formatter, module, "main")
+        assert formatter.format(missing) == self._expected(formatter, missing, None)
+
+
 class TestHandlerPayload:
     """Tests for RemoteHandler payload structure."""
 
-    @patch('logifyx.remote.requests.post')
+    @patch('logifyx.remote.requests.Session.post')
     def test_payload_structure(self, mock_post):
         """Test the structure of the log payload."""
         mock_post.return_value = MagicMock()
@@ -245,5 +374,265 @@ class TestHandlerPayload:
         assert payload["func"] == "handle_request"
 
 
+def _record(msg="Test message", name="test"):
+    return logging.LogRecord(
+        name=name,
+        level=logging.INFO,
+        pathname="test.py",
+        lineno=1,
+        msg=msg,
+        args=(),
+        exc_info=None
+    )
+
+
+class TestRemoteBatching:
+    """Tests for batched HTTP delivery against a local stand-in server."""
+
+    def _handler(self, url, **kwargs):
+        handler = RemoteHandler(url=url, **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def test_batch_sent_when_size_reached(self, http_log_server):
+        handler = self._handler(http_log_server.url, batch_size=3, batch_linger_ms=60_000)
+
+        for i in range(3):
+            handler.emit(_record(f"msg {i}"))
+
+        bodies = http_log_server.bodies()
+        assert len(bodies) == 1
+        lines = bodies[0].decode("utf-8").splitlines()
+        assert [json.loads(line)["message"] for line in lines] == ["msg 0", "msg 1", "msg 2"]
+        headers = http_log_server.requests[0][0]
+        assert headers["Content-Type"] == "application/x-ndjson"
+        handler.close()
+
+    def test_json_array_format(self, http_log_server):
+        handler = self._handler(
+            http_log_server.url, batch_size=2, batch_linger_ms=60_000, batch_format="json"
+        )
+
+        handler.emit(_record("a"))
+        handler.emit(_record("b"))
+
+        body = json.loads(http_log_server.bodies()[0])
+        assert isinstance(body, list)
+        assert [entry["message"] for entry in body] == ["a", "b"]
+        handler.close()
+
+    def test_partial_batch_sent_after_linger(self, http_log_server):
+        handler = self._handler(http_log_server.url, batch_size=100, batch_linger_ms=50)
+
+        handler.emit(_record("lonely"))
+        assert http_log_server.bodies() == []
+
+        deadline = time.time() + 2
+        while not http_log_server.bodies() and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert len(http_log_server.bodies()) == 1
+        handler.close()
+
+    def test_batch_split_on_max_bytes(self, http_log_server):
+        handler = self._handler(
+            http_log_server.url, batch_size=100, batch_max_bytes=400, batch_linger_ms=60_000
+        )
+
+        for i in range(6):
+            handler.emit(_record("x" * 100))
+        handler.flush()
+
+        bodies = http_log_server.bodies()
+        assert len(bodies) > 1
+        assert all(len(body) <= 400 for body in bodies)
+        assert sum(len(body.splitlines()) for body in bodies) == 6
+        handler.close()
+
+    def test_close_flushes_pending_batch(self, http_log_server):
+        handler = self._handler(http_log_server.url, batch_size=100, batch_linger_ms=60_000)
+
+        handler.emit(_record("pending"))
+        handler.close()
+
+        assert len(http_log_server.bodies()) == 1
+
+    def test_failed_batches_trip_circuit_breaker(self, http_log_server):
+        http_log_server.status = 500
+        handler = self._handler(
+            http_log_server.url, batch_size=1_000, batch_linger_ms=60_000, max_failures=2
+        )
+        handler.handleError = MagicMock()
+
+        for _ in range(2):
+            handler.emit(_record())
+            handler.flush()
+
+        assert handler.disabled is True
+        handler.close()
+
+    def test_invalid_batch_format(self):
+        with pytest.raises(ValueError):
+            RemoteHandler(url="http://example.com/logs", batch_format="xml")
+
+    def test_logifyx_kwargs_enable_batching(self, http_log_server, temp_log_dir):
+        from logifyx import Logifyx, flush
+
+        log = Logifyx(
+            name="batched",
+            log_dir=temp_log_dir,
+            remote_url=http_log_server.url,
+            remote_batch_size=50,
+            remote_batch_linger_ms=60_000,
+        )
+        for i in range(10):
+            log.info("record %d", i)
+
+        assert flush(timeout=5) is True
+        bodies = http_log_server.bodies()
+        assert len(bodies) == 1
+        assert len(bodies[0].splitlines()) == 10
+
+    def test_flush_waits_for_batch_in_flight(self, http_log_server, temp_log_dir):
+        from logifyx import Logifyx, flush
+
+        http_log_server.delay = 0.5
+        log = Logifyx(
+            name="in-flight",
+            log_dir=temp_log_dir,
+            remote_url=http_log_server.url,
+            remote_batch_size=100,
+            remote_batch_linger_ms=50,
+        )
+        log.info("slow")
+        time.sleep(0.2)  # the linger thread has taken the batch and is posting it
+
+        assert flush(timeout=5) is True
+        assert len(http_log_server.bodies()) == 1
+
+    def test_flush_times_out_while_batch_in_flight(self, http_log_server):
+        http_log_server.delay = 0.5
+        handler = self._handler(http_log_server.url, batch_size=100, batch_linger_ms=50)
+        handler.emit(_record("slow"))
+        time.sleep(0.2)
+
+        assert handler.pending() == 1
+        assert handler.flush(timeout=0.05) is False
+        assert handler.flush(timeout=5) is True
+        assert handler.pending() == 0
+        handler.close()
+
+
+class TestRemoteSession:
+    """Tests for the shared keep-alive session pool."""
+
+    def setup_method(self):
+        close_sessions()
+
+    def teardown_method(self):
+        close_sessions()
+
+    def test_handlers_share_session_per_url(self):
+        a = RemoteHandler(url="http://example.com/logs")
+        b = RemoteHandler(url="http://example.com/logs")
+        c = RemoteHandler(url="http://example.com/other")
+
+        assert a._session is b._session
+        assert a._session is not c._session
+
+    def test_pool_size_applied_to_adapter(self):
+        session = get_session("http://example.com/pooled", pool_size=4)
+        adapter = session.get_adapter("http://example.com/pooled")
+
+        assert adapter._pool_maxsize == 4
+
+    def test_connection_reused_across_records(self, http_log_server):
+        handler = RemoteHandler(url=http_log_server.url)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        for i in range(5):
+            handler.emit(_record(f"msg {i}"))
+
+        assert len(http_log_server.bodies()) == 5
+        pool = handler._session.get_adapter(http_log_server.url).poolmanager
+        assert sum(p.num_connections for p in pool.pools._container.values()) == 1
+        handler.close()
+
+
+
+class TestRemoteCompression:
+    """Tests for gzip/zstd request bodies."""
+
+    def teardown_method(self):
+        close_sessions()
+
+    def _handler(self, url, **kwargs):
+        handler = RemoteHandler(url=url, **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+    def test_gzip_batch_body(self, http_log_server):
+        handler = self._handler(
+            http_log_server.url, batch_size=50, batch_linger_ms=60_000, compression="gzip"
+        )
+        for i in range(50):
+            handler.emit(_record(f"order {i} shipped to warehouse eu-west-1"))
+
+        headers, body = http_log_server.requests[-1]
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Content-Type"] == "application/x-ndjson"
+        lines = gzip.decompress(body).splitlines()
+        assert len(lines) == 50 and len(body) < sum(map(len, lines)) / 4
+        handler.close()
+
+    def test_small_body_sent_uncompressed(self, http_log_server):
+        handler = self._handler(http_log_server.url, compression="gzip")
+        handler.emit(_record("short"))
+
+        headers, body = http_log_server.requests[-1]
+        assert "Content-Encoding" not in headers
+        assert json.loads(body)["message"] == "short"
+        handler.close()
+
+    def test_single_record_above_threshold(self, http_log_server):
+        handler = self._handler(http_log_server.url, compression="gzip", compression_min_bytes=0)
+        handler.emit(_record("compressed"))
+
+        headers, body = http_log_server.requests[-1]
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Content-Type"] == "application/json"
+        assert json.loads(gzip.decompress(body))["message"] == "compressed"
+        handler.close()
+
+    def test_invalid_compression_and_level(self):
+        with pytest.raises(ValueError):
+            RemoteHandler(url="http://example.com/logs", compression="brotli")
+        with pytest.raises(ValueError):
+            RemoteHandler(url="http://example.com/logs", compression="gzip", compression_level=12)
+
+    def test_zstd_body(self, http_log_server):
+        zstandard = pytest.importorskip("zstandard")
+        handler = self._handler(http_log_server.url, compression="zstd", compression_min_bytes=0)
+        handler.emit(_record("compressed"))
+
+        headers, body = http_log_server.requests[-1]
+        assert headers["Content-Encoding"] == "zstd"
+        assert json.loads(zstandard.ZstdDecompressor().decompress(body))["message"] == "compressed"
+        handler.close()
+
+    def test_zstd_without_package_falls_back(self, capsys):
+        try:
+            import zstandard  # noqa: F401
+            pytest.skip("zstandard is installed")
+        except ImportError:
+            pass
+
+        handler = RemoteHandler(url="http://example.com/logs", compression="zstd", compression_level=19)
+
+        assert handler.compression == "gzip"
+        assert handler.compression_level == 9
+        assert "zstandard" in capsys.readouterr().err
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,543 @@
+"""
+Tests for per-sink async queues (sinks.py) and their wiring in core.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx, queue_depths, dropped_counts, flush, flush_async
+import logifyx.core as core
+from logifyx.sinks import AsyncSink, SinkQueueHandler, write_batch
+
+
+class CollectingHandler(logging.Handler):
+    """Collects messages; optionally blocks until released."""
+
+    def __init__(self, gate=None):
+        super().__init__()
+        self.gate = gate
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait()
+        self.threads.add(threading.current_thread().name)
+        self.messages.append(record.getMessage())
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestAsyncSink:
+    """Tests for AsyncSink queue + worker behaviour."""
+
+    def test_slow_sink_does_not_block_other_sink(self):
+        gate = threading.Event()
+        slow = AsyncSink(CollectingHandler(gate), name="slow")
+        fast_handler = CollectingHandler()
+        fast = AsyncSink(fast_handler, name="fast")
+        slow.start()
+        fast.start()
+
+        logger = logging.Logger("fanout")
+        logger.addHandler(SinkQueueHandler([slow, fast]))
+        for i in range(5):
+            logger.info("msg %d", i)
+
+        assert _wait_for(lambda: len(fast_handler.messages) == 5)
+        assert slow.depth() >= 4
+
+        gate.set()
+        slow.stop()
+        fast.stop()
+        assert slow.handler.messages == [f"msg {i}" for i in range(5)]
+
+    def test_full_queue_drops_and_counts(self):
+        gate = threading.Event()
+        sink = AsyncSink(CollectingHandler(gate), maxsize=2, name="tiny")
+        sink.start()
+        record = logging.LogRecord("t", logging.INFO, "t.py", 1, "x", (), None)
+
+        results = [sink.enqueue(record) for _ in range(10)]
+
+        assert results.count(False) >= 7
+        assert sink.dropped == results.count(False)
+        gate.set()
+        sink.stop()
+
+    def test_multiple_workers(self):
+        handler = CollectingHandler()
+        sink = AsyncSink(handler, workers=3, name="multi")
+        sink.start()
+
+        assert len(sink._threads) == 3
+        record = logging.LogRecord("t", logging.INFO, "t.py", 1, "x", (), None)
+        for _ in range(50):
+            sink.enqueue(record)
+        sink.stop()
+
+        assert len(handler.messages) == 50
+        assert not sink.running
+
+    def test_handler_level_respected(self):
+        handler = CollectingHandler()
+        handler.setLevel(logging.WARNING)
+        sink = AsyncSink(handler, name="levels")
+        sink.start()
+
+        sink.enqueue(logging.LogRecord("t", logging.INFO, "t.py", 1, "info", (), None))
+        sink.enqueue(logging.LogRecord("t", logging.ERROR, "t.py", 1, "error", (), None))
+        sink.stop()
+
+        assert handler.messages == ["error"]
+
+    def test_hand_off_forwards_late_records(self):
+        old_handler, new_handler = CollectingHandler(), CollectingHandler()
+        old = AsyncSink(old_handler, name="old")
+        new = AsyncSink(new_handler, name="new")
+        old.start()
+        new.start()
+        record = logging.LogRecord("t", logging.INFO, "t.py", 1, "%s", ("before",), None)
+        old.enqueue(record)
+
+        old.hand_off(new)
+        old.stop()
+        assert old.enqueue(logging.LogRecord("t", logging.INFO, "t.py", 1, "after", (), None))
+        new.stop()
+
+        assert old_handler.messages == ["before"]
+        assert new_handler.messages == ["after"]
+
+    def test_hand_off_releases_blocked_producer(self):
+        gate = threading.Event()
+        old = AsyncSink(CollectingHandler(gate), maxsize=1, overflow="block", block_timeout=5.0, name="old")
+        new_handler = CollectingHandler()
+        new = AsyncSink(new_handler, name="new")
+        old.start()
+        new.start()
+        old.enqueue(_rec("first"))
+        assert _wait_for(lambda: old.depth() == 0)
+        old.enqueue(_rec("second"))
+
+        threading.Timer(0.1, old.hand_off, (new,)).start()
+        assert old.enqueue(_rec("third")) is True
+        gate.set()
+        old.stop()
+        new.stop()
+
+        assert new_handler.messages == ["third"]
+        assert old.dropped == 0
+
+
+
+def _rec(msg, level=logging.INFO):
+    return logging.LogRecord("t", level, "t.py", 1, msg, (), None)
+
+
+class TestOverflowPolicies:
+    """Tests for queue byte budget and overflow policies."""
+
+    def _stalled_sink(self, **kwargs):
+        """A sink whose queue is not drained (workers never started)."""
+        handler = CollectingHandler()
+        return AsyncSink(handler, name="stalled", **kwargs), handler
+
+    def test_byte_budget_limits_queue(self):
+        sink, _ = self._stalled_sink(max_bytes=5_000)
+
+        for i in range(20):
+            sink.enqueue(_rec("x" * 500))
+
+        assert sink.queued_bytes() <= 5_000
+        assert sink.depth() < 20
+        assert sink.dropped == 20 - sink.depth()
+
+    def test_drop_newest_keeps_oldest(self):
+        sink, handler = self._stalled_sink(maxsize=3, overflow="drop_newest")
+
+        for i in range(5):
+            sink.enqueue(_rec(f"m{i}"))
+        sink.start()
+        sink.stop()
+
+        assert handler.messages == ["m0", "m1", "m2"]
+        assert sink.dropped == 2
+
+    def test_drop_oldest_keeps_newest(self):
+        sink, handler = self._stalled_sink(maxsize=3, overflow="drop_oldest")
+
+        for i in range(5):
+            assert sink.enqueue(_rec(f"m{i}")) is True
+        sink.start()
+        sink.stop()
+
+        assert handler.messages == ["m2", "m3", "m4"]
+        assert sink.dropped == 2
+
+    def test_drop_below_sheds_low_levels_first(self):
+        sink, handler = self._stalled_sink(
+            maxsize=3, overflow="drop_below", drop_level=logging.WARNING
+        )
+
+        sink.enqueue(_rec("info-1"))
+        sink.enqueue(_rec("error-1", logging.ERROR))
+        sink.enqueue(_rec("info-2"))
+        assert sink.enqueue(_rec("info-3")) is False           # below level: dropped
+        assert sink.enqueue(_rec("error-2", logging.ERROR)) is True  # evicts info-1
+        sink.start()
+        sink.stop()
+
+        assert handler.messages == ["error-1", "info-2", "error-2"]
+        assert sink.dropped == 2
+
+    def test_drop_below_full_of_high_levels_refuses_fast(self):
+        sink, _ = self._stalled_sink(
+            maxsize=100_000, max_bytes=1 << 40, overflow="drop_below", drop_level=logging.WARNING
+        )
+        error = _rec("error", logging.ERROR)
+        for _ in range(100_000):
+            sink.enqueue(error)
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            assert sink.enqueue(error) is False  # nothing below drop_level to evict
+        per_call = (time.perf_counter() - start) / 1000
+
+        assert per_call < 0.0005  # a scan of the queue took ~10 ms
+        assert sink.depth() == 100_000
+
+    def test_drop_below_evicts_oldest_low_record_fast(self):
+        sink, handler = self._stalled_sink(
+            maxsize=100_000, max_bytes=1 << 40, overflow="drop_below", drop_level=logging.WARNING
+        )
+        error = _rec("error", logging.ERROR)
+        for _ in range(99_000):
+            sink.enqueue(error)
+        for i in range(1000):
+            sink.enqueue(_rec(f"info-{i}"))
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            assert sink.enqueue(error) is True  # evicts the oldest INFO at the tail end
+        per_call = (time.perf_counter() - start) / 1000
+
+        assert per_call < 0.0005
+        assert sink.depth() == 100_000 and sink.dropped == 1000
+        assert sink.enqueue(error) is False
+        sink.start()
+        sink.stop()
+        assert len(handler.messages) == 100_000
+        assert set(handler.messages) == {"error"}
+
+    def test_drop_below_matches_list_model(self):
+        import random
+
+        rng = random.Random(7)
+        sink, _ = self._stalled_sink(
+            maxsize=50, max_bytes=1 << 40, overflow="drop_below", drop_level=logging.WARNING
+        )
+        model = []
+        for i in range(20_000):
+            if model and rng.random() < 0.3:
+                assert sink._get().getMessage() == model.pop(0)[0]
+                continue
+            level = rng.choice((logging.INFO, logging.ERROR))
+            accepted = sink.enqueue(_rec(str(i), level))
+            if len(model) < 50:
+                model.append((str(i), level))
+            elif level >= logging.WARNING and any(lvl < logging.WARNING for _, lvl in model):
+                del model[next(j for j, (_, lvl) in enumerate(model) if lvl < logging.WARNING)]
+                model.append((str(i), level))
+            else:
+                assert accepted is False
+                continue
+            assert accepted is True
+            assert sink.depth() == len(model)
+            assert len(sink._items) <= 2 * sink.depth() + 65
+
+    def test_block_waits_for_room(self):
+        gate = threading.Event()
+        handler = CollectingHandler(gate)
+        sink = AsyncSink(handler, maxsize=1, overflow="block", block_timeout=5.0, name="block")
+        sink.start()
+        sink.enqueue(_rec("first"))
+        assert _wait_for(lambda: sink.depth() == 0)  # worker holds "first"
+        sink.enqueue(_rec("second"))
+
+        threading.Timer(0.1, gate.set).start()
+        start = time.time()
+        assert sink.enqueue(_rec("third")) is True
+        assert time.time() - start >= 0.05
+        sink.stop()
+
+        assert handler.messages == ["first", "second", "third"]
+        assert sink.dropped == 0
+
+    def test_block_times_out_and_drops(self):
+        sink, _ = self._stalled_sink(maxsize=1, overflow="block", block_timeout=0.05)
+
+        sink.enqueue(_rec("first"))
+        assert sink.enqueue(_rec("second")) is False
+        assert sink.dropped == 1
+
+    def test_drops_reported_to_stderr(self, capsys):
+        sink, _ = self._stalled_sink(maxsize=1)
+
+        sink.enqueue(_rec("kept"))
+        sink.enqueue(_rec("dropped"))
+
+        assert "dropped 1 record" in capsys.readouterr().err
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            AsyncSink(CollectingHandler(), overflow="explode")
+
+
+class TestFlush:
+    """Tests for completion-based flush."""
+
+    def test_flush_waits_for_in_flight_record(self):
+        gate = threading.Event()
+        handler = CollectingHandler(gate)
+        sink = AsyncSink(handler, name="inflight")
+        sink.start()
+
+        sink.enqueue(_rec("slow"))
+        assert _wait_for(lambda: sink.depth() == 0)  # dequeued, still being handled
+
+        assert sink.pending() == 1
+        assert sink.flush(timeout=0.05) is False
+
+        gate.set()
+        assert sink.flush(timeout=2) is True
+        assert handler.messages == ["slow"]
+        assert sink.pending() == 0
+        sink.stop()
+
+    def test_flush_wakes_on_completion(self):
+        gate = threading.Event()
+        sink = AsyncSink(CollectingHandler(gate), name="wake")
+        sink.start()
+        sink.enqueue(_rec("x"))
+
+        threading.Timer(0.05, gate.set).start()
+        start = time.monotonic()
+        assert sink.flush(timeout=5) is True
+        assert time.monotonic() - start < 1.0
+        sink.stop()
+
+    def test_evicted_records_are_not_pending(self):
+        sink = AsyncSink(CollectingHandler(), maxsize=2, overflow="drop_oldest", name="evict")
+
+        for i in range(5):
+            sink.enqueue(_rec(f"m{i}"))
+
+        assert sink.pending() == 2
+
+    def test_timeout_reports_pending_per_sink(self, monkeypatch, capsys):
+        stalled = AsyncSink(CollectingHandler(), name="stalled")  # no workers
+        stalled.enqueue(_rec("a"))
+        stalled.enqueue(_rec("b"))
+        monkeypatch.setattr(core, "_sinks", [stalled])
+
+        assert flush(timeout=0.05) is False
+        assert "stalled=2" in capsys.readouterr().err
+
+    def test_flush_async(self, temp_log_dir, http_log_server):
+        log = Logifyx(name="flush-async", log_dir=temp_log_dir, remote_url=http_log_server.url)
+
+        log.info("from asyncio")
+        assert asyncio.run(flush_async(timeout=5)) is True
+        assert any(b"from asyncio" in body for body in http_log_server.bodies())
+
+
+class _CountingStream:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+
+class TestAsyncLocal:
+    """Tests for async_local file/console writers."""
+
+    def test_write_batch_single_write(self):
+        stream = _CountingStream()
+        handler = logging.StreamHandler(stream)
+        handler.setLevel(logging.INFO)
+
+        write_batch(handler, [_rec("a"), _rec("debug", logging.DEBUG), _rec("b")])
+
+        assert stream.writes == ["a\nb\n"]
+
+    def test_batched_sink_preserves_order(self):
+        stream = _CountingStream()
+        sink = AsyncSink(logging.StreamHandler(stream), batch_size=64, name="batched")
+
+        for i in range(200):
+            sink.enqueue(_rec(f"m{i}"))
+        sink.start()
+        assert sink.flush(timeout=5) is True
+        sink.stop()
+
+        lines = "".join(stream.writes).splitlines()
+        assert lines == [f"m{i}" for i in range(200)]
+        assert len(stream.writes) < 200
+
+    def test_async_local_routes_file_and_console(self, temp_log_dir):
+        log = Logifyx(name="async-local", log_dir=temp_log_dir, async_local=True, color=False)
+
+        assert [type(h) for h in log.handlers] == [SinkQueueHandler]
+        assert sorted(sink.name.split(":")[0] for sink in log._sinks) == ["console", "file"]
+
+        log.info("written in the background password=hunter2")
+        assert flush(timeout=5) is True
+
+        with open(os.path.join(temp_log_dir, "async-local.log")) as f:
+            content = f.read()
+        assert "written in the background" in content
+        assert "hunter2" not in content
+
+    def test_async_local_must_be_bool(self, temp_log_dir):
+        with pytest.raises(TypeError):
+            Logifyx(name="async-local-bad", log_dir=temp_log_dir, async_local="yes")
+
+
+class TestSinkWiring:
+    """Tests for per-sink queues created by Logifyx."""
+
+    def test_each_async_handler_gets_own_sink(self, temp_log_dir, http_log_server):
+        log = Logifyx(
+            name="wired",
+            log_dir=temp_log_dir,
+            remote_url=http_log_server.url,
+            remote_workers=2,
+        )
+
+        assert len(log._sinks) == 1
+        assert log._sinks[0].workers == 2
+        assert f"remote:{http_log_server.url}" in queue_depths()
+
+        log.info("hello")
+        assert flush(timeout=5) is True
+        assert queue_depths()[f"remote:{http_log_server.url}"] == 0
+        assert dropped_counts()[f"remote:{http_log_server.url}"] == 0
+        assert len(http_log_server.bodies()) == 1
+
+    def test_reload_only_stops_own_sinks(self, temp_log_dir, http_log_server):
+        a = Logifyx(name="reload-a", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        b = Logifyx(name="reload-b", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        b_sink = b._sinks[0]
+
+        a.reload()
+
+        assert b_sink.running
+        b.info("still delivered")
+        assert flush(timeout=5) is True
+        assert any(b"still delivered" in body for body in http_log_server.bodies())
+
+    def test_overflow_settings_reach_sink(self, temp_log_dir, http_log_server):
+        log = Logifyx(
+            name="overflow",
+            log_dir=temp_log_dir,
+            remote_url=http_log_server.url,
+            queue_max_bytes=1_000_000,
+            queue_overflow="drop_below",
+            queue_drop_level="error",
+            queue_block_timeout_ms=250,
+        )
+        sink = log._sinks[0]
+
+        assert sink.max_bytes == 1_000_000
+        assert sink.overflow == "drop_below"
+        assert sink.drop_level == logging.ERROR
+        assert sink.block_timeout == 0.25
+
+    def test_invalid_overflow_kwarg(self, temp_log_dir):
+        with pytest.raises(ValueError):
+            Logifyx(name="bad-overflow", log_dir=temp_log_dir, queue_overflow="explode")
+
+
+
+def _run_in_child(check):
+    """Fork, run check() in the child and return whether it returned True there."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            code = 0 if check() else 1
+        except BaseException:
+            code = 2
+        os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+class TestFork:
+    """Tests for sinks after os.fork() in a preforking server."""
+
+    def test_delivery_in_parent_and_child(self, temp_log_dir, http_log_server):
+        log = Logifyx(name="forked", log_dir=temp_log_dir, remote_url=http_log_server.url)
+        log.info("before fork")
+        assert flush(timeout=5) is True
+
+        def child():
+            log.info("from child")
+            return flush(timeout=5) and all(sink.running for sink in core._sinks)
+
+        assert _run_in_child(child)
+        log.info("from parent")
+        assert flush(timeout=5) is True
+
+        bodies = b"".join(http_log_server.bodies())
+        assert bodies.count(b"before fork") == 1
+        assert b"from child" in bodies
+        assert b"from parent" in bodies
+
+    def test_child_drops_parent_queue(self):
+        gate = threading.Event()
+        handler = CollectingHandler(gate)
+        sink = AsyncSink(handler, name="gated")
+        sink.start()
+        core._sinks.append(sink)
+        logger = logging.Logger("fork-queue")
+        logger.addHandler(SinkQueueHandler([sink]))
+        for i in range(3):
+            logger.info("queued %d", i)
+
+        def child():
+            gate.set()
+            logger.info("child record")
+            return (
+                sink.running
+                and sink.flush(timeout=5)
+                and not any(m.startswith("queued") for m in handler.messages)
+                and "child record" in handler.messages
+            )
+
+        try:
+            assert _run_in_child(child)
+        finally:
+            gate.set()
+        assert sink.flush(timeout=5)
+        assert handler.messages[:3] == ["queued 0", "queued 1", "queued 2"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,289 @@
+"""
+Tests for the disk spool (spool.py) and its use by the remote and Kafka handlers.
+"""
+
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx.kafka import BATCH_HEADER, KafkaHandler, decode_message
+from logifyx.remote import RemoteHandler, close_sessions
+from logifyx.spool import DiskSpool, SpoolLocked, open_spool
+from tests.test_kafka import FakeProducer
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def _record(msg, name="svc"):
+    return logging.LogRecord(name, logging.INFO, "app.py", 10, msg, (), None)
+
+
+def _delivery_order(messages):
+    """Messages ordered by their last send; failed attempts always come before it."""
+    last = {m: i for i, m in enumerate(messages)}
+    return sorted(last, key=last.get)
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".seg"))
+
+
+class TestDiskSpool:
+    """Tests for the on-disk segment spool."""
+
+    def test_read_commit_across_segments(self, temp_log_dir):
+        spool = DiskSpool(temp_log_dir, segment_bytes=64, fsync="never")
+        for i in range(10):
+            assert spool.append(f"message {i:02d}".encode())
+        assert len(_segments(temp_log_dir)) > 1
+
+        assert spool.read(4) == [f"message {i:02d}".encode() for i in range(4)]
+        spool.commit(3)
+        assert spool.read(2) == [b"message 03", b"message 04"]
+        spool.commit(2)
+        assert len(spool) == 5
+        spool.close()
+
+    def test_delivered_segments_deleted(self, temp_log_dir):
+        spool = DiskSpool(temp_log_dir, segment_bytes=64, fsync="never")
+        for i in range(10):
+            spool.append(f"message {i:02d}".encode())
+        before = _segments(temp_log_dir)
+
+        spool.commit(len(spool.read(8)))
+
+        after = _segments(temp_log_dir)
+        assert after == before[-len(after):] and len(after) < len(before)
+        assert spool.size < 10 * 18
+        spool.close()
+
+    def test_reopen_resumes_after_commit(self, temp_log_dir):
+        spool = DiskSpool(temp_log_dir)
+        for i in range(5):
+            spool.append(f"m{i}".encode())
+        spool.commit(len(spool.read(2)))
+        spool.close()
+
+        spool = DiskSpool(temp_log_dir)
+        assert len(spool) == 3
+        assert spool.read(10) == [b"m2", b"m3", b"m4"]
+        spool.close()
+
+    def test_torn_frame_ends_segment(self, temp_log_dir):
+        spool = DiskSpool(temp_log_dir)
+        spool.append(b"complete")
+        spool.close()
+        with open(os.path.join(temp_log_dir, _segments(temp_log_dir)[-1]), "ab") as f:
+            f.write(b"\x00\x00\x00\x20\x00\x00\x00\x00trunc")  # crash mid-write
+
+        spool = DiskSpool(temp_log_dir)
+        spool.append(b"after restart")
+        assert spool.read(10) == [b"complete", b"after restart"]
+        spool.close()
+
+    def test_max_bytes_drops_new_messages(self, temp_log_dir):
+        spool = DiskSpool(temp_log_dir, max_bytes=100)
+        accepted = sum(spool.append(b"x" * 20) for _ in range(10))
+
+        assert accepted == 3  # 28 bytes per frame
+        assert spool.dropped == 7
+        assert len(spool) == 3
+        spool.close()
+
+    def test_empty_spool_leaves_no_segments(self, temp_log_dir):
+        spool = DiskSpool(temp_log_dir)
+        spool.append(b"one")
+        spool.commit(len(spool.read(10)))
+        spool.close()
+
+        assert _segments(temp_log_dir) == []
+
+    def test_directory_is_exclusive(self, temp_log_dir):
+        spool = DiskSpool(os.path.join(temp_log_dir, "remote"))
+        with pytest.raises(SpoolLocked):
+            DiskSpool(os.path.join(temp_log_dir, "remote"))
+
+        other = open_spool(temp_log_dir, "remote")
+        assert other.directory.name == "remote.1"
+        other.close()
+        spool.close()
+
+    def test_invalid_fsync_policy(self, temp_log_dir):
+        with pytest.raises(ValueError):
+            DiskSpool(temp_log_dir, fsync="sometimes")
+
+
+@pytest.fixture
+def spool_dir(temp_log_dir):
+    yield os.path.join(temp_log_dir, "spool")
+    close_sessions()
+
+
+class TestRemoteSpool:
+    """Tests for RemoteHandler with spool_dir."""
+
+    def _handler(self, url, spool_dir, **kwargs):
+        handler = RemoteHandler(url, timeout=2, max_failures=1, spool_dir=spool_dir, backoff_ms=50, **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        if handler._spooler is not None:
+            handler._spooler.retry_interval = 0.05
+        return handler
+
+    def _messages(self, server):
+        return [json.loads(body)["message"] for body in server.bodies()]
+
+    def test_outage_spooled_and_replayed_in_order(self, http_log_server, spool_dir):
+        handler = self._handler(http_log_server.url, spool_dir)
+        handler.emit(_record("before"))
+
+        http_log_server.status = 503
+        for i in range(5):
+            handler.emit(_record(f"during {i}"))
+        assert handler.breaker.rejected == 0  # spooled, never refused
+        assert handler._spooler.active
+
+        http_log_server.status = 200
+        handler.emit(_record("after"))  # queued behind the spooled records
+
+        assert _wait_for(lambda: not handler._spooler.active)
+        expected = ["before"] + [f"during {i}" for i in range(5)] + ["after"]
+        assert _delivery_order(self._messages(http_log_server)) == expected
+        handler.close()
+
+    def test_batches_replayed_with_content_type(self, http_log_server, spool_dir):
+        handler = self._handler(http_log_server.url, spool_dir, batch_size=3)
+        http_log_server.status = 500
+        for i in range(3):
+            handler.emit(_record(f"r{i}"))
+        assert handler._spooler.active
+
+        http_log_server.status = 200
+        assert _wait_for(lambda: not handler._spooler.active)
+        headers, body = http_log_server.requests[-1]
+        assert headers["Content-Type"] == "application/x-ndjson"
+        assert [json.loads(line)["message"] for line in body.splitlines()] == ["r0", "r1", "r2"]
+        handler.close()
+
+    def test_replay_compressed_like_live_sends(self, http_log_server, spool_dir):
+        handler = self._handler(http_log_server.url, spool_dir, batch_size=3, compression="gzip", compression_min_bytes=0)
+        http_log_server.status = 500
+        for i in range(3):
+            handler.emit(_record(f"r{i}"))
+        assert handler._spooler.active
+
+        http_log_server.status = 200
+        assert _wait_for(lambda: not handler._spooler.active)
+        headers, body = http_log_server.requests[-1]
+        assert headers["Content-Encoding"] == "gzip"
+        assert [json.loads(line)["message"] for line in gzip.decompress(body).splitlines()] == ["r0", "r1", "r2"]
+        handler.close()
+
+    def test_replay_is_rate_limited(self, http_log_server, spool_dir):
+        handler = self._handler(http_log_server.url, spool_dir, spool_replay_rate=20)
+        http_log_server.status = 500
+        for i in range(10):
+            handler.emit(_record(f"r{i}"))
+        http_log_server.status = 200
+        sent_before = len(http_log_server.requests)
+
+        start = time.monotonic()
+        assert _wait_for(lambda: not handler._spooler.active)
+        assert time.monotonic() - start >= 0.4
+        assert len(http_log_server.requests) - sent_before >= 10
+        handler.close()
+
+    def test_spool_survives_restart(self, http_log_server, spool_dir):
+        handler = self._handler(http_log_server.url, spool_dir)
+        http_log_server.status = 500
+        for i in range(3):
+            handler.emit(_record(f"r{i}"))
+        handler._spooler.stop()
+        handler.close()
+        assert _segments(os.path.join(spool_dir, handler._spooler.name))
+
+        http_log_server.status = 200
+        restarted = self._handler(http_log_server.url, spool_dir)
+
+        assert _wait_for(lambda: {"r0", "r1", "r2"} <= set(self._messages(http_log_server)))
+        assert _wait_for(lambda: not restarted._spooler.active)
+        restarted.close()
+
+    def test_without_spool_dir_disables(self, http_log_server):
+        handler = RemoteHandler(http_log_server.url, max_failures=2)
+        http_log_server.status = 500
+        with patch.object(handler, "handleError"):
+            handler.emit(_record("a"))
+            handler.emit(_record("b"))
+        assert handler.disabled
+        assert handler._spooler is None
+        handler.close()
+
+
+class TestKafkaSpool:
+    """Tests for KafkaHandler with spool_dir."""
+
+    @pytest.fixture
+    def producer(self):
+        FakeProducer.instances = []
+        with patch("logifyx.kafka.AIOKafkaProducer", FakeProducer):
+            yield FakeProducer
+
+    def _handler(self, spool_dir, **kwargs):
+        handler = KafkaHandler(
+            bootstrap_servers="localhost:9092", topic="t", spool_dir=spool_dir, backoff_ms=50, **kwargs
+        )
+        handler._spooler.retry_interval = 0.05
+        return handler
+
+    def test_failed_acks_spooled_and_replayed(self, producer, spool_dir):
+        handler = self._handler(spool_dir, schema_version=2)
+        handler.emit(_record("warm-up"))
+        handler.flush()
+        fake = producer.instances[0]
+
+        fake.fail = True
+        for i in range(3):
+            handler.emit(_record(f"r{i}"))
+        handler.flush()
+        assert handler._spooler.active
+        assert not handler.disabled
+
+        fake.fail = False
+        assert _wait_for(lambda: not handler._spooler.active)
+        messages = []
+        for (_, value, key), headers in zip(fake.sent, fake.headers):
+            (decoded,) = decode_message(value, headers, normalize=True)
+            messages.append(decoded["message"])
+            assert key == b"svc"
+        assert _delivery_order(messages) == ["warm-up", "r0", "r1", "r2"]
+        handler.close()
+
+    def test_batches_replayed_as_batches(self, producer, spool_dir):
+        handler = self._handler(spool_dir, batch_records=10, linger_ms=0)
+        handler.emit(_record("warm-up"))
+        handler.flush()
+        fake = producer.instances[0]
+
+        fake.fail = True
+        for i in range(4):
+            handler.emit(_record(f"r{i}"))
+        handler.flush()
+        fake.fail = False
+
+        assert _wait_for(lambda: not handler._spooler.active)
+        assert fake.headers[-1] == [BATCH_HEADER]
+        messages = [r["message"] for _, value, _ in fake.sent for r in decode_message(value)]
+        assert _delivery_order(messages) == ["warm-up", "r0", "r1", "r2", "r3"]
+        handler.close()
@@ -0,0 +1,156 @@
+"""
+Tests for config file watching (watch.py) and watch_config in core.
+"""
+
+import logging
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logifyx import Logifyx
+import logifyx.watch as watch
+from logifyx.watch import ConfigWatcher
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.fixture(autouse=True)
+def stop_watcher(monkeypatch):
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    monkeypatch.delenv("LOG_WATCH_CONFIG", raising=False)
+    yield
+    watch.stop_watching()
+
+
+@pytest.fixture
+def config_dir(temp_log_dir):
+    _write(os.path.join(temp_log_dir, "logifyx.yaml"), "LOG_LEVEL: INFO\n")
+    return temp_log_dir
+
+
+class TestWatchConfig:
+    """Tests for loggers created with watch_config=True."""
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_uses_inotify_on_linux(self, config_dir):
+        Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+        assert watch._watcher.backend == "inotify"
+
+    def test_yaml_edit_reloads_level(self, config_dir):
+        log = Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+        handlers = list(log.handlers)
+
+        _write(os.path.join(config_dir, "logifyx.yaml"), "LOG_LEVEL: DEBUG\n")
+
+        assert _wait_for(lambda: log.level == logging.DEBUG)
+        assert log.handlers == handlers  # applied in place
+
+    def test_env_file_created_later(self, config_dir):
+        log = Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+
+        _write(os.path.join(config_dir, ".env"), "LOG_LEVEL=ERROR\n")
+
+        assert _wait_for(lambda: log.level == logging.ERROR)
+
+    def test_burst_of_writes_reloads_once(self, config_dir):
+        Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+        path = os.path.join(config_dir, "logifyx.yaml")
+
+        for level in ("DEBUG", "WARNING", "ERROR", "DEBUG"):
+            _write(path, f"LOG_LEVEL: {level}\n")
+            time.sleep(0.02)
+
+        assert _wait_for(lambda: watch._watcher.reloads == 1)
+        time.sleep(watch.DEBOUNCE_SECONDS * 2)
+        assert watch._watcher.reloads == 1
+
+    def test_invalid_config_keeps_logger(self, config_dir, capsys):
+        log = Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+        handlers = list(log.handlers)
+
+        _write(os.path.join(config_dir, "logifyx.yaml"), "LOG_LEVEL: LOUD\n")
+
+        assert _wait_for(lambda: watch._watcher.reloads == 1)
+        assert log.level == logging.INFO
+        assert log.handlers == handlers
+        assert "could not reload 'w'" in capsys.readouterr().err
+
+    def test_unrelated_files_ignored(self, config_dir):
+        Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+
+        _write(os.path.join(config_dir, "notes.txt"), "hello\n")
+
+        time.sleep(watch.DEBOUNCE_SECONDS * 2)
+        assert watch._watcher.reloads == 0
+
+    def test_close_stops_reloading(self, config_dir):
+        log = Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+        other = Logifyx("other", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+        log.close()
+
+        _write(os.path.join(config_dir, "logifyx.yaml"), "LOG_LEVEL: DEBUG\n")
+
+        assert _wait_for(lambda: other.level == logging.DEBUG)
+        assert log.level == logging.INFO
+
+    def test_enabled_from_env(self, config_dir, monkeypatch):
+        monkeypatch.setenv("LOG_WATCH_CONFIG", "true")
+        log = Logifyx("w", config_dir=config_dir, log_dir=config_dir)
+
+        assert log in watch._watcher._loggers
+
+    def test_watch_config_type_validated(self):
+        with pytest.raises(TypeError):
+            Logifyx("bad", watch_config="yes")
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_child_watches_on_its_own(self, config_dir):
+        log = Logifyx("w", config_dir=config_dir, log_dir=config_dir, watch_config=True)
+        parent_thread = watch._watcher._thread
+
+        def check():
+            if watch._watcher._thread is parent_thread or not watch._watcher._thread.is_alive():
+                return False
+            _write(os.path.join(config_dir, "logifyx.yaml"), "LOG_LEVEL: DEBUG\n")
+            return _wait_for(lambda: log.level == logging.DEBUG)
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                code = 0 if check() else 1
+            except BaseException:
+                code = 2
+            os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+class TestPollingFallback:
+    """Tests for the stat-polling backend."""
+
+    def test_polling_detects_change(self, config_dir):
+        watcher = ConfigWatcher(debounce=0.05, poll_interval=0.05, use_inotify=False)
+        log = Logifyx("w", config_dir=config_dir, log_dir=config_dir)
+        try:
+            watcher.add(log)
+            assert watcher.backend == "poll"
+
+            _write(os.path.join(config_dir, "logifyx.yaml"), "LOG_LEVEL: WARNING\n")
+
+            assert _wait_for(lambda: log.level == logging.WARNING)
+        finally:
+            watcher.stop()
+        assert not watcher._thread.is_alive()